@@ -115,6 +115,10 @@ BibStyle = settings.BibStyle
 """
 The supported BibTeX preview styles from L{utils.settings.BibStyle}.
 """
+ParserEngine = settings.ParserEngine
+"""
+The supported BibTeX parser engines from L{utils.settings.ParserEngine}.
+"""
 
 if __name__ == '__main__':
     __b.startGUI()
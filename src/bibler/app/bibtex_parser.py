@@ -33,7 +33,7 @@ from app.entry import EmptyEntry
 from app.entry_type import EntryType
 from app.field_name import FieldName
 from app.field import Field
-from utils.settings import Preferences
+from utils.settings import ParserEngine, Preferences
 from utils.utils import Utils
 #from docutils.parsers.rst.directives import encoding
 
@@ -195,6 +195,352 @@ class BibTeXParserWithNonStdFields(BibTeXParserWithStdFields):
                 self.entry.additionalFields[field] = Field(field, value)
             self.entry.formatField(field)
 
+class BibTeXTokenizingParser(object):
+    """
+    Same as :class:`BibTeXParser <app.bibtex_parser.BibTeXParser>` but reads the entry in a single left-to-right scan.
+    The type, the key and all the fields are extracted at once by tracking the nesting of braces and quotes,
+    instead of searching the whole entry again for every field.
+    """
+    re_header = re.compile("""\s*@(\w+)\s*[({]\s*([\w-]*)\s*""", re.RegexFlag.DOTALL)
+    re_field_name = re.compile("""\s*([^\s=,{}()"]+)\s*=\s*""")
+    re_separator = re.compile("""[{},]""")
+    re_brace = re.compile("""[{}]""")
+    re_quote = re.compile("""[{}"]""")
+    re_quote_end = re.compile("""\s*([,})]|$)""")
+    re_spaces = re.compile("""\s+""")
+    
+    def __init__(self, bibtex, nonStandardFields=False):
+        """
+        (Constructor)
+           
+        :param bibtex: The BibTeX string.
+        :type bibtex: str.
+        :param nonStandardFields: If True, also keeps the fields that are not standard for the entry type.
+        :type nonStandardFields: bool.
+        """
+        bibtex = bibtex.replace('{\n', '{stubKey,\n')       # if key is missing
+        bibtex = Utils().unicode2Tex(bibtex)                  # replace unicode characters to TeX equivalent
+        self.bibtex = self.remove_comments(bibtex.strip())  # remove all comments and new lines
+        self.nonStandardFields = nonStandardFields
+        self.entry = None
+    
+    def remove_comments(self, bibtex):
+        """
+        Removes all the comments (starting with %) in the BibTeX string and joins its lines.
+        :param bibtex: The BibTeX string.
+        :type bibtex: str
+        :return: str -- The uncommented BibTeX string.
+        """
+        lines = []
+        for line in bibtex.splitlines():
+            comment_position = line.find('%')
+            if comment_position >= 0 and line[comment_position-1] != '\\':
+                # in a line, ignore everything after %, except if it is escaped \%
+                line = line[:comment_position]
+            lines.append(line)
+        return ''.join(lines)
+    
+    def parse(self):
+        """
+        Parses the string into an :class:`Entry <app.entry.Entry>`
+        
+        :returns: :class:`Entry <app.entry.Entry>`
+        The entry object corresponding to its type. The default is :class:`EmptyEntry <app.entry.EmptyEntry>`
+        """
+        if not self.bibtex:
+            self.entry = EmptyEntry()
+            return self.entry
+        if self.bibtex.count('{') != self.bibtex.count('}'):
+            # Unbalanced braces (e.g., a value cut by a comment) cannot be tokenized reliably:
+            # recover the fields the same way the regex engine does.
+            return self.__regexParser().parse()
+        entryType, key, fields = self.tokenize()
+        self.entry = EntryType.createEntry(entryType)
+        if not isinstance(self.entry, EmptyEntry):
+            self.entry.setKey(key)
+        if self.nonStandardFields:
+            self.parseAllFields(fields)
+        else:
+            self.parseFields(fields)
+        return self.entry
+    
+    def tokenize(self):
+        """
+        Scans the BibTeX string once.
+        
+        :returns: tuple -- The entry type, the key, and the list of (field, value) pairs in the order they appear.
+        :raises Exception: If the header of the entry is invalid.
+        """
+        header = self.re_header.match(self.bibtex)
+        if not header:
+            raise Exception('Invalid BibTeX.')
+        fields = []
+        pos = self.__skipToNextField(header.end())
+        while pos >= 0:
+            name = self.re_field_name.match(self.bibtex, pos)
+            if name:
+                value, pos = self.__readValue(name.end())
+                if value is not None:
+                    fields.append((name.group(1), value))
+            pos = self.__skipToNextField(pos)
+        return header.group(1), header.group(2), fields
+    
+    def parseFields(self, fields):
+        """
+        Set all the standard fields of the entry.
+        
+        :param fields: The (field, value) pairs found by :meth:`tokenize`.
+        :type fields: list
+        """
+        values = {}
+        for name, value in fields:
+            values.setdefault(name.lower(), value)
+        for field in self.entry.iterAllFields():
+            self.entry.setField(field.getName(), values.get(field.getName(), ''))
+            self.entry.formatField(field.getName())
+    
+    def parseAllFields(self, fields):
+        """
+        Set all the fields of the entry, including non-standard ones.
+        
+        :param fields: The (field, value) pairs found by :meth:`tokenize`.
+        :type fields: list
+        """
+        standard = [field.getName() for field in self.entry.iterAllFields()]
+        found = set()
+        for name, value in fields:
+            if name.lower() in found:
+                continue
+            found.add(name.lower())
+            if name.lower() in standard:
+                name = name.lower()
+                self.entry.setField(name, value)
+            else:
+                self.entry.additionalFields[name] = Field(name, value)
+            self.entry.formatField(name)
+    
+    def __regexParser(self):
+        """
+        Get the regex engine for the same BibTeX string.
+        
+        :returns: :class:`BibTeXParserWithStdFields <app.bibtex_parser.BibTeXParserWithStdFields>`
+        """
+        if self.nonStandardFields:
+            return BibTeXParserWithNonStdFields(self.bibtex)
+        return BibTeXParserWithStdFields(self.bibtex)
+    
+    def __skipToNextField(self, pos):
+        """
+        Finds the beginning of the next field, skipping anything nested within braces.
+        
+        :param pos: The position to start from.
+        :type pos: int
+        :returns: int -- The position after the next separating comma, or -1 at the end of the entry.
+        """
+        depth = 0
+        for m in self.re_separator.finditer(self.bibtex, pos):
+            c = m.group()
+            if c == '{':
+                depth += 1
+            elif c == '}':
+                depth -= 1
+                if depth < 0:
+                    return -1
+            elif depth == 0:
+                return m.end()
+        return -1
+    
+    def __readValue(self, pos):
+        """
+        Reads a field value delimited by {} or ", even if the same delimiters are used inside the value.
+        
+        :param pos: The position of the opening delimiter.
+        :type pos: int
+        :returns: tuple -- The value (:class:`None` if it is not delimited) and the position after it.
+        """
+        s = self.bibtex
+        depth = 0
+        if s.startswith('{', pos):
+            for m in self.re_brace.finditer(s, pos):
+                if m.group() == '{':
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return self.__clean(s[pos + 1:m.start()]), m.end()
+            return '', len(s)
+        elif s.startswith('"', pos):
+            for m in self.re_quote.finditer(s, pos + 1):
+                c = m.group()
+                if c == '{':
+                    depth += 1
+                elif c == '}':
+                    depth -= 1
+                    if depth < 0:
+                        # the entry ends before the closing quote
+                        return self.__clean(s[pos + 1:m.start()]), m.start()
+                elif depth == 0 and self.re_quote_end.match(s, m.end()):
+                    return self.__clean(s[pos + 1:m.start()]), m.end()
+            return self.__clean(s[pos + 1:]), len(s)
+        return None, pos
+    
+    def __clean(self, value):
+        """
+        Collapses the white spaces of a value.
+        
+        :param value: The raw value.
+        :type value: str
+        :returns: str -- The cleaned value.
+        """
+        value = self.re_spaces.sub(' ', value).strip()
+        if value.endswith('"'):
+            value = value[:-1]
+        return value
+
+class BibTeXLexer(object):
+    """
+    Splits a BibTeX stream into the strings of its entries.
+    The stream is read in large chunks and an entry ends when its opening brace or parenthesis is balanced,
+    so entries do not need to start on a new line and at most one entry is held in memory at a time.
+    Text outside entries, lines starting with %, and @comment, @string and @preamble blocks are ignored.
+    If the braces of an entry are unbalanced, the entry ends at the next line starting with an entry header.
+    """
+    CHUNK_SIZE = 1 << 20
+    LOOKAHEAD = 1024
+    IGNORED_TYPES = ('comment', 'string', 'preamble')
+    re_outside = re.compile("""[@%]""")
+    re_header = re.compile("""@\s*(\w+)\s*([{(])""")
+    re_inside_braces = re.compile("""[{}]|\n(?=[ \t]*@\w+\s*[{(])""")
+    re_inside_parentheses = re.compile("""[{})]|\n(?=[ \t]*@\w+\s*[{(])""")
+    re_partial_header = re.compile("""\n[ \t]*(?:@\w*\s*)?\Z""")
+    
+    def __init__(self, stream, chunkSize=CHUNK_SIZE):
+        """
+        (Constructor)
+        
+        :param stream: A text stream open for reading.
+        :type stream: file
+        :param chunkSize: The number of characters read at a time.
+        :type chunkSize: int
+        """
+        self.stream = stream
+        self.chunkSize = chunkSize
+        self.buffer = ''
+        self.start = 0      # position in the buffer before which the text is consumed
+        self.eof = False
+        self.lineNumber = 1
+        self.entryLineNumber = 1
+    
+    def getLineNumber(self):
+        """
+        Get the line number where the last entry found starts.
+        
+        :returns: int -- The line number.
+        """
+        return self.entryLineNumber
+    
+    def __iter__(self):
+        """
+        Iterator over the entries of the stream.
+        
+        :returns: ``generator`` of str -- The BibTeX string of each entry.
+        """
+        pos = self.start
+        while True:
+            m = self.re_outside.search(self.buffer, pos)
+            if not m:
+                self.__consume(len(self.buffer))
+                if not self.__read():
+                    return
+                pos = self.start
+                continue
+            self.__consume(m.start())
+            if m.group() == '%':
+                # skip the comment until the end of the line
+                end = self.buffer.find('\n', self.start)
+                while end < 0:
+                    if not self.__read():
+                        return
+                    end = self.buffer.find('\n', self.start)
+                pos = end + 1
+                continue
+            while len(self.buffer) - self.start < self.LOOKAHEAD and self.__read():
+                pass
+            header = self.re_header.match(self.buffer, self.start)
+            if not header:
+                pos = self.start + 1
+                continue
+            end = self.__findEnd(header.end() - self.start, header.group(2))
+            entry = self.buffer[self.start:end]
+            lineNumber = self.lineNumber
+            self.__consume(end)
+            pos = self.start
+            if header.group(1).lower() not in self.IGNORED_TYPES:
+                self.entryLineNumber = lineNumber
+                yield entry
+    
+    def __findEnd(self, offset, delimiter):
+        """
+        Finds the end of the entry starting at the consumed position of the buffer.
+        
+        :param offset: The offset of the text after the opening delimiter from the beginning of the entry.
+        :type offset: int
+        :param delimiter: The opening delimiter, { or (.
+        :type delimiter: str
+        :returns: int -- The position in the buffer after the end of the entry.
+        """
+        pattern = self.re_inside_braces if delimiter == '{' else self.re_inside_parentheses
+        pos = self.start + offset
+        depth = 0
+        while True:
+            for m in pattern.finditer(self.buffer, pos):
+                c = m.group()
+                if c == '{':
+                    depth += 1
+                elif c == '}':
+                    if depth == 0 and delimiter == '{':
+                        return m.end()
+                    depth = max(depth - 1, 0)
+                elif c == ')':
+                    if depth == 0:
+                        return m.end()
+                else:
+                    # unbalanced entry followed by another entry
+                    return m.start()
+            # A line at the end of the buffer may start an entry header completed by the next chunk: it is scanned again then.
+            # As when reading ahead of a header, a header is assumed to be shorter than LOOKAHEAD.
+            tail = self.re_partial_header.search(self.buffer, max(pos, len(self.buffer) - self.LOOKAHEAD))
+            offset = (tail.start() if tail else len(self.buffer)) - self.start
+            if not self.__read():
+                return len(self.buffer)
+            pos = self.start + offset
+    
+    def __consume(self, pos):
+        """
+        Marks the text of the buffer before a position as consumed.
+        
+        :param pos: The position in the buffer.
+        :type pos: int
+        """
+        self.lineNumber += self.buffer.count('\n', self.start, pos)
+        self.start = pos
+    
+    def __read(self):
+        """
+        Reads the next chunk of the stream and drops the consumed text of the buffer.
+        
+        :returns: bool -- False if the end of the stream is reached.
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunkSize)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.start:] + chunk
+        self.start = 0
+        return True
+
 class BibTeXParser(object):
     """
     Class responsible for parsing a string written in BibTeX.
@@ -228,7 +574,9 @@ class BibTeXParser(object):
         :param bibtex: The BibTeX string.
         :type bibtex: str.
         """
-        if Preferences().allowNonStandardFields:
+        if Preferences().parserEngine == ParserEngine.TOKENIZER:
+            self.parser = BibTeXTokenizingParser(bibtex, Preferences().allowNonStandardFields)
+        elif Preferences().allowNonStandardFields:
             self.parser = BibTeXParserWithNonStdFields(bibtex)
         else:
             self.parser = BibTeXParserWithStdFields(bibtex)
@@ -28,10 +28,15 @@ This module contains all the commands of BiBler.
 It implements the Command design pattern.
 """
 
-from app.impex import BibTeXImporter, CSVImporter, EndNoteImporter, BibTeXExporter, CSVExporter, HTMLExporter, MySQLExporter, BibTeXStringExporter, CSVStringExporter, HTMLStringExporter, MySQLStringExporter, BibTeXStringImporter, EndNoteStringImporter
+from app.impex import BibTeXImporter, CSVImporter, EndNoteImporter, BibTeXExporter, CSVExporter, HTMLExporter, MySQLExporter, SQLiteExporter, BibTeXStringExporter, CSVStringExporter, HTMLStringExporter, MySQLStringExporter, BibTeXStringImporter, EndNoteStringImporter, Snapshot
 from app.entry import EntryIdGenerator
+from app.entry_type import EntryType
+from app.render_cache import RenderCache
 from utils import settings
 from utils.settings import Preferences
+from utils.utils import Utils
+from collections import deque
+from types import GeneratorType
 from app.report_gen import ReportGenerator
 
 
@@ -40,23 +45,67 @@ class CommandExecutor(object):
         """
         (Constructor)
         """
-        self.__history = []
+        self.__history = deque()
+        """
+        The commands that can be undone, each with the memory it holds, oldest first.
+        """
+        self.__memoryUsage = 0
     
     def execute(self, command):
         result = command.execute()
         if isinstance(command, OpenCommand):
-            self.__history = [command]    # cannot undo further than the last open command
-        elif isinstance(command, UndoableCommand):
+            self.__history = deque()    # cannot undo further than the last open command
+            self.__memoryUsage = 0
+        if isinstance(command, UndoableCommand):
             # Only add undoable commands to history and only after command is complete
-            self.__history.append(command)
+            size = command.getMemoryUsage()
+            self.__history.append((command, size))
+            self.__memoryUsage += size
+            self.__forgetOldest()
+            if isinstance(result, GeneratorType):
+                return self.__measureWhenExhausted(command, result)
         return result
     
+    def __measureWhenExhausted(self, command, stream):
+        """
+        Generate the items of the stream of a command, then measure again the memory it holds, which changes as the stream is consumed.
+        """
+        try:
+            yield from stream
+        finally:
+            for i, (historyCommand, size) in enumerate(self.__history):
+                if historyCommand is command:
+                    self.__history[i] = (command, command.getMemoryUsage())
+                    self.__memoryUsage += self.__history[i][1] - size
+                    self.__forgetOldest()
+                    break
+    
+    def __forgetOldest(self):
+        """
+        Forget the oldest commands beyond the length and memory allowed in the preferences, always keeping the last one.
+        """
+        maxLength = Preferences().undoHistoryLength
+        maxMemory = Preferences().undoHistoryMemory
+        while len(self.__history) > 1 and ((maxLength and len(self.__history) > maxLength) or
+                                           (maxMemory and self.__memoryUsage > maxMemory)):
+            _, size = self.__history.popleft()
+            self.__memoryUsage -= size
+    
     def canUndo(self):
         return len(self.__history) > 0
     
+    def getMemoryUsage(self):
+        """
+        Get an estimate of the memory held by the commands that can be undone.
+        @rtype: L{int}
+        @return: The number of bytes.
+        """
+        return self.__memoryUsage
+    
     def undo(self):
         if self.canUndo():
-            last_command = self.__history.pop()
+            last_command, size = self.__history.pop()
+            self.__memoryUsage -= size
             last_command.unexecute()
             return True
         return False
@@ -76,6 +125,14 @@ class UndoableCommand(Command):
         (Constructor)
         """
         super(UndoableCommand, self).__init__(manager)
+    
+    def getMemoryUsage(self):
+        """
+        Get an estimate of the memory held by this command to be undone, that is the size of its attributes.
+        @rtype: L{int}
+        @return: The number of bytes.
+        """
+        return Utils().sizeOf(tuple(value for name, value in vars(self).items() if name != 'manager'))
 
 
 class UndoCommand(Command):
@@ -102,9 +159,10 @@ class PreviewCommand(Command):
         entry = self.manager.getEntry(self.entryId)
         if entry:
             if Preferences().bibStyle == settings.BibStyle.ACM:
-                return entry.toCompleteHtmlACM()
+                render = entry.toCompleteHtmlACM
             else:
-                return entry.toCompleteHtmlDefault()
+                render = entry.toCompleteHtmlDefault
+            return self.manager.renderCache.get(entry, RenderCache.PREVIEW, render)
         raise Exception('entry not found.')
 
 
@@ -127,6 +185,8 @@ class ExportCommand(Command):
             exporter = HTMLExporter
         elif self.exportFormat == settings.ExportFormat.SQL:
             exporter = MySQLExporter
+        elif self.exportFormat == settings.ExportFormat.SQLITE:
+            exporter = SQLiteExporter
         self.total = exporter(self.path, self.manager.iterEntries()).export()
         return self.total > 0
 
@@ -139,7 +199,7 @@ class ExportStringCommand(Command):
         self.exportFormat = exportFormat
         self.total = ""
 
-    def execute(self):
+    def createExporter(self):
         if self.exportFormat == settings.ExportFormat.BIBTEX:
             exporter = BibTeXStringExporter
         elif self.exportFormat == settings.ExportFormat.CSV:
@@ -148,9 +208,24 @@ class ExportStringCommand(Command):
             exporter = HTMLStringExporter
         elif self.exportFormat == settings.ExportFormat.SQL:
             exporter = MySQLStringExporter
-        self.total = exporter("", self.manager.iterEntries()).export()
+        else:
+            raise Exception('cannot export to %s as a string.' % self.exportFormat)
+        return exporter("", self.manager.iterEntries())
+
+    def execute(self):
+        self.total = self.createExporter().export()
         return self.total
 
+class ExportStreamCommand(ExportStringCommand):
+    def __init__(self, manager, exportFormat):
+        """
+        (Constructor)
+        """
+        super(ExportStreamCommand, self).__init__(manager, exportFormat)
+
+    def execute(self):
+        return self.createExporter().iterExport()
+
 class GenerateAllKeysCommand(Command):
     def __init__(self, manager):
         """
@@ -170,7 +245,7 @@ class ValidateCommand(Command):
         self.entryId = entryId
     
     def execute(self):
-        self.manager.getEntry(self.entryId).validate()
+        return self.manager.getEntry(self.entryId).validate()
 
 class ValidateAllCommand(Command):
     def __init__(self, manager):
@@ -223,6 +298,26 @@ class AddCommand(UndoableCommand):
         return self.manager.delete(self.entryId)
 
 
+class AddEntriesCommand(UndoableCommand):
+    def __init__(self, manager, entriesBibTeX, ignoreIfEmpty):
+        """
+        (Constructor)
+        """
+        super(AddEntriesCommand, self).__init__(manager)
+        self.entriesBibTeX = entriesBibTeX
+        self.ignoreIfEmpty = ignoreIfEmpty
+        self.entryIds = []
+    
+    def execute(self):
+        self.entryIds = self.manager.addMany(self.entriesBibTeX, self.ignoreIfEmpty)
+        self.entriesBibTeX = None    # not needed to undo
+        return self.entryIds
+    
+    def unexecute(self):
+        self.manager.deleteMany(self.entryIds)
+        return True
+
+
 class DeleteCommand(UndoableCommand):
     def __init__(self, manager, entryId):
         """
@@ -230,18 +325,22 @@ class DeleteCommand(UndoableCommand):
         """
         super(DeleteCommand, self).__init__(manager)
         self.entryId = entryId
-        self.originalEntry = None
+        self.originalEntry = None    # the deleted entry in compact form
         self.originalEntryIndex = 0
     
     def execute(self):
-        self.originalEntry = self.manager.getEntry(self.entryId)
-        if not self.originalEntry:
+        entry = self.manager.getEntry(self.entryId)
+        if not entry:
             return False
-        self.originalEntryIndex = self.manager.getIndex(self.originalEntry)
+        self.originalEntry = entry.toCompact()
+        self.originalEntryIndex = self.manager.getIndex(entry)
         return self.manager.delete(self.entryId)
     
     def unexecute(self):
-        self.manager.insertAt(self.originalEntryIndex, self.originalEntry)
+        if self.originalEntry:
+            entry = EntryType.fromCompact(self.originalEntry)
+            entry.setId(self.entryId)
+            self.manager.insertAt(self.originalEntryIndex, entry)
 
 
 class DuplicateCommand(UndoableCommand):
@@ -298,6 +397,7 @@ class ImportCommand(UndoableCommand):
         self.importFormat = importFormat
         self.manager = manager
         self.lastId = EntryIdGenerator().getLastId()
+        self.importedLastId = self.lastId
         self.total = 0
     
     def execute(self):
@@ -308,13 +408,12 @@ class ImportCommand(UndoableCommand):
         elif self.importFormat == settings.ImportFormat.ENDNOTE:
             importer = EndNoteImporter
         self.total = importer(self.path, self.manager).importFile()
+        self.importedLastId = EntryIdGenerator().getLastId()
         return self.total > 0
     
     def unexecute(self):
-        for i in range(self.total):
-            i += self.lastId + 1
-            if self.manager.getEntry(i):
-                self.manager.delete(i)
+        # The imported entries are the ones with the ids generated during the import
+        self.manager.deleteMany(range(self.lastId + 1, self.importedLastId + 1))
         return True
 
 
@@ -328,24 +427,75 @@ class ImportStringCommand(UndoableCommand):
         self.importFormat = importFormat
         self.manager = manager
         self.lastId = EntryIdGenerator().getLastId()
+        self.importedLastId = self.lastId
         self.total = 0
     
-    def execute(self):
-        if self.importFormat == settings.ImportFormat.BIBTEX:
+    def createImporter(self):
+        return ImportStringCommand.getImporter(self.importFormat)(self.data, self.manager)
+    
+    @staticmethod
+    def getImporter(importFormat):
+        if importFormat == settings.ImportFormat.BIBTEX:
             importer = BibTeXStringImporter
-        elif self.importFormat == settings.ImportFormat.ENDNOTE:
+        elif importFormat == settings.ImportFormat.ENDNOTE:
             importer = EndNoteStringImporter
-        self.total = importer(self.data, self.manager).importFile()
+        return importer
+    
+    def execute(self):
+        self.total = self.createImporter().importFile()
+        self.importedLastId = EntryIdGenerator().getLastId()
+        self.data = None    # not needed to undo
         return self.total
     
     def unexecute(self):
-        for i in range(self.total):
-            i += self.lastId + 1
-            if self.manager.getEntry(i):
-                self.manager.delete(i)
+        # The imported entries are the ones with the ids generated during the import
+        self.manager.deleteMany(range(self.lastId + 1, self.importedLastId + 1))
         return True
 
 
+class ImportStreamCommand(ImportStringCommand):
+    def __init__(self, manager, data, importFormat):
+        """
+        (Constructor)
+        """
+        super(ImportStreamCommand, self).__init__(manager, data, importFormat)
+    
+    def execute(self):
+        return self.__iterImport(self.createImporter())
+    
+    def __iterImport(self, importer):
+        for ids in importer.iterImport():
+            self.total += len(ids)
+            self.importedLastId = EntryIdGenerator().getLastId()
+            yield ids
+        self.data = None    # not needed to undo
+
+
+class ReleasingImportStreamCommand(Command):
+    def __init__(self, manager, data, importFormat):
+        """
+        (Constructor)
+        """
+        super(ReleasingImportStreamCommand, self).__init__(manager)
+        self.data = data
+        self.importFormat = importFormat
+    
+    def execute(self):
+        return self.__iterImport(ImportStringCommand.getImporter(self.importFormat)(self.data, self.manager))
+    
+    def __iterImport(self, importer):
+        # The entries of a chunk are released once the next chunk is requested, or when the stream is closed
+        ids = []
+        try:
+            for ids in importer.iterImport():
+                yield ids
+                self.manager.release(ids)
+                ids = []
+        finally:
+            self.manager.release(ids)
+            self.data = None
+
+
 class OpenCommand(ImportCommand):
     def __init__(self, manager, path, openFormat):
         """
@@ -355,7 +505,16 @@ class OpenCommand(ImportCommand):
     
     def execute(self):
         self.manager.deleteAll()
-        return super(OpenCommand, self).execute()
+        if not Preferences().openSnapshots:
+            return super(OpenCommand, self).execute()
+        snapshot = Snapshot(self.path, self.importFormat)
+        total = snapshot.load(self.manager)
+        if total is not None:
+            self.total = total
+            return self.total > 0
+        result = super(OpenCommand, self).execute()
+        snapshot.save(self.manager.iterEntries())
+        return result
     
     def unexecute(self):
         self.manager.deleteAll()
@@ -378,8 +537,7 @@ class SortCommand(UndoableCommand):
         return self.manager.sort(self.field, self.reverse) 
     
     def unexecute(self):
-        self.manager.entryList.sort(key=lambda e: self.originalEntryOrder.index(e.getId()))
-        self.manager.searchResult.sort(key=lambda e: self.originalSearchResultOrder.index(e.getId()))
+        self.manager.restoreOrder(self.originalEntryOrder, self.originalSearchResultOrder)
         return True
 
 class GenerateReportCommand(Command):
@@ -32,9 +32,15 @@ from app.field_name import FieldName
 from app.field import Author, Chapter, Editor, Field, Organization, Pages, Title, Year, DOI, Paper
 from utils import utils
 from utils.utils import Utils
+from collections.abc import Mapping
 import re
 
 class EntryIdGenerator(object, metaclass=utils.Singleton):
+    """
+    Generates the ids of the entries. Each L{Context<utils.utils.Context>} has its own generator.
+    """
+    contextual = True
+    
     def __init__(self):
         self.lastId = 0
     
@@ -116,24 +122,134 @@ class ValidationResult(object):
         return self.message
 
 
+class FieldSchema(object):
+    """
+    The layout of the standard fields of an entry type, shared by all the entries of that type.
+    Each field has a slot: the position of the field in the list of fields of an entry.
+    
+    .. versionadded:: 1.5
+    """
+    __slots__ = ('names', 'classes', 'slots', 'required', 'optional', 'additional')
+    
+    def __init__(self, required, optional, additional):
+        """
+        :type required: ``tuple``
+        :param required: The (name, :class:`Field<app.field.Field>` class) pairs of the required fields.
+        :type optional: ``tuple``
+        :param optional: The (name, :class:`Field<app.field.Field>` class) pairs of the optional fields.
+        :type additional: ``tuple``
+        :param additional: The (name, :class:`Field<app.field.Field>` class) pairs of the additional fields.
+        """
+        fields = required + optional + additional
+        self.names = tuple(name for name, _ in fields)
+        self.classes = tuple(fieldClass for _, fieldClass in fields)
+        self.slots = {name: slot for slot, name in enumerate(self.names)}
+        self.required = self.names[:len(required)]
+        self.optional = self.names[len(required):len(required) + len(optional)]
+        self.additional = self.names[len(required) + len(optional):]
+    
+    def createField(self, slot, value=''):
+        """
+        Create the field of a slot.
+        
+        :type slot: ``int``
+        :param slot: The slot of the field.
+        :type value: :class:`str`
+        :param value: The value of the field.
+        :rtype: :class:`Field<app.field.Field>`
+        :return: The field.
+        """
+        fieldClass = self.classes[slot]
+        if fieldClass is Field:
+            return Field(self.names[slot], value)
+        return fieldClass(value)
+
+
+class FieldGroup(Mapping):
+    """
+    The fields of an entry in one of its groups: required, optional or additional.
+    It behaves as a dictionary of the fields by name.
+    
+    .. versionadded:: 1.5
+    """
+    __slots__ = ('entry', 'names')
+    
+    def __init__(self, entry, names):
+        """
+        :type entry: :class:`Entry`
+        :param entry: The entry.
+        :type names: ``tuple``
+        :param names: The names of the fields of the group.
+        """
+        self.entry = entry
+        self.names = names
+    
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        return self.entry.getField(name)
+    
+    def __setitem__(self, name, field):
+        self.entry.attachField(field)
+    
+    def __contains__(self, name):
+        return name in self.names
+    
+    def __iter__(self):
+        return iter(self.names)
+    
+    def __len__(self):
+        return len(self.names)
+
+
 class Entry(object):
     """
     The abstract class representing entries.	
     Every entry has an :class:`_id`, a :class:`key`, and dictionaries for :class:`requiredFields`, :class:`optionalFields`, and :class:`additionalFields`
     as defined in `BibTeX <http://www.openoffice.org/bibliographic/bibtex-defs.html>`_.
     :class:`importantFields` are usually required from the optional ones, but if missing the entry is still valid.
+    
+    The standard fields of each entry type are declared once in :class:`requiredFieldTypes`, :class:`optionalFieldTypes`, and :class:`additionalFieldTypes`,
+    which make up the :class:`FieldSchema` of the type. An entry only keeps the fields that were given a value, in the slots of the schema:
+    the other fields are created empty when requested and kept once given a value.
+    A slot holds the value alone when the field has no other state (see :attr:`Field.keptByEntry<app.field.Field.keptByEntry>`),
+    the field is then created again from its value when requested.
+    The :class:`version` of an entry counts the changes made to it with :meth:`setKey` and :meth:`setField`.
     """
+    __slots__ = ('_id', 'key', 'fields', 'extraFields', 'version')
+    requiredFieldTypes = ()
+    optionalFieldTypes = ((FieldName.Crossref, Field),
+                          (FieldName.Key, Field))
+    additionalFieldTypes = ((FieldName.Annote, Field),
+                            (FieldName.DOI, DOI),
+                            (FieldName.Paper, Paper),
+                            (FieldName.Abstract, Field))
+    importantFields = []   # contains keys from optionalFields
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.schema = FieldSchema(cls.requiredFieldTypes, cls.optionalFieldTypes, cls.additionalFieldTypes)
+    
     def __init__(self):
         self._id = None
         self.key = ''
-        self.requiredFields = dict()
-        self.optionalFields = {FieldName.Crossref: Field(FieldName.Crossref),
-                               FieldName.Key: Field(FieldName.Key)}
-        self.additionalFields = {FieldName.Annote: Field(FieldName.Annote),
-                                 FieldName.DOI: DOI(),
-                                 FieldName.Paper: Paper(),
-                                 FieldName.Abstract: Field(FieldName.Abstract)}
-        self.importantFields = []   # contains keys from optionalFields
+        self.fields = [None] * len(self.schema.names)
+        self.extraFields = None
+        self.version = 0
+    
+    @property
+    def requiredFields(self):
+        return FieldGroup(self, self.schema.required)
+    
+    @property
+    def optionalFields(self):
+        return FieldGroup(self, self.schema.optional)
+    
+    @property
+    def additionalFields(self):
+        if self.extraFields:
+            return FieldGroup(self, self.schema.additional + tuple(self.extraFields))
+        return FieldGroup(self, self.schema.additional)
         
     def getId(self):
         """
@@ -176,6 +292,7 @@ class Entry(object):
         :param key: The key of the entry.
         """
         self.key = key
+        self.version += 1
     
     def generateKey(self):
         """
@@ -183,7 +300,7 @@ class Entry(object):
         """
         key = self.getField(FieldName.Key)
         if not key.isEmpty():
-            key = Field.simplify(key.getValue())
+            key = key.getSimpleValue()
         else:
             # First author's last name (no {}, no spaces) concatenated with year
             author = self.getField(FieldName.Author)
@@ -203,14 +320,52 @@ class Entry(object):
         :return: The field of the entry.
         :raises Exception: If the field does not exist in this entry.
         """
-        if field in self.requiredFields:
-            return self.requiredFields[field]
-        elif field in self.optionalFields:
-            return self.optionalFields[field]
-        elif field in self.additionalFields:
-            return self.additionalFields[field]
+        slot = self.schema.slots.get(field)
+        if slot is not None:
+            return self.__getSlotField(slot)
+        elif self.extraFields and field in self.extraFields:
+            return self.extraFields[field]
         else:
             raise Exception('Invalid field requested.')
+    
+    def __getSlotField(self, slot):
+        """
+        Get the field of a slot, creating it if the slot holds no field. The entry keeps the value of a created field when it is set.
+        """
+        field = self.fields[slot]
+        if field is None:
+            field = self.schema.createField(slot)
+        elif field.__class__ is str:
+            field = self.schema.createField(slot, field)
+        else:
+            return field
+        field.owner = self
+        return field
+    
+    def attachField(self, field):
+        """
+        Keep a field in this entry, in place of the field with the same name.
+        
+        :type field: :class:`Field<app.field.Field>`
+        :param field: The field.
+        """
+        slot = self.schema.slots.get(field.getName())
+        if slot is not None:
+            if field.keptByEntry:
+                self.fields[slot] = field
+                field.owner = None
+            elif field.unformatted or field.hasCachedValues():
+                # The field is kept until its value is formatted, and while it caches values computed from it
+                self.fields[slot] = field
+                field.owner = self
+            else:
+                # Only the value is kept, later changes of the field are given back to the entry
+                self.fields[slot] = field.getValue()
+                field.owner = self
+        else:
+            if self.extraFields is None:
+                self.extraFields = dict()
+            self.extraFields[field.getName()] = field
         
     def getFieldValue(self, field):
         """
@@ -252,23 +407,28 @@ class Entry(object):
         :param value: The value of the field.
         :raises Exception: If the field does not exist in this entry.
         """
-        if field in self.requiredFields:
-            self.requiredFields[field].setValue(value)
-        elif field in self.optionalFields:
-            self.optionalFields[field].setValue(value)
-        elif field in self.additionalFields:
-            self.additionalFields[field].setValue(value)
+        self.version += 1
+        slot = self.schema.slots.get(field)
+        if slot is not None:
+            if self.fields[slot] is not None or value != '':
+                self.__getSlotField(slot).setValue(value)
+        elif self.extraFields and field in self.extraFields:
+            self.extraFields[field].setValue(value)
         else:
             raise Exception('Field %s not found.' % field)
     
     def formatField(self, field):
         """
-        Correctly format a field inplace.
+        Correctly format a field inplace, when its value is first needed.
         
         :type field: :class:`str`
         :param field: The name of the field.
         """
-        self.getField(field).format()
+        slot = self.schema.slots.get(field)
+        if slot is not None and self.fields[slot] is None:
+            # Nothing to format in an empty field
+            return
+        self.getField(field).formatLater()
         
     def iterAllFields(self):
         """
@@ -292,13 +452,25 @@ class Entry(object):
         :rtype: ``generator`` of :class:`Field<app.field.Field>`
         :return: The list of fields.
         """
-        # Sorted deterministic list of fields: first required then optional then additional
-        for field in self.requiredFields.values():
-            yield field
-        for field in self.optionalFields.values():
-            yield field
-        for field in self.additionalFields.values():
-            yield field
+        for slot in range(len(self.fields)):
+            yield self.__getSlotField(slot)
+        if self.extraFields:
+            for field in self.extraFields.values():
+                yield field
+    
+    def __iterKeptFields(self):
+        """
+        Iterator over the fields kept by this entry, that is all fields except those that were never given a value.
+        
+        :rtype: ``generator`` of :class:`Field<app.field.Field>`
+        :return: The list of fields.
+        """
+        for slot, field in enumerate(self.fields):
+            if field is not None:
+                yield self.__getSlotField(slot)
+        if self.extraFields:
+            for field in self.extraFields.values():
+                yield field
         
     def iterRequiredFields(self):
         """
@@ -308,7 +480,7 @@ class Entry(object):
         :return: The list of fields.
         """
         # Sorted deterministic list
-        for field in sorted(iter(self.requiredFields.values()), key=lambda x:x.getName()):
+        for field in sorted(self.requiredFields.values(), key=lambda x:x.getName()):
             yield field
         
     def iterOptionalFields(self):
@@ -319,7 +491,7 @@ class Entry(object):
         :return: The list of fields.
         """
         # Sorted deterministic list
-        for field in sorted(iter(self.optionalFields.values()), key=lambda x:x.getName()):
+        for field in sorted(self.optionalFields.values(), key=lambda x:x.getName()):
             yield field
         
     def iterAdditionalFields(self):
@@ -340,13 +512,31 @@ class Entry(object):
         :rtype: :class:`bool`
         :return: :class:`True` if valid, :class:`False` otherwise.
         """
-        for field in self.requiredFields:
-            if self.requiredFields[field].isEmpty():
+        for field in self.schema.required:
+            if self.isFieldEmpty(field):
                 return ValidationResult(ValidationResult.ERROR, field)
         for field in self.importantFields:
-            if self.optionalFields[field].isEmpty():
+            if self.isFieldEmpty(field):
                 return ValidationResult(ValidationResult.WARNING, field)
         return ValidationResult(ValidationResult.SUCCESS)
+    
+    def isFieldEmpty(self, field):
+        """
+        Verify if a field of this entry does not have a value, without creating it.
+        
+        :type field: :class:`str`
+        :param field: The name of the field.
+        :rtype: :class:`bool`
+        :return: :class:`True` if the value is empty, :class:`False` otherwise.
+        :raises Exception: If the field does not exist in this entry.
+        """
+        slot = self.schema.slots.get(field)
+        if slot is not None:
+            field = self.fields[slot]
+            if field is None or field.__class__ is str:
+                return not field
+            return field.isEmpty()
+        return self.getField(field).isEmpty()
         
     def matchesRegex(self, query):
         """
@@ -357,10 +547,10 @@ class Entry(object):
         :rtype: :class:`bool`
         :return: :class:`True` if query matched, :class:`False` otherwise.
         """
-        for value in self.__iterAllFieldsUnsorted():
-            if re.search(query, Field.simplify(value.getValue())):
+        for value in self.__iterKeptFields():
+            if re.search(query, value.getSimpleValue()):
                 return True
-        return False
+        return None in self.fields and re.search(query, '') is not None
         
     def matchesExact(self, query):
         """
@@ -372,14 +562,29 @@ class Entry(object):
         :return: :class:`True` if query matched, :class:`False` otherwise.
         """
         query = query.lower()
-        for value in self.__iterAllFieldsUnsorted():
-            if query in Field.simplify(value.getValue()).lower():
+        for value in self.__iterKeptFields():
+            if query in value.getLowerValue():
                 return True
-        return False
+        return None in self.fields and query == ''
     
     def __str__(self):
         return self.toBibTeX()
     
+    def toCompact(self):
+        """
+        Convert the entry into a compact picklable form, holding only its type, its key and its non-empty fields.
+        The id is not part of it.
+        
+        :rtype: ``tuple``
+        :return: The entry in compact form.
+        
+        .. seealso:: :meth:`EntryType.fromCompact<app.entry_type.EntryType.fromCompact>`.
+        """
+        standard = FieldName.getAllFieldNames()
+        fields = tuple((field.getName(), field.toCompact()) for field in self.__iterKeptFields()
+                       if not field.isEmpty() or field.getName() not in standard)
+        return (self.getEntryType(), self.getKey(), fields)
+    
     def toEntryDict(self):
         """
         Convert the entry into an :class:`EntryDict<gui.app_interface.EntryDict>`.
@@ -524,21 +729,30 @@ class Entry(object):
         :rtype: :class:`str`
         :return: The INSERT statement.
         """
+        values = self.toSQLValues()
+        if values is None:
+            return ''
+        return '''INSERT INTO Paper (bibtexKey,title,doi,bibtex,preview) VALUES (N'%s', N'%s', N'%s', N'%s', N'%s');''' \
+            % tuple(Utils().escapeSQLCharacters(value) for value in values)
+    
+    def toSQLValues(self):
+        """
+        Get the values of the columns of the entry in the Paper table of the SQL database: its key, title, paper URL, BibTeX and preview.
+        The values are not escaped.
+        
+        :rtype: ``tuple``
+        :return: The values, ``None`` if the entry cannot be converted.
+        
+        .. versionadded:: 1.5
+        """
         try:
-            key = Utils().escapeSQLCharacters(self.getKey())
-            title = Utils().escapeSQLCharacters(self.getField(FieldName.Title).getValue())
-            bibtex = Utils().escapeSQLCharacters(self.toBibTeX(ignoreEmptyField=True).replace('\n',''))
-            preview = Utils().escapeSQLCharacters(self.toHtmlDefault().replace('\n',''))
             url = self.getField(FieldName.Paper).getValue()
-            if url:
-                if url != '' and not url.startswith('http://'):
-                    url = Utils().escapeSQLCharacters('http://' + url)
-            else:
-                    url = ''
-            return '''INSERT INTO Paper (bibtexKey,title,doi,bibtex,preview) VALUES (N'%s', N'%s', N'%s', N'%s', N'%s');''' \
-                % (key, title, url, bibtex, preview)
+            if url and not url.startswith('http://'):
+                url = 'http://' + url
+            return (self.getKey(), self.getField(FieldName.Title).getValue(), url or '',
+                    self.toBibTeX(ignoreEmptyField=True).replace('\n',''), self.toHtmlDefault().replace('\n',''))
         except:
-            return ''
+            return None
     
     @staticmethod
     def getEntryType():
@@ -568,19 +782,15 @@ class EmptyEntry(Entry):
     """
     An entry with no type.
     """
+    __slots__ = ()
+    optionalFieldTypes = ()
+    additionalFieldTypes = ((FieldName.DOI, DOI),
+                            (FieldName.Paper, Paper))
     
     @staticmethod
     def getEntryType():
         return ''
         
-    def __init__(self):
-        super(EmptyEntry, self).__init__()
-        self.entryType = ''
-        self.requiredFields = dict()
-        self.optionalFields = dict()
-        self.additionalFields = {FieldName.DOI: DOI(),
-                                 FieldName.Paper: Paper()}
-    
     def generateKey(self):
         return ''
     
@@ -603,24 +813,22 @@ class Article(Entry):
     """
     An article from a journal or magazine.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Title, Title),
+                          (FieldName.Journal, Field),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Volume, Field),
+                                                     (FieldName.Number, Field),
+                                                     (FieldName.Pages, Pages),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
+    importantFields = [FieldName.Volume, FieldName.Pages]
     
     @staticmethod
     def getEntryType():
         return 'article'
     
-    def __init__(self):
-        super(Article, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Title: Title(),
-                                FieldName.Journal: Field(FieldName.Journal),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Volume: Field(FieldName.Volume),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Pages: Pages(),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-        self.importantFields = [FieldName.Volume, FieldName.Pages]
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
     
@@ -699,26 +907,24 @@ class Book(Entry):
     """
     A book with an explicit publisher.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Editor, Editor),
+                          (FieldName.Title, Title),
+                          (FieldName.Publisher, Field),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Volume, Field),
+                                                     (FieldName.Number, Field),
+                                                     (FieldName.Series, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Edition, Field),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
     
     @staticmethod
     def getEntryType():
         return 'book'
     
-    def __init__(self):
-        super(Book, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Editor: Editor(),
-                                FieldName.Title: Title(),
-                                FieldName.Publisher: Field(FieldName.Publisher),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Volume: Field(FieldName.Volume),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Series: Field(FieldName.Series),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Edition: Field(FieldName.Edition),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-    
     def getContributors(self):
         if not self.getField(FieldName.Author).isEmpty():
             return self.getField(FieldName.Author).getContributors()
@@ -728,7 +934,7 @@ class Book(Entry):
     def generateKey(self):
         key = self.getField(FieldName.Key)
         if not key.isEmpty():
-            key = Field.simplify(key.getValue())
+            key = key.getSimpleValue()
         elif not self.getField(FieldName.Author).isEmpty():
             # First author's last name (no {}, no spaces) concatenated with year
             key = Field.simplify(self.getField(FieldName.Author).getFirstLastName())
@@ -851,21 +1057,19 @@ class Booklet(Entry):
     """
     A work that is printed and bound, but without a named publisher or sponsoring institution.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Title, Title),)
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Author, Author),
+                                                     (FieldName.Howpublished, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Year, Year),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
     
     @staticmethod
     def getEntryType():
         return 'booklet'
     
-    def __init__(self):
-        super(Booklet, self).__init__()
-        self.requiredFields = { FieldName.Title: Title()}
-        self.optionalFields.update({FieldName.Author: Author(),
-                                    FieldName.Howpublished: Field(FieldName.Howpublished),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Year: Year(),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
         
@@ -940,29 +1144,20 @@ class Inbook(Book):
     """
     A part of a book, which may be a chapter (or section or whatever) and/or a range of pages.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Editor, Editor),
+                          (FieldName.Title, Field),
+                          (FieldName.Publisher, Field),
+                          (FieldName.Chapter, Chapter),
+                          (FieldName.Pages, Pages),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Book.optionalFieldTypes + ((FieldName.Type, Field),)
     
     @staticmethod
     def getEntryType():
         return 'inbook'
     
-    def __init__(self):
-        super(Inbook, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Editor: Editor(),
-                                FieldName.Title: Field(FieldName.Title),
-                                FieldName.Publisher: Field(FieldName.Publisher),
-                                FieldName.Chapter: Chapter(),
-                                FieldName.Pages: Pages(),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Volume: Field(FieldName.Volume),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Series: Field(FieldName.Series),
-                                    FieldName.Type: Field(FieldName.Type),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Edition: Field(FieldName.Edition),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-    
     def getContributors(self):
         if not self.getField(FieldName.Author).isEmpty():
             return self.getField(FieldName.Author).getContributors()
@@ -1093,31 +1288,29 @@ class Incollection(Entry):
     """
     A part of a book having its own title.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Title, Title),
+                          (FieldName.BookTitle, Field),
+                          (FieldName.Publisher, Field),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Editor, Editor),
+                                                     (FieldName.Volume, Field),
+                                                     (FieldName.Number, Field),
+                                                     (FieldName.Series, Field),
+                                                     (FieldName.Type, Field),
+                                                     (FieldName.Chapter, Field),
+                                                     (FieldName.Pages, Pages),
+                                                     (FieldName.Edition, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
+    importantFields = [FieldName.Pages]
     
     @staticmethod
     def getEntryType():
         return 'incollection'
     
-    def __init__(self):
-        super(Incollection, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Title: Title(),
-                                FieldName.BookTitle: Field(FieldName.BookTitle),
-                                FieldName.Publisher: Field(FieldName.Publisher),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Editor: Editor(),
-                                    FieldName.Volume: Field(FieldName.Volume),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Series: Field(FieldName.Series),
-                                    FieldName.Type: Field(FieldName.Type),
-                                    FieldName.Chapter: Field(FieldName.Chapter),
-                                    FieldName.Pages: Pages(),
-                                    FieldName.Edition: Field(FieldName.Edition),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-        self.importantFields = [FieldName.Pages]
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
     
@@ -1255,29 +1448,27 @@ class Inproceedings(Entry):
     """
     An article in a conference proceedings.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Title, Title),
+                          (FieldName.BookTitle, Field),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Editor, Editor),
+                                                     (FieldName.Volume, Field),
+                                                     (FieldName.Number, Field),
+                                                     (FieldName.Series, Field),
+                                                     (FieldName.Pages, Pages),
+                                                     (FieldName.Organization, Organization),
+                                                     (FieldName.Publisher, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
+    importantFields = [FieldName.Volume, FieldName.Pages, FieldName.Publisher]
     
     @staticmethod
     def getEntryType():
         return 'inproceedings'
     
-    def __init__(self):
-        super(Inproceedings, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Title: Title(),
-                                FieldName.BookTitle: Field(FieldName.BookTitle),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Editor: Editor(),
-                                    FieldName.Volume: Field(FieldName.Volume),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Series: Field(FieldName.Series),
-                                    FieldName.Pages: Pages(),
-                                    FieldName.Organization: Organization(),
-                                    FieldName.Publisher: Field(FieldName.Publisher),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-        self.importantFields = [FieldName.Volume, FieldName.Pages, FieldName.Publisher]
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
     
@@ -1422,42 +1613,38 @@ class Conference(Inproceedings):
 	
     :deprecated: The same as INPROCEEDINGS, included for Scribe compatibility.
     """
+    __slots__ = ()
     
     @staticmethod
     def getEntryType():
         return 'conference'
-    
-    def __init__(self):
-        super(Conference, self).__init__()
         
     
 class Manual(Entry):
     """
     Technical documentation.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Title, Title),)
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Author, Author),
+                                                     (FieldName.Organization, Organization),
+                                                     (FieldName.Edition, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Year, Year),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
+    importantFields = [FieldName.Author, FieldName.Year]
     
     @staticmethod
     def getEntryType():
         return 'manual'
     
-    def __init__(self):
-        super(Manual, self).__init__()
-        self.requiredFields = { FieldName.Title: Title()}
-        self.optionalFields.update({FieldName.Author: Author(),
-                                    FieldName.Organization: Organization(),
-                                    FieldName.Edition: Field(FieldName.Edition),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Year: Year(),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-        self.importantFields = [FieldName.Author, FieldName.Year]
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
     
     def generateKey(self):
         key = self.getField(FieldName.Key)
-        key = Field.simplify(key.getValue())
+        key = key.getSimpleValue()
         if not self.getField(FieldName.Author).isEmpty():
             key = Field.simplify(self.getField(FieldName.Author).getFirstLastName())
         elif not self.getField(FieldName.Organization).isEmpty():
@@ -1547,20 +1734,18 @@ class Misc(Entry):
     """
     Document of any other type.
     """
+    __slots__ = ()
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Author, Author),
+                                                     (FieldName.Title, Title),
+                                                     (FieldName.Howpublished, Field),
+                                                     (FieldName.Year, Year),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
     
     @staticmethod
     def getEntryType():
         return 'misc'
     
-    def __init__(self):
-        super(Misc, self).__init__()
-        self.optionalFields.update({FieldName.Author: Author(),
-                                    FieldName.Title: Title(),
-                                    FieldName.Howpublished: Field(FieldName.Howpublished),
-                                    FieldName.Year: Year(),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
         
@@ -1633,22 +1818,20 @@ class Phdthesis(Entry):
     """
     A Ph.D. thesis.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Title, Title),
+                          (FieldName.School, Field),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Type, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
     
     @staticmethod
     def getEntryType():
         return 'phdthesis'
     
-    def __init__(self):
-        super(Phdthesis, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Title: Title(),
-                                FieldName.School: Field(FieldName.School),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Type: Field(FieldName.Type),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
         
@@ -1717,46 +1900,41 @@ class Mastersthesis(Phdthesis):
     """
     A Master's thesis.
     """
+    __slots__ = ()
     
     @staticmethod
     def getEntryType():
         return 'mastersthesis'
     
-    def __init__(self):
-        super(Mastersthesis, self).__init__()
-
-    
 class Proceedings(Entry):
     """
     The proceedings of a conference.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Title, Title),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Editor, Editor),
+                                                     (FieldName.Volume, Field),
+                                                     (FieldName.Number, Field),
+                                                     (FieldName.Series, Field),
+                                                     (FieldName.Organization, Organization),
+                                                     (FieldName.Publisher, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
+    importantFields = [FieldName.Editor, FieldName.Volume, FieldName.Publisher]
     
     @staticmethod
     def getEntryType():
         return 'proceedings'
     
-    def __init__(self):
-        super(Proceedings, self).__init__()
-        self.requiredFields = { FieldName.Title: Title(),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Editor: Editor(),
-                                    FieldName.Volume: Field(FieldName.Volume),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Series: Field(FieldName.Series),
-                                    FieldName.Organization: Organization(),
-                                    FieldName.Publisher: Field(FieldName.Publisher),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-        self.importantFields = [FieldName.Editor, FieldName.Volume, FieldName.Publisher]
-    
     def getContributors(self):
         return self.getField(FieldName.Editor).getContributors()
     
     def generateKey(self):
         key = self.getField(FieldName.Key)
         if not key.isEmpty():
-            key = Field.simplify(key.getValue())
+            key = key.getSimpleValue()
         elif not self.getField(FieldName.Editor).isEmpty():
             # First author's last name (no {}, no spaces) concatenated with year
             key = Field.simplify(self.getField(FieldName.Editor).getFirstLastName())
@@ -1871,23 +2049,21 @@ class Techreport(Entry):
     """
     A report published by a school or other institution, usually numbered within a series.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Title, Title),
+                          (FieldName.Institution, Field),
+                          (FieldName.Year, Year))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Type, Field),
+                                                     (FieldName.Number, Field),
+                                                     (FieldName.Address, Field),
+                                                     (FieldName.Month, Field),
+                                                     (FieldName.Note, Field))
     
     @staticmethod
     def getEntryType():
         return 'techreport'
     
-    def __init__(self):
-        super(Techreport, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Title: Title(),
-                                FieldName.Institution: Field(FieldName.Institution),
-                                FieldName.Year: Year()}
-        self.optionalFields.update({FieldName.Type: Field(FieldName.Type),
-                                    FieldName.Number: Field(FieldName.Number),
-                                    FieldName.Address: Field(FieldName.Address),
-                                    FieldName.Month: Field(FieldName.Month),
-                                    FieldName.Note: Field(FieldName.Note)})
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
         
@@ -1962,19 +2138,17 @@ class Unpublished(Entry):
     """
     A report published by a school or other institution, usually numbered within a series.
     """
+    __slots__ = ()
+    requiredFieldTypes = ((FieldName.Author, Author),
+                          (FieldName.Title, Title),
+                          (FieldName.Note, Field))
+    optionalFieldTypes = Entry.optionalFieldTypes + ((FieldName.Year, Year),
+                                                     (FieldName.Month, Field))
     
     @staticmethod
     def getEntryType():
         return 'unpublished'
     
-    def __init__(self):
-        super(Unpublished, self).__init__()
-        self.requiredFields = { FieldName.Author: Author(),
-                                FieldName.Title: Title(),
-                                FieldName.Note: Field(FieldName.Note)}
-        self.optionalFields.update({FieldName.Year: Year(),
-                                    FieldName.Month: Field(FieldName.Month)})
-    
     def getContributors(self):
         return self.getField(FieldName.Author).getContributors()
         
@@ -27,6 +27,7 @@ This module represents the entry types.
 """
 from app.entry import Article, Book, Inproceedings, Phdthesis, Techreport, Booklet, Inbook, Incollection, \
                     Conference, Manual, Mastersthesis, Misc, Proceedings, Unpublished, EmptyEntry
+from app.field import Field
                     
 class EntryType:
     """
@@ -107,4 +108,23 @@ class EntryType:
             return Unpublished()
         else:
             return EmptyEntry()
-
+    
+    @staticmethod
+    def fromCompact(compact):
+        """
+        Create an entry from its compact form.
+        @type compact: L{tuple}
+        @param compact: The entry as returned by L{app.entry.Entry.toCompact}.
+        @rtype: L{app.entry.Entry}
+        @return: The entry, without an id.
+        """
+        entryType, key, fields = compact
+        entry = EntryType.createEntry(entryType) if entryType else EmptyEntry()
+        entry.setKey(key)
+        for name, data in fields:
+            try:
+                field = entry.getField(name)
+            except Exception:
+                field = entry.additionalFields[name] = Field(name)
+            field.fromCompact(data)
+        return entry
@@ -34,7 +34,14 @@ class Field(object):
     """
     The generic class representing any field of an entry.
     Every field has a C{name} and a C{value}.
+    The value can be formatted when it is first needed rather than when it is set, see L{formatLater}.
     """
+    __slots__ = ('name', '_value', 'unformatted', 'simpleValue', 'lowerValue', 'htmlValue', 'owner')
+    keptByEntry = False
+    """
+    Whether an L{entry<app.entry.Entry>} keeps the field itself, because it holds more than its value, rather than its value alone.
+    """
+    
     def __init__(self, name, value=''):
         """
         @type name: L{str}
@@ -43,7 +50,40 @@ class Field(object):
         @param value: The value of the field.
         """
         self.name = name
-        self.value = value
+        self._value = value
+        self.unformatted = False
+        """
+        Whether the value is still to be formatted when it is first needed.
+        """
+        self.simpleValue = None
+        """
+        The simplified value, computed when first needed.
+        """
+        self.lowerValue = None
+        """
+        The simplified value in lowercase, computed when first needed.
+        """
+        self.htmlValue = None
+        """
+        The value in HTML, computed when first needed.
+        """
+        self.owner = None
+        """
+        The L{entry<app.entry.Entry>} to which the value of this field is given back when it is set, if the entry does not keep this field itself.
+        """
+    
+    @property
+    def value(self):
+        """
+        The value of this field, formatted first if that was deferred.
+        """
+        if self.unformatted:
+            self.formatIfNeeded()
+        return self._value
+    
+    @value.setter
+    def value(self, value):
+        self._value = value
     
     def isEmpty(self):
         """
@@ -75,13 +115,55 @@ class Field(object):
         @type value: L{str}
         @param value: The value of the field.
         """
-        self.value = value
+        if self.unformatted:
+            # The former value is formatted first, as if it had not been deferred
+            self.formatIfNeeded()
+        self._value = value
+        self.simpleValue = None
+        self.lowerValue = None
+        self.htmlValue = None
+        if self.owner is not None:
+            self.owner.attachField(self)
         
     def format(self):
         """
         Correctly format the value of this field according to the BibTeX standard.
         """
         pass
+    
+    def formatLater(self):
+        """
+        Format the value of this field as L{format} does, but only when it is first needed.
+        The value, and anything else computed by L{format}, is then formatted on first access.
+        """
+        if self.__class__.format is not Field.format:
+            self.unformatted = True
+            if self.owner is not None:
+                self.owner.attachField(self)
+    
+    def formatIfNeeded(self):
+        """
+        Format the value of this field now if that was deferred by L{formatLater}.
+        """
+        if self.unformatted:
+            self.unformatted = False
+            self.format()
+        
+    def toCompact(self):
+        """
+        Get the state of this field in a compact picklable form.
+        @see: L{fromCompact}.
+        @return: The value of the field.
+        """
+        return self.value
+        
+    def fromCompact(self, data):
+        """
+        Restore the state of this field from its compact form, without formatting it again.
+        @see: L{toCompact}.
+        @param data: The compact form of the field.
+        """
+        self.setValue(data)
         
     def getHTMLValue(self):
         """
@@ -89,7 +171,49 @@ class Field(object):
         @see: L{toHTML}.
         @return: The value in HTML encoding.
         """
-        return Field.toHTML(self.value)
+        if self.htmlValue is None:
+            self.htmlValue = Field.toHTML(self.value)
+            self.keepCachedValues()
+        return self.htmlValue
+    
+    def getSimpleValue(self):
+        """
+        Get the value of this field without special characters.
+        @see: L{simplify}.
+        @rtype: L{str}
+        @return: The simplified value.
+        """
+        if self.simpleValue is None:
+            self.simpleValue = Field.simplify(self.value)
+            self.keepCachedValues()
+        return self.simpleValue
+    
+    def getLowerValue(self):
+        """
+        Get the value of this field without special characters and in lowercase.
+        @see: L{simplify}.
+        @rtype: L{str}
+        @return: The simplified value in lowercase.
+        """
+        if self.lowerValue is None:
+            self.lowerValue = self.getSimpleValue().lower()
+            self.keepCachedValues()
+        return self.lowerValue
+    
+    def hasCachedValues(self):
+        """
+        Verifies if a value computed from the value of this field is cached.
+        @rtype: L{bool}
+        @return: L{True} if the simplified, lowercase or HTML value is cached, L{False} otherwise.
+        """
+        return self.simpleValue is not None or self.lowerValue is not None or self.htmlValue is not None
+    
+    def keepCachedValues(self):
+        """
+        Have the entry holding only the value of this field keep this field itself, so that its cached values are not computed again.
+        """
+        if self.owner is not None:
+            self.owner.attachField(self)
         
     def getACMValue(self):
         """
@@ -151,6 +275,8 @@ class Contributor(object):
     """
     Contributor of an article such asE{:} an author, an editor, etc.
     """
+    __slots__ = ('first_name', 'last_name', 'preposition', 'suffix', 'simpleName')
+    
     def __init__(self, last, first='', von='', jr=''):
         """
         @type last: L{str}
@@ -170,6 +296,21 @@ class Contributor(object):
         self.last_name = last.strip()
         self.preposition = von.strip()
         self.suffix = jr.strip()
+        self.simpleName = None
+        """
+        The simplified full name, computed when first needed.
+        """
+    
+    def getSimpleName(self):
+        """
+        Get the full name without special characters.
+        @see: L{Field.simplify}.
+        @rtype: L{str}
+        @return: The simplified name.
+        """
+        if self.simpleName is None:
+            self.simpleName = Field.simplify(str(self))
+        return self.simpleName
     
     def __str__(self):
         s = ''
@@ -196,14 +337,20 @@ class ContributorField(Field):
     """
     ET_AL = ('et al.', 'and others')
     SPLIT = ' and '
+    re_von = """(?P<von>([a-z]+)|(\\\\\{.[a-z]+\})|(\{\\\\.[a-z]+\})|(\\\\.\{[a-z]+\})|(\\\\[^{][a-z]+))?"""
+    re_von_Last_Jr_First = re.compile(re_von + """\s*(?P<last>[^,]+)\s*,\s*(?P<jr>[^,]*)\s*,\s*(?P<first>.*)""", re.RegexFlag.DOTALL)
+    re_von_Last_First = re.compile(re_von + """\s*(?P<last>[^,]+)\s*,\s*(?P<first>.*)""", re.RegexFlag.DOTALL)
+    __slots__ = ('contributors', 'hasEtal', 'htmlValues')
+    keptByEntry = True
     
     def __init__(self, name, value=''):
         super(ContributorField, self).__init__(name, value)
         self.contributors = []
         self.hasEtal = False
-        von = """(?P<von>([a-z]+)|(\\\\\{.[a-z]+\})|(\{\\\\.[a-z]+\})|(\\\\.\{[a-z]+\})|(\\\\[^{][a-z]+))?"""
-        self.re_von_Last_Jr_First = re.compile(von + """\s*(?P<last>[^,]+)\s*,\s*(?P<jr>[^,]*)\s*,\s*(?P<first>.*)""", re.RegexFlag.DOTALL)
-        self.re_von_Last_First = re.compile(von + """\s*(?P<last>[^,]+)\s*,\s*(?P<first>.*)""", re.RegexFlag.DOTALL)
+        self.htmlValues = None
+        """
+        The names of the contributors in HTML for each name order, computed when first needed.
+        """
     
     def getContributors(self):
         """
@@ -211,15 +358,84 @@ class ContributorField(Field):
         @rtype: list of L{Contributor}
         @return: The list of contributors.
         """
+        self.formatIfNeeded()
         return self.contributors
     
+    def toCompact(self):
+        """
+        Get the value of this field with its parsed contributors in a compact picklable form.
+        @rtype: L{tuple}
+        @return: The value, whether it ends with et al., and the (last, first, von, jr) names of each contributor.
+        """
+        self.formatIfNeeded()
+        return (self.value, self.hasEtal,
+                tuple((c.last_name, c.first_name, c.preposition, c.suffix) for c in self.contributors))
+    
+    def fromCompact(self, data):
+        """
+        Restore the value and the contributors of this field without parsing the names again.
+        @see: L{toCompact}.
+        @type data: L{tuple}
+        @param data: The compact form of the field.
+        """
+        value, self.hasEtal, contributors = data
+        self.setValue(value)
+        self.contributors = [Contributor(last=last, first=first, von=von, jr=jr) for last, first, von, jr in contributors]
+    
     def getContributorsCount(self):
         """
         Get the number of contributors.
         @rtype: L{int}
         @return: The number of contributors.
         """
+        self.formatIfNeeded()
         return len(self.contributors)
+    
+    def setValue(self, value):
+        super(ContributorField, self).setValue(value)
+        self.htmlValues = None
+    
+    def isEmpty(self):
+        # Names with more than spaces and commas are never emptied by formatting, so they are not formatted to know it
+        if self.unformatted and self._value.replace(',', '').strip():
+            return False
+        return super(ContributorField, self).isEmpty()
+    
+    def formatLater(self):
+        """
+        Format the names only when they are first needed, but check right away that they can be formatted,
+        as an incorrect name must reject the entry while it is parsed rather than when it is first read.
+        @raise Exception: If a name is not in a legal format.
+        """
+        self.__checkNames()
+        super(ContributorField, self).formatLater()
+    
+    def __checkNames(self):
+        """
+        Verify that L{format} accepts the names, without building the contributors.
+        A name with a comma, unless it starts with it, always matches one of the formats with a comma,
+        so only the names without a comma are checked, as L{format} does.
+        @raise Exception: If a name is not in a legal format.
+        """
+        people = self._value
+        if not people:
+            return
+        for etal in ContributorField.ET_AL:
+            etal_ix = people.find(etal)
+            if etal_ix >= 0:
+                people = people[:etal_ix]
+                break
+        for person in people.split(ContributorField.SPLIT):
+            if ',' in person and person[0] != ',':
+                continue
+            person = person.split()
+            if not person:
+                raise Exception('Incorrect author name: missing name.')
+            for i,name in enumerate(person):
+                if name[0].islower():
+                    if i == len(person) - 1:
+                        raise Exception('Incorrect author name: missing last name.')
+                    break
         
     def format(self):
         people = self.value
@@ -262,9 +478,10 @@ class ContributorField(Field):
                                 lastIx = i + vonIx + 1
                                 break
                         self.contributors.append(Contributor(last=' '.join(person[lastIx:]), first=' '.join(person[:vonIx]), von=' '.join(person[vonIx:lastIx])))
-        self.value = ContributorField.SPLIT.join([str(c) for c in self.contributors])
+        value = ContributorField.SPLIT.join([str(c) for c in self.contributors])
         if self.hasEtal:
-            self.value += ' ' + ContributorField.ET_AL[0]
+            value += ' ' + ContributorField.ET_AL[0]
+        self.setValue(value)
     
     def getFirstNameFirst(self, contributor):
             person = ''
@@ -305,6 +522,14 @@ class ContributorField(Field):
         @return: The contributors in HTML.
         @raise Exception: If a name is not in a legal format.
         """
+        self.formatIfNeeded()
+        if self.htmlValues is None:
+            self.htmlValues = dict()
+        if firstNameOrder.__name__ not in self.htmlValues:
+            self.htmlValues[firstNameOrder.__name__] = self.__toHTML(firstNameOrder)
+        return self.htmlValues[firstNameOrder.__name__]
+    
+    def __toHTML(self, firstNameOrder):
         try:
             value = ''
             people = []
@@ -350,6 +575,7 @@ class ContributorField(Field):
         @rtype: L{str}
         @return: The last name of the first contributor.
         """
+        self.formatIfNeeded()
         if not self.contributors:
             raise Exception('No author or editor name found.')
         return self.contributors[0].last_name.replace(' ', '')
@@ -359,6 +585,8 @@ class Author(ContributorField):
     """
     The field for authors.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Author, self).__init__(FieldName.Author, value)
         
@@ -367,6 +595,8 @@ class Editor(ContributorField):
     """
     The field for editors.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Editor, self).__init__(FieldName.Editor, value)
         
@@ -375,6 +605,8 @@ class Title(Field):
     """
     The field for title.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Title, self).__init__(FieldName.Title, value)
         
@@ -386,6 +618,8 @@ class Chapter(Title):
     """
     The field for chapter.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Chapter, self).__init__(value)
         self.name = FieldName.Chapter
@@ -395,6 +629,8 @@ class Organization(Field):
     """
     The field for the organization.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Organization, self).__init__(FieldName.Organization, value)
     
@@ -413,18 +649,22 @@ class Pages(Field):
     """
     The field for pages.
     """
+    re_dashes = re.compile("""-+""")
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Pages, self).__init__(FieldName.Pages, value)
-        self.re_dashes = re.compile("""-+""")
         
     def format(self):
-        self.value = self.clean(self.value)
+        self.setValue(self.clean(self.value))
 
 
 class Year(Field):
     """
     The field for year.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(Year, self).__init__(FieldName.Year, value)
     
@@ -440,25 +680,28 @@ class Year(Field):
             return ''
         
     def format(self):
-        self.value = self.clean(self.value)
+        self.setValue(self.clean(self.value))
 
 
 class DOI(Field):
     """
     The field for DOI.
     """
+    __slots__ = ()
+    
     def __init__(self, value = ''):
         super(DOI, self).__init__(FieldName.DOI, value)
         
     def format(self):
-        self.value = self.value.replace(' ', '')
-        self.value = self.clean(self.value)
+        self.setValue(self.clean(self.value.replace(' ', '')))
 
 
 class Paper(Field):
     """
     The field for paper.
     """
+    __slots__ = ()
+    
     def __init__(self, value = '', doi = None):
         """
         @type value: L{str}
@@ -473,4 +716,4 @@ class Paper(Field):
             if doi != '':
                 if not doi.startswith('http'):
                     doi = 'https://dx.doi.org/' + doi
-                self.value = doi
+                self.setValue(doi)
@@ -29,7 +29,17 @@ This module represents the importers and exporters.
 from app.field_name import FieldName
 from utils import settings, utils
 from utils.settings import Preferences
+from app.bibtex_parser import BibTeXLexer
+from app.entry_type import EntryType
+from app.manager import ReferenceManager
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import gc
+import hashlib
+import marshal
 import os.path
+import sqlite3
 
 
 class ImpEx(object):
@@ -64,6 +74,65 @@ class ImpEx(object):
 
 
 
+class StringReader(object):
+    """
+    A text stream reading a string by slices, without the copy of the whole string a L{StringIO} makes.
+    As with a L{StringIO}, the line endings are not translated.
+    """
+    def __init__(self, data):
+        """
+        @type data: L{str}
+        @param data: The string.
+        """
+        self.data = data
+        self.position = 0
+    
+    def read(self, size=-1):
+        """
+        Read at most C{size} characters, or the rest of the string if C{size} is negative.
+        """
+        end = len(self.data) if size is None or size < 0 else self.position + size
+        chunk = self.data[self.position:end]
+        self.position += len(chunk)
+        return chunk
+    
+    def readline(self):
+        """
+        Read the next line, with its line ending.
+        """
+        end = self.data.find('\n', self.position)
+        return self.read(-1 if end < 0 else end + 1 - self.position)
+    
+    def close(self):
+        self.data = ''
+
+
+class ExportBuffer(object):
+    """
+    Collects the output of an L{Exporter} in place of its file, until it is taken as one chunk.
+    """
+    def __init__(self):
+        self.__outputs = []
+    
+    def write(self, output):
+        """
+        Add to the output.
+        @type output: L{str}
+        @param output: The output.
+        """
+        self.__outputs.append(output)
+    
+    def take(self):
+        """
+        Take the output collected since the last time.
+        @rtype: L{str}
+        @return: The output.
+        """
+        output = ''.join(self.__outputs)
+        self.__outputs = []
+        return output
+
+
 class Exporter(ImpEx):
     """
     Export a list of L{Entries<app.entry.Entry>} to a specified format.
@@ -77,6 +146,15 @@ class Exporter(ImpEx):
         """
         super(Exporter, self).__init__(path)
         self.entries = entries
+        self.total = 0
+        """
+        The number of entries exported so far.
+        """
+    
+    CHUNK_SIZE = 256
+    """
+    The number of entries in each chunk of the output, written at once to the file.
+    """
     
     def export(self):
         """
@@ -85,20 +163,74 @@ class Exporter(ImpEx):
         @return: The total number of entries successfully exported.
         @raise Exception: If an error occurred during the export process.
         """
-        total = 0
+        self.openDB('w')
+        database = self.database
+        try:
+            database.writelines(self.iterExport())
+        finally:
+            self.database = database
+            self.closeDB()
+        return self.total
+    
+    def iterExport(self):
+        """
+        The export process, producing the output chunk by chunk instead of writing it to the file.
+        @rtype: generator of L{str}
+        @return: The output, in chunks of L{CHUNK_SIZE} entries.
+        @raise Exception: If an error occurred during the export process.
+        """
+        database = self.database
+        self.database = ExportBuffer()
+        self.total = 0
         try:
-            self.openDB('w')
             self._preprocess()
-            for entry in self.entries:
-                output = self._exportEntry(entry)
+            for output in self._iterOutputs():
                 self.write(output)
-                total += 1
+                self.total += 1
+                if self.total % self.CHUNK_SIZE == 0:
+                    yield self.database.take()
             self._postprocess()
-        except:
-            raise
+            yield self.database.take()
         finally:
-            self.closeDB()
-        return total
+            self.database = database
+    
+    def _iterOutputs(self):
+        """
+        Export each entry in turn.
+        @rtype: generator of L{str}
+        @return: The output of each entry.
+        """
+        for entry in self.entries:
+            yield self._exportEntry(entry)
+    
+    def _iterOutputsInParallel(self, processes, exportEntries):
+        """
+        Export the entries in chunks of L{CHUNK_SIZE} in a pool of processes, in the order of the entries.
+        At most two chunks per process are exported ahead, so the memory used does not depend on the number of entries.
+        @type processes: L{int}
+        @param processes: The number of processes.
+        @type exportEntries: C{function}
+        @param exportEntries: The function exporting a chunk of entries in compact form in a worker process, given the preferences.
+        @rtype: generator of L{str}
+        @return: The output of each entry.
+        """
+        preferences = dict(vars(Preferences()))
+        entries = iter(self.entries)
+        pending = deque()
+        finished = False
+        with ProcessPoolExecutor(processes) as pool:
+            try:
+                while not finished or pending:
+                    chunk = [entry.toCompact() for entry in islice(entries, self.CHUNK_SIZE)]
+                    finished = len(chunk) < self.CHUNK_SIZE
+                    if chunk:
+                        pending.append(pool.submit(exportEntries, chunk, preferences))
+                    while pending and (finished or len(pending) > 2 * processes):
+                        for output in pending.popleft().result():
+                            yield output
+            finally:
+                for future in pending:
+                    future.cancel()
 
     def write(self, output):
         self.database.write(output + '\n')
@@ -174,6 +306,12 @@ class HTMLExporter(Exporter):
         """
         super(HTMLExporter, self).__init__(path, entries)
     
+    def _iterOutputs(self):
+        processes = Preferences().exportProcesses
+        if processes > 1:
+            return self._iterOutputsInParallel(processes, exportHTMLEntries)
+        return super(HTMLExporter, self)._iterOutputs()
+    
     def _exportEntry(self, entry):
         """
         Export to HTML following the default style.
@@ -198,10 +336,134 @@ class HTMLExporter(Exporter):
         self.database.write('</ol></body></html>')
     
     
-class MySQLExporter(Exporter):
+class SQLRows(object):
     """
-    Export a list of L{Entries<app.entry.Entry>} to a MySQL database script.
+    Write the rows of a table of the MySQL database script, in INSERT statements of several rows or as tab-separated values to load.
+    @see: L{SQLExportMode<utils.settings.SQLExportMode>}.
+    """
+    COLUMNS = {'Paper': ('id', 'bibtexKey', 'title', 'doi', 'bibtex', 'preview'),
+               'Author': ('id', 'name'),
+               'PaperAuthor': ('paperId', 'authorId')}
     """
+    The columns of each table.
+    """
+    
+    def __init__(self, table, mode):
+        """
+        @type table: L{str}
+        @param table: The name of the table.
+        @type mode: L{str}
+        @param mode: L{SQLExportMode.BATCH<utils.settings.SQLExportMode.BATCH>} or L{SQLExportMode.LOAD_DATA<utils.settings.SQLExportMode.LOAD_DATA>}.
+        """
+        self.table = table
+        self.mode = mode
+        self.batchSize = max(1, Preferences().sqlBatchSize)
+        self.__pending = 0
+        """
+        The number of rows of the INSERT statement not ended yet.
+        """
+    
+    def write(self, values):
+        """
+        Get the output of a row.
+        @type values: L{tuple}
+        @param values: The value of each column, as an L{int} or an unescaped L{str}.
+        @rtype: L{str}
+        @return: The output.
+        """
+        if self.mode == settings.SQLExportMode.LOAD_DATA:
+            return '\t'.join(SQLRows.escapeData(value) for value in values) + '\n'
+        row = '(%s)' % ', '.join(str(value) if isinstance(value, int) else "N'%s'" % utils.Utils().escapeSQLCharacters(value)
+                                 for value in values)
+        if self.__pending == 0:
+            row = 'INSERT INTO %s (%s) VALUES\n%s' % (self.table, ','.join(self.COLUMNS[self.table]), row)
+        else:
+            row = ',\n' + row
+        self.__pending += 1
+        if self.__pending == self.batchSize:
+            self.__pending = 0
+            row += ';\n'
+        return row
+    
+    def close(self):
+        """
+        Get the end of the last INSERT statement.
+        @rtype: L{str}
+        @return: The output.
+        """
+        if self.__pending:
+            self.__pending = 0
+            return ';\n'
+        return ''
+    
+    def getLoadStatement(self, dataPath):
+        """
+        Get the statement loading the tab-separated values of the table, from a file in the directory the script is run.
+        @type dataPath: L{str}
+        @param dataPath: The path to the file of the values.
+        @rtype: L{str}
+        @return: The LOAD DATA statement.
+        """
+        return '''LOAD DATA LOCAL INFILE '%s' INTO TABLE %s CHARACTER SET utf8 FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' (%s);\n''' \
+            % (utils.Utils().escapeSQLCharacters(os.path.basename(dataPath)), self.table, ','.join(self.COLUMNS[self.table]))
+    
+    @staticmethod
+    def escapeData(value):
+        """
+        Escape a value for LOAD DATA, so it holds no tab or new line.
+        @type value: L{int} or L{str}
+        @param value: The value.
+        @rtype: L{str}
+        @return: The escaped value.
+        """
+        if isinstance(value, int):
+            return str(value)
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r').replace('\0', '\\0')
+
+
+class MySQLScript(object):
+    """
+    The rows of the papers, the authors and the paper author assignments of a MySQL database script,
+    shared by the L{Exporters<Exporter>} of a MySQL database script.
+    Each row is written in the way given by a mode, one of L{SQLExportMode<utils.settings.SQLExportMode>}.
+    """
+    TABLES = '''
+-- Table for Papers
+DROP TABLE IF EXISTS Paper;
+CREATE TABLE IF NOT EXISTS Paper (
+    id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    bibtexKey VARCHAR(100) NOT NULL UNIQUE KEY,
+    title VARCHAR(200) DEFAULT NULL,
+    doi VARCHAR(200) DEFAULT NULL,
+    bibtex longtext NOT NULL,
+    preview longtext
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+-- Table for Authors
+DROP TABLE IF EXISTS Author;
+CREATE TABLE IF NOT EXISTS Author (
+    id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(200) NOT NULL UNIQUE KEY
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+-- Table for paper author assignments
+DROP TABLE IF EXISTS PaperAuthor;
+CREATE TABLE IF NOT EXISTS PaperAuthor (
+    paperId INT(11) NOT NULL,
+    authorId INT(11) NOT NULL,
+    PRIMARY KEY (paperId, authorId),
+    KEY FK_Paper (paperId),
+    KEY FK_Author (authorId)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+ALTER TABLE PaperAuthor
+    ADD CONSTRAINT FK_Author FOREIGN KEY (authorId) REFERENCES Author (id),
+    ADD CONSTRAINT FK_Paper FOREIGN KEY (paperId) REFERENCES Paper (id);
+
+'''
+    """
+    The statements creating the database tables.
+    """
+    
     def __init__(self, path, entries):
         """
         @type path: L{str}
@@ -209,68 +471,199 @@ class MySQLExporter(Exporter):
         @type entries: list of L{app.entry.Entry}
         @param entries: The list of entries to export.
         """
-        super(MySQLExporter, self).__init__(path, entries)
+        super(MySQLScript, self).__init__(path, entries)
         ext = os.path.splitext(path)[1]
         self.papersPath = path
         self.authorsPath = os.path.join(os.path.dirname(path), os.path.basename(path)[:-len(ext)] + '_authors' + ext)
         self.assignmentsPath = os.path.join(os.path.dirname(path), os.path.basename(path)[:-len(ext)] + '_assignments' + ext)
         self.unique_contributors = {}
+        self.__contributorNames = {}
+        """
+        The name of each contributor in L{unique_contributors}, by lowercase name.
+        """
     
-    def exportPapers(self):
+    def _writeStatement(self, statement):
+        """
+        Write a statement of the L{SQLExportMode.STATEMENTS<utils.settings.SQLExportMode.STATEMENTS>} mode.
+        @type statement: L{str}
+        @param statement: The statement, with its line ending.
+        """
+        self.database.write(statement)
+    
+    def _iterPapers(self, mode):
+        """
+        Write the rows of the papers, collecting their authors on the way.
+        L{total} is the number of papers once done.
+        @type mode: L{str}
+        @param mode: One of L{SQLExportMode<utils.settings.SQLExportMode>}.
+        @rtype: generator of L{str}
+        @return: The output, in chunks of L{CHUNK_SIZE} papers.
+        """
         papers = 0
-        unique_authors = 0
-        try:
-            self.path = self.papersPath
-            self.openDB('w')
+        rows = SQLRows('Paper', mode)
+        if mode != settings.SQLExportMode.LOAD_DATA:
             self._preprocess()
-            for entry in self.entries:
-                output = self._exportEntry(entry)
-                self.database.write(output + '\n')
-                papers += 1
-                for contributor in entry.getContributors():
-                    contributor = str(contributor)
-                    for uc in self.unique_contributors.keys():
-                        if contributor.lower() == uc.lower():
-                            self.unique_contributors[uc][1].append(papers)
-                            break
-                    else:
-                        unique_authors += 1
-                        self.unique_contributors[contributor] = [unique_authors,[papers]]
-            self._postprocess()
-        except:
-            raise
-        finally:
-            self.closeDB()
-        return papers
+        for entry in self.entries:
+            papers += 1
+            if mode == settings.SQLExportMode.STATEMENTS:
+                self._writeStatement(self._exportEntry(entry) + '\n')
+                self.__addContributors(entry, papers)
+            else:
+                values = entry.toSQLValues()
+                if values is not None:
+                    self.database.write(rows.write((papers,) + values))
+                    self.__addContributors(entry, papers)
+            if papers % self.CHUNK_SIZE == 0:
+                yield self.database.take()
+        self.database.write(rows.close())
+        self._postprocess()
+        self.total = papers
+        yield self.database.take()
     
-    def exportAuthors(self):
+    def __addContributors(self, entry, paperId):
+        """
+        Assign the contributors of an entry to its paper, the first spelling of each name, ignoring case, being kept.
+        """
+        for contributor in entry.getContributors():
+            contributor = str(contributor)
+            name = self.__contributorNames.get(contributor.lower())
+            if name is None:
+                self.__contributorNames[contributor.lower()] = contributor
+                self.unique_contributors[contributor] = [len(self.unique_contributors) + 1, [paperId]]
+            else:
+                self.unique_contributors[name][1].append(paperId)
+    
+    def _iterAuthors(self, mode):
+        """
+        Write the rows of the authors collected by L{_iterPapers}.
+        L{total} is the number of authors once done.
+        @type mode: L{str}
+        @param mode: One of L{SQLExportMode<utils.settings.SQLExportMode>}.
+        @rtype: generator of L{str}
+        @return: The output, in chunks of L{CHUNK_SIZE} authors.
+        """
         total = 0
-        try:
-            self.path = self.authorsPath
-            self.openDB('w')
-            for c in self.unique_contributors.keys():
-                self.database.write('''INSERT INTO Author (id, name) VALUES (%d, N'%s');\n''' % (self.unique_contributors[c][0], utils.escapeSQLCharacters(c)))
+        rows = SQLRows('Author', mode)
+        for c in self.unique_contributors.keys():
+            if mode == settings.SQLExportMode.STATEMENTS:
+                self._writeStatement('''INSERT INTO Author (id, name) VALUES (%d, N'%s');\n''' % (self.unique_contributors[c][0], utils.Utils().escapeSQLCharacters(c)))
+            else:
+                self.database.write(rows.write((self.unique_contributors[c][0], c)))
+            total += 1
+            if total % self.CHUNK_SIZE == 0:
+                yield self.database.take()
+        self.database.write(rows.close())
+        self.total = total
+        yield self.database.take()
+    
+    def _iterAssignments(self, mode):
+        """
+        Write the rows of the paper author assignments collected by L{_iterPapers}.
+        L{total} is the number of assignments once done.
+        @type mode: L{str}
+        @param mode: One of L{SQLExportMode<utils.settings.SQLExportMode>}.
+        @rtype: generator of L{str}
+        @return: The output, in chunks of L{CHUNK_SIZE} assignments.
+        """
+        total = 0
+        rows = SQLRows('PaperAuthor', mode)
+        for c in self.unique_contributors.keys():
+            for p in self.unique_contributors[c][1]:
+                if mode == settings.SQLExportMode.STATEMENTS:
+                    self._writeStatement('''INSERT INTO PaperAuthor (paperId,authorId) VALUES (%d, %d);\n''' % (p, self.unique_contributors[c][0]))
+                else:
+                    self.database.write(rows.write((p, self.unique_contributors[c][0])))
                 total += 1
-        except:
-            raise
-        finally:
-            self.closeDB()
-        return total
+                if total % self.CHUNK_SIZE == 0:
+                    yield self.database.take()
+        self.database.write(rows.close())
+        self.total = total
+        yield self.database.take()
+    
+    def _exportEntry(self, entry):
+        """
+        Export to a MySQL database script.
+        @rtype: L{str}
+        @return: The INSERT statement of the paper of the entry.
+        """
+        return entry.toSQL()
+    
+    def _preprocess(self):
+        # create the database tables
+        self._writeStatement(self.TABLES)
+
+
+class MySQLExporter(MySQLScript, Exporter):
+    """
+    Export a list of L{Entries<app.entry.Entry>} to a MySQL database script.
+    The rows are written as set by L{Preferences.sqlExportMode<utils.settings.Preferences.sqlExportMode>}.
+    """
+    def __init__(self, path, entries):
+        """
+        @type path: L{str}
+        @param path: The path to a file.
+        @type entries: list of L{app.entry.Entry}
+        @param entries: The list of entries to export.
+        """
+        super(MySQLExporter, self).__init__(path, entries)
+        self.mode = Preferences().sqlExportMode
+        """
+        The way the rows are written, one of L{SQLExportMode<utils.settings.SQLExportMode>}.
+        """
+        self.dataPaths = [os.path.splitext(path)[0] + suffix + '.tsv' for suffix in ('_papers', '_authors', '_assignments')]
+        """
+        The files of the values of the papers, authors and assignments in the L{SQLExportMode.LOAD_DATA<utils.settings.SQLExportMode.LOAD_DATA>} mode.
+        """
+    
+    def exportPapers(self):
+        return self.__exportFile(self.papersPath, self._iterPapers(self.mode))
+    
+    def exportAuthors(self):
+        return self.__exportFile(self.authorsPath, self._iterAuthors(self.mode))
     
     def exportAssignments(self):
-        total = 0
+        return self.__exportFile(self.assignmentsPath, self._iterAssignments(self.mode))
+    
+    def __exportFile(self, path, chunks):
+        """
+        Write the chunks of one of the scripts to its file.
+        @return: The number of statements written.
+        """
+        self.path = path
+        self.openDB('w')
+        database = self.database
         try:
-            self.path = self.assignmentsPath
-            self.openDB('w')
-            for c in self.unique_contributors.keys():
-                for p in self.unique_contributors[c][1]:
-                    self.database.write('''INSERT INTO PaperAuthor (paperId,authorId) VALUES (%d, %d);\n''' % (p, self.unique_contributors[c][0]))
-                    total += 1
-        except:
-            raise
+            self.database = ExportBuffer()
+            database.writelines(chunks)
         finally:
+            self.database = database
             self.closeDB()
-        return total
+        return self.total
+    
+    def iterExport(self):
+        """
+        The export process, producing the three scripts one after the other chunk by chunk instead of writing them to their files.
+        There are no data files to load, so the rows are written in INSERT statements of several rows in the L{SQLExportMode.LOAD_DATA<utils.settings.SQLExportMode.LOAD_DATA>} mode.
+        @see: L{export}.
+        @rtype: generator of L{str}
+        @return: The output, in chunks of L{CHUNK_SIZE} statements.
+        @raise Exception: If an error occurred during the export process.
+        """
+        mode = settings.SQLExportMode.BATCH if self.mode == settings.SQLExportMode.LOAD_DATA else self.mode
+        database = self.database
+        try:
+            self.database = ExportBuffer()
+            for chunks in (self._iterPapers(mode), self._iterAuthors(mode), self._iterAssignments(mode)):
+                for chunk in chunks:
+                    yield chunk
+        finally:
+            self.database = database
+    
+    def __iterLoadScript(self):
+        self._preprocess()
+        for table, dataPath in zip(('Paper', 'Author', 'PaperAuthor'), self.dataPaths):
+            self.database.write(SQLRows(table, self.mode).getLoadStatement(dataPath))
+        yield self.database.take()
     
     def export(self):
         """
@@ -278,63 +671,159 @@ class MySQLExporter(Exporter):
             * one for the database tables and the INSERT statements of the papers,
             * a second one for the authors,
             * and a last one for the paper author assignments.
+        
+        In the L{SQLExportMode.LOAD_DATA<utils.settings.SQLExportMode.LOAD_DATA>} mode, it outputs instead
+        the tab-separated values of the papers, authors and assignments in L{dataPaths},
+        and a script creating the database tables and loading these files, to run from their directory.
             
         @rtype: L{int}
         @return: The total number of entries successfully exported.
         @raise Exception: If an error occurred during the export process.
         """
-        papers = self.exportPapers()
-        authors = self.exportAuthors()
-        assignments = self.exportAssignments()
+        if self.mode == settings.SQLExportMode.LOAD_DATA:
+            papersPath, authorsPath, assignmentsPath = self.dataPaths
+        else:
+            papersPath, authorsPath, assignmentsPath = self.papersPath, self.authorsPath, self.assignmentsPath
+        papers = self.__exportFile(papersPath, self._iterPapers(self.mode))
+        authors = self.__exportFile(authorsPath, self._iterAuthors(self.mode))
+        assignments = self.__exportFile(assignmentsPath, self._iterAssignments(self.mode))
+        if self.mode == settings.SQLExportMode.LOAD_DATA:
+            self.__exportFile(self.papersPath, self.__iterLoadScript())
         if papers > 0 and authors > 0 and assignments > 0:
             return papers
         else:
             return 0
     
-    def _exportEntry(self, entry):
+
+class SQLiteExporter(Exporter):
+    """
+    Export a list of L{Entries<app.entry.Entry>} to an SQLite database, with the same tables as the L{MySQLExporter}.
+    The papers can also be searched by title and abstract in the C{PaperSearch} full-text table, if SQLite supports FTS5.
+    """
+    def __init__(self, path, entries):
         """
-        Export to a MySQL database script.
+        @type path: L{str}
+        @param path: The path to a file.
+        @type entries: list of L{app.entry.Entry}
+        @param entries: The list of entries to export.
+        """
+        super(SQLiteExporter, self).__init__(path, entries)
+        self.authors = {}
+        """
+        The id of each author, by lowercase name.
+        """
+        self.assignments = []
+        """
+        The ids of the papers and authors assigned.
+        """
+    
+    def openDB(self, mode):
+        """
+        Create the database, replacing the file.
+        @type mode: L{str}
+        @param mode: Ignored.
+        """
+        try:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.database = sqlite3.connect(self.path, isolation_level=None)
+        except:
+            raise Exception('Cannot open the requested file.')
+    
+    def export(self):
+        """
+        The export process. All the rows are inserted in one transaction, before the indexes are created.
         @rtype: L{int}
         @return: The total number of entries successfully exported.
         @raise Exception: If an error occurred during the export process.
         """
-        return entry.toSQL()
+        self.total = 0
+        self.openDB('w')
+        try:
+            self.database.execute('BEGIN')
+            self._preprocess()
+            self.database.executemany('INSERT INTO Paper (id, bibtexKey, title, doi, bibtex, preview, abstract) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                      self.__iterPapers())
+            self.database.executemany('INSERT INTO Author (id, name) VALUES (?, ?)',
+                                      ((authorId, name) for name, authorId in self.authors.values()))
+            self.database.executemany('INSERT INTO PaperAuthor (paperId, authorId) VALUES (?, ?)', self.assignments)
+            self._postprocess()
+            self.database.execute('COMMIT')
+        except:
+            if self.database.in_transaction:
+                self.database.execute('ROLLBACK')
+            raise
+        finally:
+            self.closeDB()
+        return self.total
+    
+    def __iterPapers(self):
+        """
+        Get the rows of the papers, collecting their authors on the way.
+        """
+        paperId = 0
+        for entry in self.entries:
+            paperId += 1
+            values = entry.toSQLValues()
+            if values is None:
+                continue
+            self.total += 1
+            authorIds = []
+            for contributor in entry.getContributors():
+                contributor = str(contributor)
+                author = self.authors.get(contributor.lower())
+                if author is None:
+                    author = self.authors[contributor.lower()] = (contributor, len(self.authors) + 1)
+                if author[1] not in authorIds:
+                    authorIds.append(author[1])
+            self.assignments.extend((paperId, authorId) for authorId in authorIds)
+            yield (paperId,) + values + (entry.getField(FieldName.Abstract).getValue(),)
+    
+    def __executeScript(self, script):
+        """
+        Execute the statements of a script in the current transaction, unlike C{executescript}.
+        """
+        for statement in script.split(';'):
+            if statement.strip():
+                self.database.execute(statement)
     
     def _preprocess(self):
         # create the database tables
-        self.database.write('''
--- Table for Papers
-DROP TABLE IF EXISTS Paper;
-CREATE TABLE IF NOT EXISTS Paper (
-    id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
-    bibtexKey VARCHAR(100) NOT NULL UNIQUE KEY,
-    title VARCHAR(200) DEFAULT NULL,
-    doi VARCHAR(200) DEFAULT NULL,
-    bibtex longtext NOT NULL,
-    preview longtext
-) ENGINE=InnoDB DEFAULT CHARSET=utf8;
-
--- Table for Authors
-DROP TABLE IF EXISTS Author;
-CREATE TABLE IF NOT EXISTS Author (
-    id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(200) NOT NULL UNIQUE KEY
-) ENGINE=InnoDB DEFAULT CHARSET=utf8;
-
--- Table for paper author assignments
-DROP TABLE IF EXISTS PaperAuthor;
-CREATE TABLE IF NOT EXISTS PaperAuthor (
-    paperId INT(11) NOT NULL,
-    authorId INT(11) NOT NULL,
-    PRIMARY KEY (paperId, authorId),
-    KEY FK_Paper (paperId),
-    KEY FK_Author (authorId)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8;
-ALTER TABLE PaperAuthor
-    ADD CONSTRAINT FK_Author FOREIGN KEY (authorId) REFERENCES Author (id),
-    ADD CONSTRAINT FK_Paper FOREIGN KEY (paperId) REFERENCES Paper (id);
+        self.__executeScript('''
+CREATE TABLE Paper (
+    id INTEGER PRIMARY KEY,
+    bibtexKey TEXT NOT NULL,
+    title TEXT,
+    doi TEXT,
+    bibtex TEXT NOT NULL,
+    preview TEXT,
+    abstract TEXT
+);
+CREATE TABLE Author (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE PaperAuthor (
+    paperId INTEGER NOT NULL REFERENCES Paper (id),
+    authorId INTEGER NOT NULL REFERENCES Author (id)
+);
+''')
+    
+    def _postprocess(self):
+        # index the rows once they are all inserted
+        self.__executeScript('''
+CREATE INDEX PaperKey ON Paper (bibtexKey);
+CREATE INDEX AuthorName ON Author (name);
+CREATE UNIQUE INDEX PaperAuthorPaper ON PaperAuthor (paperId, authorId);
+CREATE INDEX PaperAuthorAuthor ON PaperAuthor (authorId);
+''')
+        try:
+            self.database.execute("CREATE VIRTUAL TABLE PaperSearch USING fts5(title, abstract, content='Paper', content_rowid='id')")
+        except sqlite3.OperationalError:
+            # SQLite was built without FTS5
+            return
+        self.database.execute("INSERT INTO PaperSearch (PaperSearch) VALUES ('rebuild')")
 
-''')   
 
 class StringExporter(Exporter):
     """
@@ -347,9 +836,7 @@ class StringExporter(Exporter):
         @type entries: list of L{app.entry.Entry}
         @param entries: The list of entries to export.
         """
-        super(Exporter, self).__init__(path)
-        self.database = ""
-        self.entries = entries 
+        super(StringExporter, self).__init__(path, entries)
 
     def openDB(self, mode):
         """
@@ -365,30 +852,14 @@ class StringExporter(Exporter):
         """
         pass
 
-    def write(self, output):
-        self.database+=output + '\n'
-
     def export(self):
         """
         The export process.
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
+        @rtype: L{str}
+        @return: The output.
         @raise Exception: If an error occurred during the export process.
         """
-        total = 0
-        try:
-            self.openDB('w')
-            self._preprocess()
-            for entry in self.entries:
-                output = self._exportEntry(entry)
-                self.write(output)
-                total += 1
-            self._postprocess()
-        except:
-            raise
-        finally:
-            self.closeDB()
-        return self.database
+        return ''.join(self.iterExport())
 
         
 class BibTeXStringExporter(StringExporter):
@@ -453,6 +924,12 @@ class HTMLStringExporter(StringExporter):
         """
         super(HTMLStringExporter, self).__init__(path, entries)
     
+    def _iterOutputs(self):
+        processes = Preferences().exportProcesses
+        if processes > 1:
+            return self._iterOutputsInParallel(processes, exportHTMLEntries)
+        return super(HTMLStringExporter, self)._iterOutputs()
+    
     def _exportEntry(self, entry):
         """
         Export to HTML following the default style.
@@ -477,9 +954,11 @@ class HTMLStringExporter(StringExporter):
         self.write('</ol></body></html>')
     
     
-class MySQLStringExporter(StringExporter):
+class MySQLStringExporter(MySQLScript, StringExporter):
     """
     Export a list of L{Entries<app.entry.Entry>} to a MySQL database script as String.
+    The rows are written as set by L{Preferences.sqlExportMode<utils.settings.Preferences.sqlExportMode>},
+    in INSERT statements of several rows in the L{SQLExportMode.LOAD_DATA<utils.settings.SQLExportMode.LOAD_DATA>} mode since there are no data files to load.
     """
     def __init__(self, path, entries):
         """
@@ -489,139 +968,101 @@ class MySQLStringExporter(StringExporter):
         @param entries: The list of entries to export.
         """
         super(MySQLStringExporter, self).__init__(path, entries)
-        ext = os.path.splitext(path)[1]
-        self.papersPath = path
-        self.authorsPath = os.path.join(os.path.dirname(path), os.path.basename(path)[:-len(ext)] + '_authors' + ext)
-        self.assignmentsPath = os.path.join(os.path.dirname(path), os.path.basename(path)[:-len(ext)] + '_assignments' + ext)
-        self.unique_contributors = {}
+        self.counts = []
+        """
+        The number of papers, authors and assignments exported.
+        """
+        mode = Preferences().sqlExportMode
+        self.mode = settings.SQLExportMode.BATCH if mode == settings.SQLExportMode.LOAD_DATA else mode
+        """
+        The way the rows are written, one of L{SQLExportMode<utils.settings.SQLExportMode>}.
+        """
         
-    def exportPapers(self):
-        papers = 0
-        unique_authors = 0
-        try:
-            self.path = self.papersPath
-            self.openDB('w')
-            self._preprocess()
-            for entry in self.entries:
-                output = self._exportEntry(entry)
-                self.write(output + '\n')
-                papers += 1
-                for contributor in entry.getContributors():
-                    contributor = str(contributor)
-                    for uc in self.unique_contributors.keys():
-                        if contributor.lower() == uc.lower():
-                            self.unique_contributors[uc][1].append(papers)
-                            break
-                    else:
-                        unique_authors += 1
-                        self.unique_contributors[contributor] = [unique_authors,[papers]]
-            self._postprocess()
-        except:
-            raise
-        finally:
-            self.closeDB()
-        return papers
-    
-    def exportAuthors(self):
-        total = 0
-        try:
-            self.path = self.authorsPath
-            self.openDB('w')
-            for c in self.unique_contributors.keys():
-                self.write('''INSERT INTO Author (id, name) VALUES (%d, N'%s');\n''' % (self.unique_contributors[c][0], utils.escapeSQLCharacters(c)))
-                total += 1
-        except:
-            raise
-        finally:
-            self.closeDB()
-        return total
+    def iterExport(self):
+        """
+        The export process, producing the database tables and the INSERT statements of the papers, the authors and the paper author assignments
+        one after the other chunk by chunk.
+        @rtype: generator of L{str}
+        @return: The output, in chunks of L{CHUNK_SIZE} statements.
+        @raise Exception: If an error occurred during the export process.
+        """
+        self.database = ExportBuffer()
+        self.counts = []
+        for chunks in (self._iterPapers(self.mode), self._iterAuthors(self.mode), self._iterAssignments(self.mode)):
+            for chunk in chunks:
+                yield chunk
+            self.counts.append(self.total)
+        self.total = self.counts[0]
     
-    def exportAssignments(self):
-        total = 0
-        try:
-            self.path = self.assignmentsPath
-            self.openDB('w')
-            for c in self.unique_contributors.keys():
-                for p in self.unique_contributors[c][1]:
-                    self.write('''INSERT INTO PaperAuthor (paperId,authorId) VALUES (%d, %d);\n''' % (p, self.unique_contributors[c][0]))
-                    total += 1
-        except:
-            raise
-        finally:
-            self.closeDB()
-        return total
+    def _writeStatement(self, statement):
+        self.write(statement)
     
     def export(self):
         """
-        The export process. It outputs 3 files:
-            * one for the database tables and the INSERT statements of the papers,
-            * a second one for the authors,
-            * and a last one for the paper author assignments.
+        The export process. It outputs in a single string:
+            * the database tables and the INSERT statements of the papers,
+            * the authors,
+            * and the paper author assignments.
             
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
+        @rtype: L{str}
+        @return: The output, or 0 if there are no papers, authors or assignments.
         @raise Exception: If an error occurred during the export process.
         """
-        papers = self.exportPapers()
-        authors = self.exportAuthors()
-        assignments = self.exportAssignments()
-        if papers > 0 and authors > 0 and assignments > 0:
-            return self.database
+        output = ''.join(self.iterExport())
+        if all(count > 0 for count in self.counts):
+            return output
         else:
             return 0
     
-    def _exportEntry(self, entry):
-        """
-        Export to a MySQL database script.
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
-        @raise Exception: If an error occurred during the export process.
-        """
-        return entry.toSQL()
-    
-    def _preprocess(self):
-        # create the database tables
-        self.write('''
--- Table for Papers
-DROP TABLE IF EXISTS Paper;
-CREATE TABLE IF NOT EXISTS Paper (
-    id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
-    bibtexKey VARCHAR(100) NOT NULL UNIQUE KEY,
-    title VARCHAR(200) DEFAULT NULL,
-    doi VARCHAR(200) DEFAULT NULL,
-    bibtex longtext NOT NULL,
-    preview longtext
-) ENGINE=InnoDB DEFAULT CHARSET=utf8;
 
--- Table for Authors
-DROP TABLE IF EXISTS Author;
-CREATE TABLE IF NOT EXISTS Author (
-    id INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY,
-    name VARCHAR(200) NOT NULL UNIQUE KEY
-) ENGINE=InnoDB DEFAULT CHARSET=utf8;
-
--- Table for paper author assignments
-DROP TABLE IF EXISTS PaperAuthor;
-CREATE TABLE IF NOT EXISTS PaperAuthor (
-    paperId INT(11) NOT NULL,
-    authorId INT(11) NOT NULL,
-    PRIMARY KEY (paperId, authorId),
-    KEY FK_Paper (paperId),
-    KEY FK_Author (authorId)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8;
-ALTER TABLE PaperAuthor
-    ADD CONSTRAINT FK_Author FOREIGN KEY (authorId) REFERENCES Author (id),
-    ADD CONSTRAINT FK_Paper FOREIGN KEY (paperId) REFERENCES Paper (id);
+def exportHTMLEntries(entries, preferences):
+    """
+    Export a chunk of entries to HTML in a worker process of the L{HTMLExporter}.
+    @type entries: L{list} of L{tuple}
+    @param entries: The entries in compact form.
+    @type preferences: L{dict}
+    @param preferences: The preferences of the exporting process.
+    @rtype: L{list} of L{str}
+    @return: The HTML of each entry.
+    """
+    Preferences().__dict__.update(preferences)
+    exporter = HTMLExporter('', [])
+    return [exporter._exportEntry(EntryType.fromCompact(entry)) for entry in entries]
 
-''')   
 
+def parseEntries(entries, preferences):
+    """
+    Parse a chunk of entries in a worker process of the L{Importer}.
+    Parsing stops at the first entry that raises an exception.
+    @type entries: L{list} of L{str}
+    @param entries: The BibTeX strings of the entries.
+    @type preferences: L{dict}
+    @param preferences: The preferences of the importing process.
+    @rtype: L{list} of L{tuple}
+    @return: For each entry, its compact form, whether it is valid, and the exception raised while parsing it, if any.
+    """
+    Preferences().__dict__.update(preferences)
+    results = []
+    for bibtex in entries:
+        try:
+            entry, valid = ReferenceManager.parseEntry(bibtex)
+            results.append((entry.toCompact(), valid, None))
+        except Exception as ex:
+            results.append((None, False, ex))
+            break
+    return results
 
-    
 
 class Importer(ImpEx):
     """
     Import entries L{Entries<app.entry.Entry>} from a specified format.
+    The entries are parsed in parallel when L{Preferences.importProcesses<utils.settings.Preferences.importProcesses>} is more than 1.
+    """
+    CHUNK_SIZE = 256
     """
+    The number of entries sent at once to a worker process.
+    """
+    
     def __init__(self, path, manager):
         """
         @type path: L{str}
@@ -631,25 +1072,117 @@ class Importer(ImpEx):
         """
         super(Importer, self).__init__(path)
         self.manager = manager
+        self.ignoreIfEmpty = True
+        self.lineNumber = 0
         
     def importFile(self):
         """
         Import from a specific file format.
-        """        
-        pass
-        
-    def add(self, entry):
+        The entries are added in the order of the file, whether they are parsed serially or in parallel.
+        @rtype: L{int}
+        @return: The total number of entries successfully imported.
+        @raise Exception: If an error occurred during the import process.
         """
-        Adds an entry if it is not empty.
-        """        
-        result = self.manager.add(entry, ignoreIfEmpty=True)
-        if result is None:
-            result = 0
-        return int(result > 0)
-    
+        self.openDB('r')
+        total = 0
+        try:
+            processes = Preferences().importProcesses
+            if processes > 1:
+                total = self.__importParallel(processes)
+            else:
+                total = len(self.manager.addMany(self.iterEntries(), ignoreIfEmpty=self.ignoreIfEmpty))
+        except Exception as ex:
+            raise Exception('%s (while reading line %d of the file)' % (str(ex), self.lineNumber)) from ex
+        finally:
+            self.closeDB()
+        return total
+
+    def iterImport(self):
+        """
+        Import from a specific file format chunk by chunk, adding the entries of each chunk before reading the next one,
+        so that they can be used while the rest of the file is imported.
+        The entries are parsed serially.
+        @rtype: generator of L{list} of L{int}
+        @return: The ids of the entries successfully imported from each chunk, in the order of the file.
+        @raise Exception: If an error occurred during the import process.
+        """
+        self.openDB('r')
+        try:
+            entries = self.iterEntries()
+            chunk = list(islice(entries, self.CHUNK_SIZE))
+            while chunk:
+                yield self.manager.addMany(chunk, ignoreIfEmpty=self.ignoreIfEmpty)
+                chunk = list(islice(entries, self.CHUNK_SIZE))
+        except Exception as ex:
+            raise Exception('%s (while reading line %d of the file)' % (str(ex), self.lineNumber)) from ex
+        finally:
+            self.closeDB()
+
+    def iterEntries(self):
+        """
+        Iterate over the entries of the file, keeping C{lineNumber} up to date.
+        @rtype: generator of L{str}
+        @return: The BibTeX string of each entry.
+        """
+        return iter(())
+        
     def remove_empty_entry(self):
         pass
     
+    def __importParallel(self, processes):
+        """
+        Parse the entries in chunks in a pool of processes and add them in the order of the file.
+        At most two chunks per process are read ahead, so the memory used does not depend on the size of the file.
+        """
+        total = 0
+        preferences = dict(vars(Preferences()))
+        entries = self.iterEntries()
+        pending = deque()
+        finished = False
+        readError = None
+        with ProcessPoolExecutor(processes) as pool:
+            try:
+                while not finished or pending:
+                    chunk, lines = [], []
+                    while not finished and len(chunk) < self.CHUNK_SIZE:
+                        try:
+                            entry = next(entries)
+                        except StopIteration:
+                            finished = True
+                        except Exception as ex:
+                            finished = True
+                            readError = (ex, self.lineNumber)
+                        else:
+                            chunk.append(entry)
+                            lines.append(self.lineNumber)
+                    if chunk:
+                        pending.append((pool.submit(parseEntries, chunk, preferences), lines))
+                    while pending and (finished or len(pending) > 2 * processes):
+                        future, lines = pending.popleft()
+                        total += self.__addResults(future.result(), lines)
+            except:
+                for future, _ in pending:
+                    future.cancel()
+                raise
+        if readError:
+            # Entries read before the error are added, as in the serial import
+            self.lineNumber = readError[1]
+            raise readError[0]
+        return total
+    
+    def __addResults(self, results, lines):
+        return len(self.manager.addManyParsed(self.__iterResults(results, lines), ignoreIfEmpty=self.ignoreIfEmpty))
+    
+    def __iterResults(self, results, lines):
+        """
+        Iterate over the entries parsed by a worker process, keeping C{lineNumber} up to date.
+        """
+        for (compact, valid, error), lineNumber in zip(results, lines):
+            self.lineNumber = lineNumber
+            if error:
+                raise error
+            yield EntryType.fromCompact(compact), valid
+    
     
 class BibTeXImporter(Importer):
     """
@@ -664,36 +1197,16 @@ class BibTeXImporter(Importer):
         """
         super(BibTeXImporter, self).__init__(path, manager)
     
-    def importFile(self):
+    def iterEntries(self):
         """
-        Import from a BibTeX file.
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
-        @raise Exception: If an error occurred during the export process.
+        Iterate over the entries of a BibTeX file.
+        @rtype: generator of L{str}
+        @return: The BibTeX string of each entry.
         """
-        self.openDB('r')
-        total = 0
-        line_number = 1
-        try:
-            line = self.database.readline()
-            entry = ''
-            while line:
-                if line.strip().startswith('@'):
-                    if entry:
-                        total += self.add(entry)
-                    entry = line
-                elif not line.strip().startswith('%'):
-                    entry += line
-                line = self.database.readline()
-                line_number += 1
-            if entry:
-                total += self.add(entry)
-        except Exception as ex:
-            raise Exception('%s (while reading line %d of the file)' % (str(ex), line_number)) from ex
-        finally:
-            self.closeDB()
-        
-        return total
+        lexer = BibTeXLexer(self.database)
+        for entry in lexer:
+            self.lineNumber = lexer.getLineNumber()
+            yield entry
 
 class EndNoteImporter(Importer):
     """
@@ -707,45 +1220,28 @@ class EndNoteImporter(Importer):
         @param manager: The reference manager that will hold the entry list.
         """
         super(EndNoteImporter, self).__init__(path, manager)
+        self.ignoreIfEmpty = False
     
-    def importFile(self):
-        """
-        Import from a BibTeX file exported from EndNote using the BiBler exporter.
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
-        @raise Exception: If an error occurred during the export process.
-        """
-        
-        self.openDB('r')
-        total = 0
-        line_number = 1
-        try:
+    def iterEntries(self):
+        """
+        Iterate over the entries of a BibTeX file exported from EndNote using the BiBler exporter.
+        @rtype: generator of L{str}
+        @return: The BibTeX string of each entry.
+        """
+        self.lineNumber = 1
+        line = self.database.readline()
+        entry = []
+        while line:
+            if line.startswith('@'):
+                if entry:
+                    yield self.__cleanEndNoteEntry(''.join(entry))
+                entry = [line]
+            else:
+                entry.append(line)
             line = self.database.readline()
-            entry = ''
-            while line:
-                if line.startswith('@'):
-                    if entry:
-                        total += self.add(entry)
-                    entry = line
-                else:
-                    entry += line
-                line = self.database.readline()
-                line_number += 1
-            if entry:
-                total += self.add(entry)
-        except Exception as ex:
-            raise Exception('%s (while reading line %d of the file)' % (str(ex), line_number)) from ex
-        finally:
-            self.closeDB()
-        return total
-        
-    def add(self, entry):
-        """
-        Shorthand to remove code duplication
-        """
-        entry = self.__cleanEndNoteEntry(entry)
-        result = self.manager.add(entry)
-        return int(result > 0)
+            self.lineNumber += 1
+        if entry:
+            yield self.__cleanEndNoteEntry(''.join(entry))
     
     def __cleanEndNoteEntry(self, entry):
         """
@@ -802,48 +1298,38 @@ class CSVImporter(Importer):
         """
         super(CSVImporter, self).__init__(path, manager)
     
-    def importFile(self):
+    def iterEntries(self):
         """
-        Import from a CSV (tabs) file.
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
-        @raise Exception: If an error occurred during the export process.
+        Iterate over the rows of a CSV (tabs) file.
+        @rtype: generator of L{str}
+        @return: The BibTeX string of the entry of each row.
         """
-        self.openDB('r')
-        total = 0
         allFields = FieldName.getAllFieldNames()
-        
-        try:
-            line = self.database.readline() # skip header line
+        line = self.database.readline() # skip header line
+        line = self.database.readline()
+        self.lineNumber = 2
+        while line:
+            line = line.split('\t')
+            if len(line) != len(allFields) + 1:
+                raise Exception('CSV file on line %d has incorrect fields.' % self.lineNumber)
+            entry = {'entrytype': line[0]}
+            for i in range(len(allFields)):
+                value = line[i + 1]
+                if value.startswith('"'):
+                    value = value[1:]
+                if value.endswith('"'):
+                    value = value[:-1]
+                elif value.endswith('"\n'):
+                    value = value[:-2]
+                entry[allFields[i]] = value
+            # Convert to BibTeX
+            bibtex = '@%s{' % entry['entrytype'] # key will be auto generated
+            for field in entry.keys():
+                bibtex += ',\n  %s = {%s}' % (field, entry[field])
+            bibtex += '\n}'
+            yield bibtex
             line = self.database.readline()
-            line_number = 2
-            while line:
-                line = line.split('\t')
-                if len(line) != len(allFields) + 1:
-                    raise Exception('CSV file on line %d has incorrect fields.' % total)
-                entry = {'entrytype': line[0]}
-                for i in range(len(allFields)):
-                    value = line[i + 1]
-                    if value.startswith('"'):
-                        value = value[1:]
-                    if value.endswith('"'):
-                        value = value[:-1]
-                    elif value.endswith('"\n'):
-                        value = value[:-2]
-                    entry[allFields[i]] = value
-                # Convert to BibTeX
-                bibtex = '@%s{' % entry['entrytype'] # key will be auto generated
-                for field in entry.keys():
-                    bibtex += ',\n  %s = {%s}' % (field, entry[field])
-                bibtex += '\n}'
-                total += self.add(bibtex)
-                line = self.database.readline()
-                line_number += 1
-        except Exception as ex:
-            raise Exception('%s (while reading line %d of the file)' % (str(ex), line_number)) from ex
-        finally:
-            self.closeDB()
-        return total
+            self.lineNumber += 1
 
 
 class BibTeXStringImporter(BibTeXImporter):
@@ -860,30 +1346,13 @@ class BibTeXStringImporter(BibTeXImporter):
         super(BibTeXImporter, self).__init__(None, manager)
         self.data = data
     
-    def importFile(self):
+    def openDB(self, mode):
         """
-        Import from a string of multi.
-        @rtype: L{int}
-        @return: The total number of entries successfully exported.
-        @raise Exception: If an error occurred during the export process.
+        Read the string as a stream.
+        @type mode: L{str}
+        @param mode: Ignored.
         """
-        total = 0
-        try:
-            self.data = self.data.split('\n')
-            entry = ''
-            for line in self.data:
-                if line.startswith('@'):
-                    if entry:
-                        total += self.add(entry)
-                    entry = line
-                else:
-                    entry += line
-            if entry:
-                total += self.add(entry)
-        except:
-            raise
-        
-        return total
+        self.database = StringReader(self.data)
 
 class EndNoteStringImporter(EndNoteImporter):
     """
@@ -898,28 +1367,105 @@ class EndNoteStringImporter(EndNoteImporter):
         """
         super(EndNoteImporter, self).__init__(None, manager)
         self.data = data
+        self.ignoreIfEmpty = False
     
-    def importFile(self):
+    def openDB(self, mode):
         """
-        Import from a BibTeX file exported from EndNote using the BiBler exporter.
+        Read the string as a stream.
+        @type mode: L{str}
+        @param mode: Ignored.
+        """
+        self.database = StringReader(self.data)
+
+
+class Snapshot(ImpEx):
+    """
+    A binary snapshot of the entries opened from a file, stored next to it with the L{EXTENSION} extension.
+    It holds the entries in compact form with their keys, so that reopening the file does not parse it again.
+    The snapshot is only used as long as the file, its format and the preferences affecting the import are unchanged.
+    """
+    EXTENSION = '.biblercache'
+    MAGIC = b'BIBLER'
+    VERSION = 2
+    """
+    The version of the snapshot format, to increase whenever the compact form of the entries changes.
+    """
+    PREFERENCES = ('parserEngine', 'allowNonStandardFields', 'overrideKeyGeneration', 'allowInvalidEntries')
+    """
+    The names of the L{preferences<utils.settings.Preferences>} affecting how the entries are parsed, validated and keyed.
+    """
+    
+    def __init__(self, path, importFormat):
+        """
+        @type path: L{str}
+        @param path: The path to the file the entries are opened from.
+        @type importFormat: L{str}
+        @param importFormat: The format of the file.
+        """
+        super(Snapshot, self).__init__(path + Snapshot.EXTENSION)
+        self.sourcePath = path
+        self.importFormat = importFormat
+        self.fingerprint = None
+    
+    def getFingerprint(self):
+        """
+        Get the hash of the content of the file and of the settings its entries depend on.
+        @rtype: L{str}
+        @return: The hexadecimal digest.
+        """
+        if self.fingerprint is None:
+            digest = hashlib.sha256()
+            preferences = Preferences()
+            for setting in [Snapshot.VERSION, self.importFormat] + [getattr(preferences, name) for name in Snapshot.PREFERENCES]:
+                digest.update(('%s\n' % setting).encode('utf8'))
+            with open(self.sourcePath, 'rb') as source:
+                for chunk in iter(lambda: source.read(1 << 20), b''):
+                    digest.update(chunk)
+            self.fingerprint = digest.hexdigest()
+        return self.fingerprint
+    
+    def load(self, manager):
+        """
+        Add the entries of the snapshot to the manager if it matches the file.
+        @type manager: L{app.manager.ReferenceManager}
+        @param manager: The reference manager that will hold the entry list.
         @rtype: L{int}
-        @return: The total number of entries successfully exported.
-        @raise Exception: If an error occurred during the export process.
+        @return: The total number of entries loaded, L{None} if there is no valid snapshot.
         """
-        total = 0
+        # Creating many objects at once triggers the garbage collector needlessly
+        gcEnabled = gc.isenabled()
+        gc.disable()
         try:
-            self.data = self.data.split('\n')
-            entry = ''
-            for line in self.data:
-                if line.startswith('@'):
-                    if entry:
-                        total += self.add(entry)
-                    entry = line
-                else:
-                    entry += line
-            if entry:
-                total += self.add(entry)
-        except:
-            raise
-        
-        return total
\ No newline at end of file
+            with open(self.path, 'rb') as snapshot:
+                data = snapshot.read()
+            if not data.startswith(Snapshot.MAGIC):
+                return None
+            version, fingerprint, entries = marshal.loads(memoryview(data)[len(Snapshot.MAGIC):])
+            if version != Snapshot.VERSION or fingerprint != self.getFingerprint():
+                return None
+            entries = [EntryType.fromCompact(compact) for compact in entries]
+        except Exception:
+            return None
+        finally:
+            if gcEnabled:
+                gc.enable()
+        for entry in entries:
+            manager.append(entry)
+        return len(entries)
+    
+    def save(self, entries):
+        """
+        Write the snapshot of the entries. The snapshot is not written if the file cannot be written.
+        @type entries: list of L{app.entry.Entry}
+        @param entries: The entries opened from the file.
+        @rtype: L{bool}
+        @return: L{True} if the snapshot was written, L{False} otherwise.
+        """
+        try:
+            data = (Snapshot.VERSION, self.getFingerprint(), tuple(entry.toCompact() for entry in entries))
+            with open(self.path, 'wb') as snapshot:
+                snapshot.write(Snapshot.MAGIC)
+                marshal.dump(data, snapshot)
+            return True
+        except Exception:
+            return False
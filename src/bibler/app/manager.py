@@ -32,7 +32,8 @@ from app.bibtex_parser import BibTeXParser
 from app.field_name import FieldName
 from app.field import Paper
 from app.entry_type import EntryType
-from gui.app_interface import EntryListColumn
+from app.render_cache import RenderCache
+from app.storage import Storage
 from utils import settings
 import re
     
@@ -41,32 +42,76 @@ import re
 class ReferenceManager(object):
     """
     Manage the operations on entries.
-    The reference manager holds the list of all the L{entries<app.entry.Entry>}.
+    The reference manager holds the list of all the L{entries<app.entry.Entry>} in a L{storage<app.storage.Storage>}.
     """
-    def __init__(self):
+    CHUNK_SIZE = 256
+    """
+    The number of entries added at once to the storage by L{addManyParsed}.
+    """
+    
+    def __init__(self, storage=None):
+        """
+        (Constructor)
+        @type storage: L{app.storage.Storage}
+        @param storage: The storage of the entries. The one selected in the preferences is used if not specified.
+        """
         self.searchResult = list()
-        self.entryList = list()
+        self.storage = storage if storage is not None else Storage.create()
+        self.renderCache = RenderCache()
+        self.releasedKeys = dict()
+        """
+        The number of L{released<release>} entries using each key, which the keys generated afterwards must still avoid.
+        """
     
     def insertAt(self, index, entry):
-        return self.entryList.insert(index, entry)
+        self.storage.insert(index, entry)
     
     def getIndex(self, entry):
-        return self.entryList.index(entry)
+        """
+        Get the position of an entry in the list of all entries.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry.
+        @rtype: L{int}
+        @return: The position of the entry.
+        @raise ValueError: If the entry is not in the list.
+        """
+        position = self.storage.getPosition(entry.getId())
+        if position is None:
+            raise ValueError('entry is not in the list.')
+        return position
     
-    def __parseEntry(self, entryBibTeX):
+    @staticmethod
+    def parseEntry(entryBibTeX):
         """
-        Set DOI if not set and set URL if not set.
+        Parse an entry, set its paper from its DOI if not set, and validate it.
+        This does not depend on the entries already managed, so it can run in another process.
+        @type entryBibTeX: L{str}
+        @param entryBibTeX: The BibTeX string of the entry.
+        @rtype: L{tuple}
+        @return: The entry and whether it is valid.
         """
         parser = BibTeXParser(entryBibTeX)
         entry = parser.parse()
-        if settings.Preferences().overrideKeyGeneration or not entry.getKey():
-            self.__setKey(entry)        
         paper = entry.additionalFields[FieldName.Paper]
         doi = entry.additionalFields[FieldName.DOI]
         if not doi.isEmpty() and paper.isEmpty():
             entry.additionalFields[FieldName.Paper] = Paper(doi=doi)
-        validation = entry.validate()
-        if settings.Preferences().allowInvalidEntries or validation.isValid():
+        return entry, entry.validate().isValid()
+    
+    def __parseEntry(self, entryBibTeX):
+        """
+        Set DOI if not set and set URL if not set.
+        """
+        entry, valid = ReferenceManager.parseEntry(entryBibTeX)
+        return self.__prepareEntry(entry, valid)
+    
+    def __prepareEntry(self, entry, valid):
+        """
+        Generate the key of a parsed entry if needed and decide whether it can be added.
+        """
+        if settings.Preferences().overrideKeyGeneration or not entry.getKey():
+            self.__setKey(entry)
+        if settings.Preferences().allowInvalidEntries or valid:
             return True, entry
         return False, entry
         
@@ -80,22 +125,97 @@ class ReferenceManager(object):
             else:
                 entry = EntryType.createEntry(entryType)
             entry.generateId()
-            self.entryList.append(entry)
+            self.storage.append(entry)
             return entry.getId()
         else:
             try:
                 valid, entry = self.__parseEntry(entryBibTeX)
-                if ignoreIfEmpty and not entry.getEntryType():
-                    # It is an EmptyEntry so ignore if specified
-                    return None
-                if valid:
-                    entry.generateId()
-                    self.entryList.append(entry)
-                    return entry.getId()
-                else:
-                    return None
+                return self.__addEntry(valid, entry, ignoreIfEmpty)
             except Exception as ex:
                 raise ex
+    
+    def addMany(self, entriesBibTeX, ignoreIfEmpty=False):
+        """
+        Add several entries at once, as if they were added one by one with L{add}.
+        @see: L{app.user_interface.BiBlerApp.addEntries}.
+        """
+        return self.addManyParsed((ReferenceManager.parseEntry(entryBibTeX) for entryBibTeX in entriesBibTeX), ignoreIfEmpty)
+    
+    def addManyParsed(self, parsedEntries, ignoreIfEmpty=False):
+        """
+        Add several entries returned by L{parseEntry} at once, as if they were added one by one with L{addParsed}.
+        The keys are made unique among the entries already managed and the ones of the batch,
+        and the entries are stored in chunks of L{CHUNK_SIZE}, so that the memory used does not depend on their number.
+        If parsing an entry fails, the entries before it are still added.
+        @type parsedEntries: iterable of L{tuple}
+        @param parsedEntries: The entries with whether they are valid.
+        @type ignoreIfEmpty: L{bool}
+        @param ignoreIfEmpty: When True, empty entries are not added.
+        @rtype: L{list} of L{int}
+        @return: The ids of the entries added, in order.
+        """
+        preferences = settings.Preferences()
+        overrideKeyGeneration = preferences.overrideKeyGeneration
+        allowInvalidEntries = preferences.allowInvalidEntries
+        batchKeys = dict()
+        entries = []
+        entryIds = []
+        try:
+            for entry, valid in parsedEntries:
+                if overrideKeyGeneration or not entry.getKey():
+                    self.__setKey(entry, batchKeys)
+                if not (allowInvalidEntries or valid) or (ignoreIfEmpty and not entry.getEntryType()):
+                    continue
+                entry.generateId()
+                batchKeys[entry.getKey()] = batchKeys.get(entry.getKey(), 0) + 1
+                entries.append(entry)
+                if len(entries) == self.CHUNK_SIZE:
+                    # Once stored, the keys of the chunk are counted by the storage
+                    self.storage.extend(entries)
+                    entryIds.extend(e.getId() for e in entries)
+                    entries = []
+                    batchKeys.clear()
+        finally:
+            self.storage.extend(entries)
+        entryIds.extend(e.getId() for e in entries)
+        return entryIds
+    
+    def append(self, entry):
+        """
+        Add an entry as is, with a new id but keeping its key.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry.
+        @rtype: L{int}
+        @return: The id of the entry.
+        """
+        entry.generateId()
+        self.storage.append(entry)
+        return entry.getId()
+    
+    def addParsed(self, entry, valid, ignoreIfEmpty=False):
+        """
+        Add an entry returned by L{parseEntry}, possibly in another process.
+        The key and the id are generated exactly as in L{add}.
+        @type entry: L{app.entry.Entry}
+        @param entry: The parsed entry.
+        @type valid: L{bool}
+        @param valid: Whether the entry is valid.
+        @rtype: L{int}
+        @return: The id of the entry, L{None} if it was not added.
+        """
+        valid, entry = self.__prepareEntry(entry, valid)
+        return self.__addEntry(valid, entry, ignoreIfEmpty)
+    
+    def __addEntry(self, valid, entry, ignoreIfEmpty):
+        if ignoreIfEmpty and not entry.getEntryType():
+            # It is an EmptyEntry so ignore if specified
+            return None
+        if valid:
+            entry.generateId()
+            self.storage.append(entry)
+            return entry.getId()
+        else:
+            return None
         
     def update(self, entryId, entryBibTeX):
         """
@@ -107,10 +227,11 @@ class ReferenceManager(object):
         valid, new_entry = self.__parseEntry(entryBibTeX)
         new_entry.setId(entryId)
         if valid:
-            # Overwrite the entry in entryList
-            self.entryList[self.entryList.index(entry)] = new_entry
+            # Overwrite the entry in the storage
+            self.storage.update(new_entry)
+            self.renderCache.invalidate(entryId)
             if settings.Preferences().overrideKeyGeneration:
-                self.__setKey(self.entryList[self.entryList.index(new_entry)])
+                self.__setKey(new_entry)
         else:
             return False
         return True
@@ -125,6 +246,9 @@ class ReferenceManager(object):
         else:
             entry.setField(fieldName, fieldValue)
             entry.toBibTeX()
+            self.storage.update(entry)
+            self.renderCache.invalidate(entryId)
+            self.__refreshSearchResult([entryId])
             return True
         return False
         
@@ -132,21 +256,58 @@ class ReferenceManager(object):
         """
         @see: L{app.user_interface.BiBlerApp.deleteEntry}.
         """
-        entry = self.getEntry(entryId)
-        if entry == None:
+        if not self.storage.remove(entryId):
             return False
-        self.entryList.remove(entry)
         if self.getEntryCount() == 0:
-            EntryIdGenerator().reset()
+            self.__resetIds()
         return True
+    
+    def deleteMany(self, entryIds):
+        """
+        Delete several entries in one operation.
+        @type entryIds: iterable of L{int}
+        @param entryIds: The I{id} of each entry.
+        @rtype: L{int}
+        @return: The number of entries deleted.
+        """
+        total = self.storage.removeMany(entryIds)
+        if self.getEntryCount() == 0:
+            self.__resetIds()
+        return total
+        
+    def release(self, entryIds):
+        """
+        Remove entries that are not needed anymore, such as the ones of an import that were already sent, so that they do not use memory.
+        Unlike L{deleteMany}, their keys stay in use, so that the keys generated for the entries added afterwards remain unique,
+        and their ids are not reused.
+        @type entryIds: iterable of L{int}
+        @param entryIds: The I{id} of each entry.
+        @rtype: L{int}
+        @return: The number of entries removed.
+        """
+        entryIds = list(entryIds)
+        for entryId in entryIds:
+            key = self.storage.getKey(entryId)
+            if key:
+                self.releasedKeys[key] = self.releasedKeys.get(key, 0) + 1
+            self.renderCache.invalidate(entryId)
+        return self.storage.removeMany(entryIds)
         
     def deleteAll(self):
         """
         Delete all entries.
         """
-        self.entryList = []
+        self.storage.clear()
         self.searchResult = []
+        self.releasedKeys = dict()
+        self.__resetIds()
+        
+    def __resetIds(self):
+        """
+        Reuse the ids from the start, so the renderings of the previous entries do not apply anymore.
+        """
         EntryIdGenerator().reset()
+        self.renderCache.clear()
         
     def duplicate(self, entryId):
         """
@@ -164,9 +325,9 @@ class ReferenceManager(object):
         try:
             if settings.Preferences().searchRegex:
                 query = re.compile(query, re.RegexFlag.IGNORECASE)
-                self.searchResult = [e for e in iter(self.entryList) if e.matchesRegex(query)]
+                self.searchResult = self.storage.searchRegex(query)
             else:
-                self.searchResult = [e for e in iter(self.entryList) if e.matchesExact(query)]
+                self.searchResult = self.storage.searchExact(query)
             return len(self.searchResult)
         except Exception as ex:
             return -1
@@ -175,40 +336,56 @@ class ReferenceManager(object):
         """
         @see: L{app.user_interface.BiBlerApp.sort}.
         """
-        
-        def getField(e, field):
-            try:
-                return e.getFieldValue(FieldName.fromEntryListColumn(field)).lower()
-            except:
-                return ''
-        
         try:
-            if field == EntryListColumn.Entrytype:
-                self.entryList.sort(key=lambda e: e.getEntryType().lower(), reverse=reverse)
-                self.searchResult.sort(key=lambda e: e.getEntryType().lower(), reverse=reverse)
-            elif field == EntryListColumn.Id:
-                self.entryList.sort(key=lambda e: e.getId(), reverse=reverse)
-                self.searchResult.sort(key=lambda e: e.getId(), reverse=reverse)
-            elif field == EntryListColumn.Entrykey:
-                self.entryList.sort(key=lambda e: e.getKey().lower(), reverse=reverse)
-                self.searchResult.sort(key=lambda e: e.getKey().lower(), reverse=reverse)
-            else:
-                self.entryList.sort(key=lambda e: getField(e, field).lower(), reverse=reverse)
-                self.searchResult.sort(key=lambda e: getField(e, field).lower(), reverse=reverse)
+            self.storage.sort(field, reverse)
+            self.searchResult.sort(key=Storage.getSortKey(field), reverse=reverse)
             return True
         except:
             return False 
+    
+    def restoreOrder(self, entryOrder, searchResultOrder):
+        """
+        Put back the entries and the search result in a previous order.
+        @type entryOrder: L{list} of L{int}
+        @param entryOrder: The ids of the entries in the order to restore.
+        @type searchResultOrder: L{list} of L{int}
+        @param searchResultOrder: The ids of the entries of the search result in the order to restore.
+        """
+        self.storage.reorder(entryOrder)
+        entries = {e.getId(): e for e in self.searchResult}
+        if len(entries) == len(self.searchResult) == len(searchResultOrder) and all(entryId in entries for entryId in searchResultOrder):
+            # The ids are a permutation of the search result
+            self.searchResult = [entries[entryId] for entryId in searchResultOrder]
+        else:
+            searchResultOrder = {entryId: i for i, entryId in enumerate(searchResultOrder)}
+            self.searchResult.sort(key=lambda e: searchResultOrder.get(e.getId(), len(searchResultOrder)))
         
     def generateAllKeys(self):
         """
         @see: L{app.user_interface.BiBlerApp.generateAllKeys}.
         """
         try:
-            for entry in self.entryList:
+            for entry in self.storage.iterEntries():
                 self.__setKey(entry)
             return True
         except:
             return False
+        finally:
+            self.__refreshSearchResult()
+    
+    def __refreshSearchResult(self, entryIds=None):
+        """
+        Get the entries of the search result again from the storage after they changed,
+        since the storage may have given copies of them.
+        @type entryIds: L{list} of L{int}
+        @param entryIds: The ids of the changed entries. All entries are refreshed if not specified.
+        """
+        if not self.searchResult:
+            return
+        if entryIds is not None:
+            entryIds = set(entryIds)
+        self.searchResult = [self.storage.get(e.getId()) or e if entryIds is None or e.getId() in entryIds else e
+                             for e in self.searchResult]
     
     def getEntry(self, entryId):
         """
@@ -218,10 +395,7 @@ class ReferenceManager(object):
         @rtype: L{app.entry.Entry}
         @return: The entry, L{None} if not found.
         """
-        for e in self.entryList:
-            if e.getId() == entryId:
-                return e
-        return None
+        return self.storage.get(entryId)
         
     def iterEntries(self):
         """
@@ -229,14 +403,14 @@ class ReferenceManager(object):
         @rtype: C{generator} of L{app.entry.Entry}
         @return: The list of entries.
         """
-        for entry in self.entryList:
+        for entry in self.storage.iterEntries():
             yield entry
         
     def getEntryCount(self):
         """
         @see: L{app.user_interface.BiBlerApp.getEntryCount}.
         """
-        return len(self.entryList)
+        return self.storage.count()
         
     def iterSearchResult(self):
         """
@@ -253,26 +427,35 @@ class ReferenceManager(object):
         """
         return len(self.searchResult)
         
-    def __setKey(self, entry):
+    def __setKey(self, entry, batchKeys=None):
         """
         Generate and set a unique key to the entry.
+        If the generated key is already used, it is followed by the first suffix 'a', 'b', ... that makes it unique.
         @type entry: L{app.entry.Entry}
         @param entry: The entry.
+        @type batchKeys: L{dict}
+        @param batchKeys: The number of entries using each key among those about to be stored with this entry, if any.
         @raise Exception: If the first author of the entry published more than 27 on the entry's publication year.
         """
         key = entry.generateKey()
         if not key:
             return
             raise Exception('Cannot generate key because of missing fields.')
-        duplicateKeys = [e.getKey() for e in [e for e in self.entryList if e.getId() != entry.getId() and e.getKey().startswith(key)]]
-        if len(duplicateKeys) > 27:
-            raise Exception('Too many entries with the same key.')
-        elif not duplicateKeys:
-            entry.setKey(key)
+        # The entry itself, or the one it replaces, does not count
+        ownKey = self.storage.getKey(entry.getId())
+        for suffix in self.__KEY_SUFFIXES:
+            used = self.storage.countKey(key + suffix) + self.releasedKeys.get(key + suffix, 0)
+            if batchKeys:
+                used += batchKeys.get(key + suffix, 0)
+            if key + suffix == ownKey:
+                used -= 1
+            if not used:
+                break
         else:
-            suffix = ''
-            for i in range(len(duplicateKeys) + 1):
-                if key + suffix not in duplicateKeys:
-                    entry.setKey(key + suffix)
-                    break
-                suffix = chr(ord('a') + i)
+            raise Exception('Too many entries with the same key.')
+        if ownKey is not None:
+            self.storage.setKey(entry.getId(), key + suffix)
+            self.renderCache.invalidate(entry.getId())
+        entry.setKey(key + suffix)
+    
+    __KEY_SUFFIXES = [''] + [chr(ord('a') + i) for i in range(27)]
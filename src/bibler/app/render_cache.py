@@ -0,0 +1,111 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+"""
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+Created on Oct 17, 2026
+
+This module represents the cache of the rendered previews and BibTeX strings of entries.
+"""
+
+from collections import OrderedDict
+from utils.settings import Preferences
+
+
+class RenderCache(object):
+    """
+    A least recently used cache of the strings rendered from L{entries<app.entry.Entry>}.
+    A rendering is identified by the id of the entry, the version of its content, the kind of rendering and the bibliography style.
+    Changing an entry changes its version, so the renderings of its previous content are never used again and are eventually evicted.
+    The number of renderings kept is set by L{Preferences.renderCacheSize<utils.settings.Preferences.renderCacheSize>}.
+    """
+    PREVIEW = 'preview'
+    BIBTEX = 'bibtex'
+
+    def __init__(self):
+        self.__renders = OrderedDict()
+        """
+        The rendered strings, from the least to the most recently used.
+        """
+        self.__versions = dict()
+        """
+        The number of times each entry was invalidated, by id.
+        """
+        self.hits = 0
+        """
+        The number of renderings found in the cache.
+        """
+        self.misses = 0
+        """
+        The number of renderings not found in the cache.
+        """
+
+    def get(self, entry, kind, render):
+        """
+        Get a rendering of an entry, rendering it only if it is not in the cache.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry.
+        @type kind: L{str}
+        @param kind: The kind of rendering, L{PREVIEW} or L{BIBTEX}.
+        @type render: C{function}
+        @param render: The function rendering the entry.
+        @rtype: L{str}
+        @return: The rendered string.
+        """
+        size = Preferences().renderCacheSize
+        if size <= 0:
+            return render()
+        entryId = entry.getId()
+        key = (entryId, self.__versions.get(entryId, 0), entry.version, kind, Preferences().bibStyle)
+        rendered = self.__renders.get(key)
+        if rendered is not None:
+            self.hits += 1
+            self.__renders.move_to_end(key)
+            return rendered
+        self.misses += 1
+        rendered = render()
+        self.__renders[key] = rendered
+        while len(self.__renders) > size:
+            self.__renders.popitem(last=False)
+        return rendered
+
+    def invalidate(self, entryId):
+        """
+        Stop using the renderings of an entry, after its content changed.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        """
+        self.__versions[entryId] = self.__versions.get(entryId, 0) + 1
+
+    def clear(self):
+        """
+        Remove all the renderings, after the ids of the entries are reused.
+        """
+        self.__renders.clear()
+        self.__versions.clear()
+
+    def getStatistics(self):
+        """
+        Get the usage of the cache.
+        @rtype: L{dict}
+        @return: The number of C{hits}, of C{misses}, and the C{size} of the cache.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self.__renders)}
@@ -27,13 +27,13 @@ This module represents the report generator
 """
 
 from app.field_name import FieldName
-from app.field import Field
 #from utils import resourcemgr
 from utils.utils import Utils
 from datetime import datetime
 from string import Template
 from io import StringIO
 import spacy
+import threading
 
 """
 Template strings for the report
@@ -89,6 +89,15 @@ class ReportGenerator(object):
     The abstract class for importing or exporting.
     Every Impex has a C{path} to the database file and a C{database} file handler.
     """    
+    __nlp = None
+    """
+    The spacy model shared by all the generators.
+    """
+    __nlpLock = threading.Lock()
+    """
+    Guards the loading and the use of the spacy model, which is not safe to use in several threads at once.
+    """
+    
     def __init__(self, entries):
         """
         @type path: L{List<entry.Entry>}
@@ -96,12 +105,23 @@ class ReportGenerator(object):
         """
         self.entries = entries
         
-        # Initialize spacy 'en_core_web_trf' model, keeping only tagger component needed for lemmatization
-        #self.nlp = spacy.load(resMgr.getNLPModelPath(), disable=['parser', 'ner'])
-        self.nlp = spacy.load('en_core_web_trf', disable=['parser', 'ner'])
+        self.nlp = ReportGenerator.getNLP()
         self.stop_words = self.nlp.Defaults.stop_words
         #stop_words |= {' ', '.', ':', '(', ')', ',', "'", }
     
+    @staticmethod
+    def getNLP():
+        """
+        Get the spacy model, loaded once for the whole process.
+        @return: The model.
+        """
+        with ReportGenerator.__nlpLock:
+            if ReportGenerator.__nlp is None:
+                # Initialize spacy 'en_core_web_trf' model, keeping only tagger component needed for lemmatization
+                #ReportGenerator.__nlp = spacy.load(resMgr.getNLPModelPath(), disable=['parser', 'ner'])
+                ReportGenerator.__nlp = spacy.load('en_core_web_trf', disable=['parser', 'ner'])
+            return ReportGenerator.__nlp
+    
     def __getToday(self):
         return datetime.now().strftime('%d/%m/%Y %H:%M:%S')
     
@@ -124,7 +144,7 @@ class ReportGenerator(object):
         for entry in self.entries:
             contributors = entry.getContributors()
             for cont in contributors:
-                cont = Field.simplify(str(cont))
+                cont = cont.getSimpleName()
                 contributor_freq[cont] = (contributor_freq[cont] + 1 if cont in contributor_freq else 1)
         for cont, freq in Utils().sort_dict_by_value(contributor_freq, False):
             yield (cont, freq)
@@ -141,9 +161,8 @@ class ReportGenerator(object):
         keyword_freq = {}
         keywords = ' '
         for entry in self.entries:
-            keywords = '. '.join([keywords, entry.getFieldValue(FieldName.Title), entry.getFieldValue(FieldName.Abstract)])
-        for keyword in self.lemmatize(keywords):
-            k = Field.simplify(keyword)
+            keywords = '. '.join([keywords, entry.getField(FieldName.Title).getSimpleValue(), entry.getField(FieldName.Abstract).getSimpleValue()])
+        for k in self.lemmatize(keywords):
             keyword_freq[k] = (keyword_freq[k] + 1 if k in keyword_freq else 1)
         for keyword,freq in Utils().sort_dict_by_value(keyword_freq, False):
             yield (keyword, freq)
@@ -157,7 +176,8 @@ class ReportGenerator(object):
         @return: All the unique words.
         """
         # Parse the text
-        doc = self.nlp(text)
+        with ReportGenerator.__nlpLock:
+            doc = self.nlp(text)
         # Extract the lemma for each token and join
         for token in doc:
             if not token.lemma_ in self.stop_words and not token.is_punct and not token.is_digit:
@@ -0,0 +1,199 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+"""
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+Created on Oct 17, 2026
+
+This module represents the full-text index used to search entries.
+"""
+
+import re
+
+
+class SearchIndex(object):
+    """
+    An inverted index of the simplified and lowercased tokens of the fields of L{entries<app.entry.Entry>}.
+    A token is a maximal sequence of alphanumeric characters.
+    Every occurrence of a query inside a field value contains each of the tokens of the query inside a token of that value,
+    so only the entries having such tokens are candidates, and only these are checked against the query.
+    The indexed tokens containing a token of the query are found among those having one of its trigrams.
+    A token of the query shorter than a trigram is looked up in all indexed tokens.
+    """
+    re_token = re.compile("""\w+""")
+    re_regex_special = re.compile("""[|()\[\]{}\\\\]""")
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self.__texts = dict()
+        """
+        The simplified values of the fields of each entry, by id.
+        """
+        self.__postings = dict()
+        """
+        The ids of the entries having each token.
+        """
+        self.__tokens = dict()
+        """
+        The tokens of each entry, by id.
+        """
+        self.__grams = dict()
+        """
+        The indexed tokens having each trigram.
+        """
+
+    def add(self, entry):
+        """
+        Index an entry.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry.
+        """
+        entryId = entry.getId()
+        if entryId in self.__texts:
+            self.remove(entryId)
+        fields = list(entry.iterAllFields())
+        texts = tuple(field.getSimpleValue() for field in fields)
+        tokens = set()
+        for field in fields:
+            tokens.update(self.re_token.findall(field.getLowerValue()))
+        for token in tokens:
+            postings = self.__postings.get(token)
+            if postings is None:
+                self.__postings[token] = {entryId}
+                for gram in self.__getGrams(token):
+                    grams = self.__grams.get(gram)
+                    if grams is None:
+                        self.__grams[gram] = {token}
+                    else:
+                        grams.add(token)
+            else:
+                postings.add(entryId)
+        self.__texts[entryId] = texts
+        self.__tokens[entryId] = tokens
+
+    def remove(self, entryId):
+        """
+        Remove an entry from the index.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        """
+        if entryId not in self.__texts:
+            return
+        for token in self.__tokens.pop(entryId):
+            postings = self.__postings[token]
+            postings.discard(entryId)
+            if not postings:
+                del self.__postings[token]
+                for gram in self.__getGrams(token):
+                    grams = self.__grams[gram]
+                    grams.discard(token)
+                    if not grams:
+                        del self.__grams[gram]
+        del self.__texts[entryId]
+
+    def clear(self):
+        """
+        Remove all entries from the index.
+        """
+        self.__texts = {}
+        self.__postings = {}
+        self.__tokens = {}
+        self.__grams = {}
+
+    def searchExact(self, query):
+        """
+        Find the entries having a field value containing the query, ignoring case.
+        @type query: L{str}
+        @param query: A substring to find.
+        @rtype: L{list} of L{int}
+        @return: The ids of the matching entries, in no particular order.
+        @see: L{app.entry.Entry.matchesExact}.
+        """
+        query = query.lower()
+        return [entryId for entryId in self.__candidates(self.re_token.findall(query))
+                if any(query in text.lower() for text in self.__texts[entryId])]
+
+    def searchRegex(self, query):
+        """
+        Find the entries having a field value matching a regular expression.
+        The literal parts of the regular expression preselect the entries to check.
+        @type query: L{re.Pattern}
+        @param query: A compiled regular expression.
+        @rtype: L{list} of L{int}
+        @return: The ids of the matching entries, in no particular order.
+        @see: L{app.entry.Entry.matchesRegex}.
+        """
+        tokens = []
+        for literal in self.__getRegexLiterals(query.pattern):
+            tokens.extend(self.re_token.findall(literal.lower()))
+        return [entryId for entryId in self.__candidates(tokens)
+                if any(query.search(text) for text in self.__texts[entryId])]
+
+    def __candidates(self, tokens):
+        """
+        Find the entries having, for each token of the query, a token that contains it.
+        All entries are candidates if the query has no token.
+        """
+        if not tokens:
+            return self.__texts.keys()
+        candidates = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            ids = set()
+            for indexed in self.__getContainingTokens(token):
+                ids.update(self.__postings[indexed])
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+        return candidates
+
+    def __getContainingTokens(self, token):
+        """
+        Find the indexed tokens that contain a token, checking only those having its least common trigram.
+        """
+        if len(token) < self.GRAM_SIZE:
+            return [indexed for indexed in self.__postings if token in indexed]
+        tokens = min((self.__grams.get(gram, ()) for gram in self.__getGrams(token)), key=len)
+        return [indexed for indexed in tokens if token in indexed]
+
+    def __getGrams(self, token):
+        """
+        Get the distinct trigrams of a token, none if it is shorter than a trigram.
+        """
+        return {token[i:i + self.GRAM_SIZE] for i in range(len(token) - self.GRAM_SIZE + 1)}
+
+    def __getRegexLiterals(self, pattern):
+        """
+        Get the parts of a regular expression that every match must contain.
+        Only simple patterns are considered: none is returned if the pattern has alternatives, groups, classes, repetitions or escapes.
+        """
+        if self.re_regex_special.search(pattern):
+            return []
+        literals = ['']
+        for c in pattern:
+            if c in '*?':
+                # The previous character is optional
+                literals[-1] = literals[-1][:-1]
+                literals.append('')
+            elif c in '.^$+':
+                literals.append('')
+            else:
+                literals[-1] += c
+        return [literal for literal in literals if literal]
@@ -0,0 +1,724 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+"""
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+Created on Oct 17, 2026
+
+This module represents the storage engines holding the entries of the reference manager.
+"""
+
+from app.entry_type import EntryType
+from app.field_name import FieldName
+from app.search_index import SearchIndex
+from gui.app_interface import EntryListColumn
+from utils import settings
+import marshal
+import os
+import sqlite3
+import tempfile
+import weakref
+
+
+class Storage(object):
+    """
+    The ordered collection of L{entries<app.entry.Entry>} of a L{ReferenceManager<app.manager.ReferenceManager>}.
+    Entries are identified by their I{id} and kept in the order of the list of all entries.
+    """
+    @staticmethod
+    def create():
+        """
+        Create the storage selected in the preferences.
+        @rtype: L{Storage}
+        @return: An empty storage.
+        """
+        if settings.Preferences().storageEngine == settings.StorageEngine.SQLITE:
+            return SQLiteStorage(settings.Preferences().storagePath)
+        return MemoryStorage()
+
+    @staticmethod
+    def getSortKey(field):
+        """
+        Get the function giving the value to sort entries by a column.
+        @type field: L{gui.app_interface.EntryListColumn}
+        @param field: The column.
+        @rtype: C{function}
+        @return: The key function of the entries.
+        """
+        def getField(e):
+            try:
+                return e.getFieldValue(FieldName.fromEntryListColumn(field)).lower()
+            except:
+                return ''
+
+        if field == EntryListColumn.Entrytype:
+            return lambda e: e.getEntryType().lower()
+        elif field == EntryListColumn.Id:
+            return lambda e: e.getId()
+        elif field == EntryListColumn.Entrykey:
+            return lambda e: e.getKey().lower()
+        else:
+            return getField
+
+    def append(self, entry):
+        """
+        Add an entry at the end.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry, with an id.
+        """
+        raise NotImplementedError()
+
+    def extend(self, entries):
+        """
+        Add entries at the end, in one operation.
+        @type entries: L{list} of L{app.entry.Entry}
+        @param entries: The entries, with an id.
+        """
+        for entry in entries:
+            self.append(entry)
+
+    def insert(self, position, entry):
+        """
+        Add an entry at a position.
+        @type position: L{int}
+        @param position: The position of the entry.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry, with an id.
+        """
+        raise NotImplementedError()
+
+    def update(self, entry):
+        """
+        Replace the entry having the same id, or save the changes made to the fields of an entry.
+        @type entry: L{app.entry.Entry}
+        @param entry: The entry.
+        """
+        raise NotImplementedError()
+
+    def setKey(self, entryId, key):
+        """
+        Change the key of an entry.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        @type key: L{str}
+        @param key: The new key.
+        """
+        raise NotImplementedError()
+
+    def remove(self, entryId):
+        """
+        Remove an entry.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        @rtype: L{bool}
+        @return: L{True} if the entry was removed, L{False} if not found.
+        """
+        raise NotImplementedError()
+
+    def removeMany(self, entryIds):
+        """
+        Remove several entries in one operation.
+        @type entryIds: iterable of L{int}
+        @param entryIds: The I{id} of each entry.
+        @rtype: L{int}
+        @return: The number of entries removed, the ones not found are ignored.
+        """
+        return sum(1 for entryId in entryIds if self.remove(entryId))
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        raise NotImplementedError()
+
+    def get(self, entryId):
+        """
+        Get an entry given its id.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        @rtype: L{app.entry.Entry}
+        @return: The entry, L{None} if not found.
+        """
+        raise NotImplementedError()
+
+    def getKey(self, entryId):
+        """
+        Get the key of an entry given its id.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        @rtype: L{str}
+        @return: The key, L{None} if not found.
+        """
+        raise NotImplementedError()
+
+    def getPosition(self, entryId):
+        """
+        Get the position of an entry given its id.
+        @type entryId: L{int}
+        @param entryId: The I{id} of the entry.
+        @rtype: L{int}
+        @return: The position, L{None} if not found.
+        """
+        raise NotImplementedError()
+
+    def countKey(self, key):
+        """
+        Count the entries using a key.
+        @type key: L{str}
+        @param key: The key.
+        @rtype: L{int}
+        @return: The number of entries.
+        """
+        raise NotImplementedError()
+
+    def count(self):
+        """
+        Count the entries.
+        @rtype: L{int}
+        @return: The number of entries.
+        """
+        raise NotImplementedError()
+
+    def iterEntries(self):
+        """
+        Iterator over the entries, in order.
+        @rtype: C{generator} of L{app.entry.Entry}
+        @return: The entries.
+        """
+        raise NotImplementedError()
+
+    def sort(self, field, reverse=False):
+        """
+        Sort the entries by a column. Entries with the same value keep their order.
+        @type field: L{gui.app_interface.EntryListColumn}
+        @param field: The column.
+        @type reverse: L{bool}
+        @param reverse: Whether to sort in descending order.
+        """
+        raise NotImplementedError()
+
+    def reorder(self, entryIds):
+        """
+        Put the entries in the given order. Entries not listed go last and keep their order.
+        @type entryIds: L{list} of L{int}
+        @param entryIds: The ids of the entries in order.
+        """
+        raise NotImplementedError()
+
+    def searchExact(self, query):
+        """
+        Find the entries having a field value containing the query, ignoring case.
+        @type query: L{str}
+        @param query: A substring to find.
+        @rtype: L{list} of L{app.entry.Entry}
+        @return: The matching entries, in order.
+        @see: L{app.entry.Entry.matchesExact}.
+        """
+        raise NotImplementedError()
+
+    def searchRegex(self, query):
+        """
+        Find the entries having a field value matching a regular expression.
+        @type query: L{re.Pattern}
+        @param query: A compiled regular expression.
+        @rtype: L{list} of L{app.entry.Entry}
+        @return: The matching entries, in order.
+        @see: L{app.entry.Entry.matchesRegex}.
+        """
+        raise NotImplementedError()
+
+
+class MemoryStorage(Storage):
+    """
+    Keeps the entries as objects in a list, indexed by id, position and key.
+    """
+    def __init__(self):
+        self.entryList = list()
+        self.__entryIndex = dict()
+        """
+        The entries of C{entryList} by id.
+        """
+        self.__positionIndex = dict()
+        """
+        The position of the entries in C{entryList} by id.
+        Only the first C{__validPositions} positions are up to date: the others are recomputed when needed.
+        """
+        self.__validPositions = 0
+        self.__keyIndex = dict()
+        """
+        The number of entries in C{entryList} using each key.
+        """
+        self.__searchIndex = None
+        """
+        The full-text index of C{entryList}, built on the first search.
+        """
+
+    def append(self, entry):
+        self.entryList.append(entry)
+        self.__add(entry)
+        if self.__validPositions == len(self.entryList) - 1:
+            self.__positionIndex[entry.getId()] = self.__validPositions
+            self.__validPositions += 1
+
+    def extend(self, entries):
+        upToDate = self.__validPositions == len(self.entryList)
+        self.entryList.extend(entries)
+        for entry in entries:
+            self.__add(entry)
+        if upToDate:
+            self.__updatePositions()
+
+    def insert(self, position, entry):
+        self.entryList.insert(position, entry)
+        self.__add(entry)
+        self.__invalidatePositions(max(0, min(position, len(self.entryList) - 1)))
+
+    def __add(self, entry):
+        self.__entryIndex[entry.getId()] = entry
+        self.__indexKey(entry.getKey())
+        if self.__searchIndex is not None:
+            self.__searchIndex.add(entry)
+
+    def update(self, entry):
+        entryId = entry.getId()
+        old = self.__entryIndex[entryId]
+        if old is not entry:
+            self.entryList[self.getPosition(entryId)] = entry
+            self.__entryIndex[entryId] = entry
+            self.__unindexKey(old.getKey())
+            self.__indexKey(entry.getKey())
+        if self.__searchIndex is not None:
+            self.__searchIndex.add(entry)
+
+    def setKey(self, entryId, key):
+        entry = self.__entryIndex[entryId]
+        self.__unindexKey(entry.getKey())
+        entry.setKey(key)
+        self.__indexKey(key)
+
+    def remove(self, entryId):
+        entry = self.__entryIndex.get(entryId)
+        if entry is None:
+            return False
+        position = self.getPosition(entryId)
+        del self.entryList[position]
+        del self.__entryIndex[entryId]
+        self.__unindexKey(entry.getKey())
+        if self.__searchIndex is not None:
+            self.__searchIndex.remove(entryId)
+        del self.__positionIndex[entryId]
+        self.__invalidatePositions(position)
+        return True
+
+    def removeMany(self, entryIds):
+        removed = set(entryId for entryId in entryIds if entryId in self.__entryIndex)
+        if not removed:
+            return 0
+        self.entryList = [e for e in self.entryList if e.getId() not in removed]
+        for entryId in removed:
+            self.__unindexKey(self.__entryIndex.pop(entryId).getKey())
+            self.__positionIndex.pop(entryId, None)
+            if self.__searchIndex is not None:
+                self.__searchIndex.remove(entryId)
+        self.__invalidatePositions(0)
+        return len(removed)
+
+    def clear(self):
+        self.entryList = []
+        self.__entryIndex = {}
+        self.__positionIndex = {}
+        self.__validPositions = 0
+        self.__keyIndex = {}
+        if self.__searchIndex is not None:
+            self.__searchIndex.clear()
+
+    def get(self, entryId):
+        return self.__entryIndex.get(entryId)
+
+    def getKey(self, entryId):
+        entry = self.__entryIndex.get(entryId)
+        return None if entry is None else entry.getKey()
+
+    def getPosition(self, entryId):
+        position = self.__positionIndex.get(entryId)
+        if position is None or position >= self.__validPositions:
+            self.__updatePositions()
+            position = self.__positionIndex.get(entryId)
+        return position
+
+    def countKey(self, key):
+        return self.__keyIndex.get(key, 0)
+
+    def count(self):
+        return len(self.entryList)
+
+    def iterEntries(self):
+        for entry in self.entryList:
+            yield entry
+
+    def sort(self, field, reverse=False):
+        try:
+            self.entryList.sort(key=Storage.getSortKey(field), reverse=reverse)
+        finally:
+            self.__invalidatePositions(0)
+
+    def reorder(self, entryIds):
+        entries = [self.__entryIndex[entryId] for entryId in entryIds if entryId in self.__entryIndex]
+        if len(entries) == len(self.entryList) and len(set(entryIds)) == len(entryIds):
+            # The ids are a permutation of the entries
+            self.entryList = entries
+        else:
+            entryOrder = {entryId: i for i, entryId in enumerate(entryIds)}
+            self.entryList.sort(key=lambda e: entryOrder.get(e.getId(), len(entryOrder)))
+        self.__invalidatePositions(0)
+
+    def searchExact(self, query):
+        index = self.__getSearchIndex()
+        if index:
+            return self.__getEntriesInOrder(index.searchExact(query))
+        return [e for e in iter(self.entryList) if e.matchesExact(query)]
+
+    def searchRegex(self, query):
+        index = self.__getSearchIndex()
+        if index:
+            return self.__getEntriesInOrder(index.searchRegex(query))
+        return [e for e in iter(self.entryList) if e.matchesRegex(query)]
+
+    def __getSearchIndex(self):
+        """
+        Get the full-text index of the entries, building it if needed.
+        @rtype: L{app.search_index.SearchIndex}
+        @return: The index, L{None} if disabled in the preferences.
+        """
+        if not settings.Preferences().searchIndex:
+            self.__searchIndex = None
+        elif self.__searchIndex is None:
+            self.__searchIndex = SearchIndex()
+            for entry in self.entryList:
+                self.__searchIndex.add(entry)
+        return self.__searchIndex
+
+    def __getEntriesInOrder(self, entryIds):
+        entries = [self.__entryIndex[entryId] for entryId in entryIds]
+        entries.sort(key=lambda e: self.getPosition(e.getId()))
+        return entries
+
+    def __invalidatePositions(self, position):
+        """
+        Mark the positions of the entries from C{position} onwards as out of date.
+        """
+        self.__validPositions = min(self.__validPositions, position)
+
+    def __updatePositions(self):
+        for position in range(self.__validPositions, len(self.entryList)):
+            self.__positionIndex[self.entryList[position].getId()] = position
+        self.__validPositions = len(self.entryList)
+
+    def __indexKey(self, key):
+        self.__keyIndex[key] = self.__keyIndex.get(key, 0) + 1
+
+    def __unindexKey(self, key):
+        count = self.__keyIndex.get(key, 0) - 1
+        if count > 0:
+            self.__keyIndex[key] = count
+        else:
+            self.__keyIndex.pop(key, None)
+
+
+class SQLiteStorage(Storage):
+    """
+    Keeps the entries in an SQLite database, so that only the entries in use are held in memory.
+    An entry is stored as its type, its key and its fields in compact form, and the non-empty fields are also stored
+    as rows with their simplified and lowercased values to search and sort the entries in SQL.
+    L{Entry<app.entry.Entry>} objects are created from the database every time they are requested:
+    changes made to them are only saved through L{update}.
+    """
+    BATCH_SIZE = 256
+    """
+    The number of entries read at once when iterating over the entries.
+    """
+    SCHEMA = """
+        CREATE TABLE entries (
+            id INTEGER PRIMARY KEY,
+            position INTEGER NOT NULL,
+            entrytype TEXT,
+            entrykey TEXT,
+            emptyfields INTEGER NOT NULL,
+            data BLOB NOT NULL
+        );
+        CREATE INDEX entries_position ON entries (position);
+        CREATE INDEX entries_entrykey ON entries (entrykey);
+        CREATE TABLE fields (
+            entry_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            value TEXT NOT NULL,
+            simplevalue TEXT NOT NULL,
+            lowervalue TEXT NOT NULL
+        );
+        CREATE INDEX fields_entry_id ON fields (entry_id);
+        CREATE INDEX fields_name ON fields (name, entry_id);
+        """
+
+    def __init__(self, path=''):
+        """
+        (Constructor)
+        Every storage has its own database, so that several storages, possibly of different processes, can share a path.
+        Since the database only lives as long as the storage, it is neither journaled nor synchronized on disk.
+        @type path: L{str}
+        @param path: The directory of the database file, created if needed.
+        An empty path uses a temporary database managed by SQLite.
+        """
+        database = ''
+        if path:
+            os.makedirs(path, exist_ok=True)
+            handle, database = tempfile.mkstemp(prefix='bibler-', suffix='.db', dir=path)
+            os.close(handle)
+        self.__connection = sqlite3.connect(database, check_same_thread=False)
+        self.__close = weakref.finalize(self, SQLiteStorage.__delete, self.__connection, database)
+        self.__connection.execute('PRAGMA synchronous = OFF')
+        self.__connection.execute('PRAGMA journal_mode = MEMORY')
+        self.__connection.create_function('bibler_lower', 1, lambda s: s.lower() if s else '', deterministic=True)
+        with self.__connection:
+            self.__connection.executescript(self.SCHEMA)
+        self.__validPositions = 0
+        """
+        The number of entries whose position column is their position.
+        The positions of the others keep their order but may have gaps, and are renumbered when needed.
+        """
+
+    @staticmethod
+    def __delete(connection, database):
+        """
+        Close the connection and delete the database file, if any.
+        """
+        connection.close()
+        if database:
+            try:
+                os.remove(database)
+            except OSError:
+                pass
+
+    def close(self):
+        """
+        Close the database and delete its file.
+        It is also done when the storage is garbage collected.
+        """
+        self.__close()
+
+    def append(self, entry):
+        self.extend([entry])
+
+    def extend(self, entries):
+        with self.__connection:
+            upToDate = self.__validPositions == self.count()
+            position = self.__connection.execute('SELECT COALESCE(MAX(position) + 1, 0) FROM entries').fetchone()[0]
+            for entry in entries:
+                self.__insert(position, entry)
+                position += 1
+            if upToDate:
+                self.__validPositions = position
+
+    def insert(self, position, entry):
+        with self.__connection:
+            position = max(0, min(position, self.count()))
+            if position > self.__validPositions:
+                self.__updatePositions()
+            self.__connection.execute('UPDATE entries SET position = position + 1 WHERE position >= ?', (position,))
+            self.__insert(position, entry)
+            self.__validPositions += 1
+
+    def __insert(self, position, entry):
+        entryType, key, data, emptyFields = self.__toRow(entry)
+        self.__connection.execute('INSERT INTO entries (id, position, entrytype, entrykey, emptyfields, data) '
+                                  'VALUES (?, ?, ?, ?, ?, ?)',
+                                  (entry.getId(), position, entryType, key, emptyFields, data))
+        self.__insertFields(entry)
+
+    def __insertFields(self, entry):
+        entryId = entry.getId()
+        self.__connection.executemany('INSERT INTO fields (entry_id, name, value, simplevalue, lowervalue) '
+                                      'VALUES (?, ?, ?, ?, ?)',
+                                      ((entryId, field.getName(), field.getValue(), field.getSimpleValue(),
+                                        field.getLowerValue())
+                                       for field in entry.iterAllFields() if not field.isEmpty()))
+
+    def __toRow(self, entry):
+        """
+        Get the type, the key, the fields in compact form and the number of empty fields of an entry.
+        """
+        entryType, key, fields = entry.toCompact()
+        emptyFields = sum(1 for field in entry.iterAllFields() if field.isEmpty())
+        return entryType, key, marshal.dumps(fields), emptyFields
+
+    def __toEntry(self, row):
+        """
+        Create an entry from its id, type, key and fields in compact form.
+        """
+        entryId, entryType, key, data = row
+        entry = EntryType.fromCompact((entryType, key, marshal.loads(data)))
+        entry.setId(entryId)
+        return entry
+
+    def update(self, entry):
+        entryType, key, data, emptyFields = self.__toRow(entry)
+        with self.__connection:
+            self.__connection.execute('UPDATE entries SET entrytype = ?, entrykey = ?, emptyfields = ?, data = ? '
+                                      'WHERE id = ?', (entryType, key, emptyFields, data, entry.getId()))
+            self.__connection.execute('DELETE FROM fields WHERE entry_id = ?', (entry.getId(),))
+            self.__insertFields(entry)
+
+    def setKey(self, entryId, key):
+        with self.__connection:
+            self.__connection.execute('UPDATE entries SET entrykey = ? WHERE id = ?', (key, entryId))
+
+    def remove(self, entryId):
+        row = self.__connection.execute('SELECT position FROM entries WHERE id = ?', (entryId,)).fetchone()
+        if row is None:
+            return False
+        with self.__connection:
+            self.__connection.execute('DELETE FROM entries WHERE id = ?', (entryId,))
+            self.__connection.execute('DELETE FROM fields WHERE entry_id = ?', (entryId,))
+        # The entries after it are renumbered when their position is needed
+        self.__validPositions = min(self.__validPositions, row[0])
+        return True
+
+    def removeMany(self, entryIds):
+        entryIds = [(entryId,) for entryId in entryIds]
+        with self.__connection:
+            removed = self.__connection.executemany('DELETE FROM entries WHERE id = ?', entryIds).rowcount
+            if removed:
+                self.__connection.executemany('DELETE FROM fields WHERE entry_id = ?', entryIds)
+                self.__validPositions = 0
+        return max(removed, 0)
+
+    def clear(self):
+        with self.__connection:
+            self.__connection.execute('DELETE FROM entries')
+            self.__connection.execute('DELETE FROM fields')
+        self.__validPositions = 0
+
+    def get(self, entryId):
+        row = self.__connection.execute('SELECT id, entrytype, entrykey, data FROM entries WHERE id = ?',
+                                        (entryId,)).fetchone()
+        return None if row is None else self.__toEntry(row)
+
+    def getKey(self, entryId):
+        row = self.__connection.execute('SELECT entrykey FROM entries WHERE id = ?', (entryId,)).fetchone()
+        return None if row is None else row[0]
+
+    def getPosition(self, entryId):
+        row = self.__connection.execute('SELECT position FROM entries WHERE id = ?', (entryId,)).fetchone()
+        if row is not None and row[0] >= self.__validPositions:
+            self.__updatePositions()
+            row = self.__connection.execute('SELECT position FROM entries WHERE id = ?', (entryId,)).fetchone()
+        return None if row is None else row[0]
+
+    def countKey(self, key):
+        return self.__connection.execute('SELECT COUNT(*) FROM entries WHERE entrykey = ?', (key,)).fetchone()[0]
+
+    def count(self):
+        return self.__connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def iterEntries(self):
+        # Read the entries by batches of consecutive positions, so that they can be changed while iterating
+        position = -1
+        while True:
+            rows = self.__connection.execute('SELECT id, entrytype, entrykey, data, position FROM entries '
+                                             'WHERE position > ? ORDER BY position LIMIT ?',
+                                             (position, self.BATCH_SIZE)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self.__toEntry(row[:4])
+            position = rows[-1][4]
+
+    def sort(self, field, reverse=False):
+        order = 'DESC' if reverse else 'ASC'
+        if field == EntryListColumn.Entrytype:
+            query = 'SELECT id FROM entries ORDER BY bibler_lower(entrytype) %s, position' % order
+            parameters = ()
+        elif field == EntryListColumn.Id:
+            query = 'SELECT id FROM entries ORDER BY id %s' % order
+            parameters = ()
+        elif field == EntryListColumn.Entrykey:
+            query = 'SELECT id FROM entries ORDER BY bibler_lower(entrykey) %s, position' % order
+            parameters = ()
+        else:
+            try:
+                name = FieldName.fromEntryListColumn(field)
+            except:
+                # Every entry has the same empty value
+                return
+            query = ('SELECT e.id FROM entries e LEFT JOIN fields f ON f.entry_id = e.id AND f.name = ? '
+                     'ORDER BY bibler_lower(f.value) %s, e.position' % order)
+            parameters = (name,)
+        self.__setOrder([row[0] for row in self.__connection.execute(query, parameters)])
+
+    def reorder(self, entryIds):
+        entryOrder = {entryId: i for i, entryId in enumerate(entryIds)}
+        current = [row[0] for row in self.__connection.execute('SELECT id FROM entries ORDER BY position')]
+        if len(entryOrder) == len(entryIds) == len(current) and all(entryId in entryOrder for entryId in current):
+            # The ids are a permutation of the entries
+            current = entryIds
+        else:
+            current.sort(key=lambda entryId: entryOrder.get(entryId, len(entryOrder)))
+        self.__setOrder(current)
+
+    def __setOrder(self, entryIds):
+        """
+        Renumber the positions of the entries in the given order.
+        """
+        with self.__connection:
+            self.__connection.executemany('UPDATE entries SET position = ? WHERE id = ?',
+                                          ((position, entryId) for position, entryId in enumerate(entryIds)))
+        self.__validPositions = len(entryIds)
+
+    def __updatePositions(self):
+        """
+        Renumber the positions of the entries that are out of date.
+        """
+        entryIds = [row[0] for row in self.__connection.execute('SELECT id FROM entries WHERE position >= ? '
+                                                                'ORDER BY position', (self.__validPositions,))]
+        with self.__connection:
+            self.__connection.executemany('UPDATE entries SET position = ? WHERE id = ?',
+                                          ((position, entryId)
+                                           for position, entryId in enumerate(entryIds, self.__validPositions)))
+        self.__validPositions += len(entryIds)
+
+    def searchExact(self, query):
+        query = query.lower()
+        return self.__search('instr(f.lowervalue, ?) > 0', (query,), query == '')
+
+    def searchRegex(self, query):
+        self.__connection.create_function('bibler_match', 1, lambda s: query.search(s) is not None)
+        return self.__search('bibler_match(f.simplevalue)', (), query.search('') is not None)
+
+    def __search(self, condition, parameters, matchesEmpty):
+        """
+        Find the entries having a non-empty field satisfying a condition in SQL,
+        or having an empty field if the query matches the empty string.
+        """
+        rows = self.__connection.execute('SELECT e.id, e.entrytype, e.entrykey, e.data FROM entries e '
+                                         'WHERE (? AND e.emptyfields > 0) OR EXISTS '
+                                         '(SELECT 1 FROM fields f WHERE f.entry_id = e.id AND %s) '
+                                         'ORDER BY e.position' % condition,
+                                         (matchesEmpty,) + parameters)
+        return [self.__toEntry(row) for row in rows]
@@ -29,11 +29,13 @@ This module represents the API of the application.
 
 from gui.app_interface import IApplication
 from app.manager import ReferenceManager
-from app.command import AddCommand, CommandExecutor, DeleteCommand, DuplicateCommand, ExportCommand, GenerateAllKeysCommand, ImportCommand, \
+from app.command import AddCommand, AddEntriesCommand, CommandExecutor, DeleteCommand, DuplicateCommand, ExportCommand, GenerateAllKeysCommand, ImportCommand, \
                         OpenCommand, PreviewCommand, SearchCommand, SortCommand, UndoCommand, UpdateCommand, ValidateCommand, ValidateAllCommand, \
-                        ExportStringCommand, ImportStringCommand, GenerateReportCommand
+                        ExportStringCommand, ExportStreamCommand, ImportStringCommand, ImportStreamCommand, GenerateReportCommand, \
+                        ReleasingImportStreamCommand
 from app.field_name import FieldName
 from app.bibtex_parser import BibTeXParser
+from app.render_cache import RenderCache
 from utils.settings import Preferences
 
 
@@ -71,6 +73,14 @@ class BiBlerApp(IApplication):
         """
         return self.__executor.execute(ImportStringCommand(self.__manager, data, importFormat))
         
+    def iterImportString(self, data, importFormat, release=False):
+        """
+        @see: L{gui.app_interface.IApplication.iterImportString}.
+        """
+        if release:
+            return self.__executor.execute(ReleasingImportStreamCommand(self.__manager, data, importFormat))
+        return self.__executor.execute(ImportStreamCommand(self.__manager, data, importFormat))
+        
     def exportFile(self, path, exportFormat):
         """
         @see: L{gui.app_interface.IApplication.exportFile}.
@@ -82,6 +92,12 @@ class BiBlerApp(IApplication):
         @see: L{gui.app_interface.IApplication.exportFile}.
         """
         return self.__executor.execute(ExportStringCommand(self.__manager, exportFormat))
+                
+    def iterExportString(self, exportFormat):
+        """
+        @see: L{gui.app_interface.IApplication.iterExportString}.
+        """
+        return self.__executor.execute(ExportStreamCommand(self.__manager, exportFormat))
         
     def openFile(self, path, openFormat):
         """
@@ -95,6 +111,12 @@ class BiBlerApp(IApplication):
         """
         return self.__executor.execute(AddCommand(self.__manager, entryBibTeX, entryType))
         
+    def addEntries(self, entriesBibTeX, ignoreIfEmpty=False):
+        """
+        @see: L{gui.app_interface.IApplication.addEntries}.
+        """
+        return self.__executor.execute(AddEntriesCommand(self.__manager, entriesBibTeX, ignoreIfEmpty))
+        
     def duplicateEntry(self, entryId):
         """
         @see: L{gui.app_interface.IApplication.duplicateEntry}.
@@ -155,6 +177,18 @@ class BiBlerApp(IApplication):
         """
         return self.__executor.canUndo()
     
+    def getUndoMemoryUsage(self):
+        """
+        @see: L{gui.app_interface.IApplication.getUndoMemoryUsage}.
+        """
+        return self.__executor.getMemoryUsage()
+    
+    def getRenderCacheStatistics(self):
+        """
+        @see: L{gui.app_interface.IApplication.getRenderCacheStatistics}.
+        """
+        return self.__manager.renderCache.getStatistics()
+    
     def getEntryPaperURL(self, entryId):
         """
         @see: L{gui.app_interface.IApplication.getEntryPaperURL}.
@@ -221,7 +255,7 @@ class BiBlerApp(IApplication):
         """
         entry = self.__manager.getEntry(entryId)
         if entry:
-            return entry.toBibTeX()
+            return self.__manager.renderCache.get(entry, RenderCache.BIBTEX, entry.toBibTeX)
         raise Exception('entry not found.')
     
     def getEntryRequiredFields(self, entryId):
@@ -300,7 +334,7 @@ class BiBlerApp(IApplication):
         
     
     @staticmethod
-    def formatBibTeX(self, bibtex):
+    def formatBibTeX(bibtex):
         """
         Parses a BibTeX string, formats it according to the standard, and returns it.
         @type bibtex: L{str}
@@ -0,0 +1,28 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This package contains the benchmarks of BiBler. Run each one as a module from the src/bibler directory, e.g.::
+
+    python -m benchmark.benchmarkTex
+'''
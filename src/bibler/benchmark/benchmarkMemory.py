@@ -0,0 +1,87 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module measures the memory held by the entries of a BibTeX file scaled to many entries.
+'''
+import argparse
+import gc
+import os.path
+import time
+import tracemalloc
+from app.manager import ReferenceManager
+from app.impex import BibTeXImporter
+from app.storage import MemoryStorage
+from utils.settings import Preferences
+
+
+def loadBibTeX(path):
+    """
+    Get the BibTeX strings of the entries of a BibTeX file.
+    """
+    manager = ReferenceManager(MemoryStorage())
+    BibTeXImporter(path, manager).importFile()
+    return [entry.toBibTeX() for entry in manager.iterEntries()]
+
+def measure(bibtexs, total):
+    """
+    Add C{total} entries parsed from the BibTeX strings taken in turn and measure the memory they hold.
+    Each entry is parsed on its own, so it owns its values as when a file is imported.
+    The keys are kept as they are, since generating them would run out of suffixes.
+    """
+    manager = ReferenceManager(MemoryStorage())
+    overrideKeyGeneration = Preferences().overrideKeyGeneration
+    Preferences().overrideKeyGeneration = False
+    try:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        for i in range(total):
+            manager.add(bibtexs[i % len(bibtexs)])
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        loaded = tracemalloc.get_traced_memory()[0]
+        for entry in manager.iterEntries():
+            entry.toEntryDict()
+            entry.toBibTeX()
+        gc.collect()
+        displayed = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        Preferences().overrideKeyGeneration = overrideKeyGeneration
+    return manager.getEntryCount(), loaded, displayed, elapsed
+
+def run(path, total):
+    bibtexs = loadBibTeX(path)
+    total, loaded, displayed, elapsed = measure(bibtexs, total)
+    print('%d entries from %d in %s, added in %.1f s' % (total, len(bibtexs), os.path.basename(path), elapsed))
+    print('loaded     %8.1f MB  %6d bytes per entry' % (loaded / 1e6, loaded / total))
+    print('displayed  %8.1f MB  %6d bytes per entry' % (displayed / 1e6, displayed / total))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the memory held by the entries.')
+    parser.add_argument('path', nargs='?', default=os.path.join('..', '..', 'examples', 'examples.bib'), help='the BibTeX file providing the entries')
+    parser.add_argument('--entries', type=int, default=100000, help='the number of entries to add')
+    args = parser.parse_args()
+    run(args.path, args.entries)
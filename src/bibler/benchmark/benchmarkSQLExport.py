@@ -0,0 +1,69 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module measures the time to export a BibTeX file to a MySQL database script in each mode and to load it,
+in an SQLite database through L{testApp.mysql_shim}. The keys of the entries must be unique.
+'''
+import argparse
+import os.path
+import shutil
+import sqlite3
+import tempfile
+import time
+from app.user_interface import BiBlerApp
+from testApp import mysql_shim
+from utils import settings
+
+
+def run(path):
+    settings.Preferences().openSnapshots = False
+    ui = BiBlerApp()
+    ui.openFile(path, settings.ImportFormat.BIBTEX)
+    print('%d entries in %s' % (ui.getEntryCount(), os.path.basename(path)))
+    for mode in settings.SQLExportMode.getAllModes():
+        settings.Preferences().sqlExportMode = mode
+        folder = tempfile.mkdtemp()
+        try:
+            script = os.path.join(folder, 'library.sql')
+            start = time.perf_counter()
+            ui.exportFile(script, settings.ExportFormat.SQL)
+            exported = time.perf_counter() - start
+            connection = sqlite3.connect(os.path.join(folder, 'library.db'))
+            start = time.perf_counter()
+            for name in ['library.sql', 'library_authors.sql', 'library_assignments.sql']:
+                if os.path.exists(os.path.join(folder, name)):
+                    mysql_shim.loadScript(connection, os.path.join(folder, name))
+            loaded = time.perf_counter() - start
+            rows = sum(len(table) for table in mysql_shim.dumpTables(connection))
+            connection.close()
+            print('%-10s  exported in %6.2f s  loaded %7d rows in %7.2f s' % (mode, exported, rows, loaded))
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the export to a MySQL database script and its load.')
+    parser.add_argument('path', nargs='?', default=os.path.join('..', '..', 'examples', 'examples.bib'), help='the BibTeX file to export')
+    args = parser.parse_args()
+    run(args.path)
@@ -0,0 +1,80 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module compares the current L{utils.utils.Utils.tex2simple} and L{utils.utils.Utils.tex2html}
+with the former loops replacing each TeX sequence one after the other.
+'''
+import argparse
+import os.path
+import timeit
+from app.manager import ReferenceManager
+from app.impex import BibTeXImporter
+from utils.utils import Utils
+
+
+def tex2simpleLoop(s):
+    """
+    The former L{utils.utils.Utils.tex2simple}.
+    """
+    table = Utils().tex_to_simple
+    for tex in table:
+        s = s.replace(tex, table[tex])
+    return s
+
+def tex2htmlLoop(s):
+    """
+    The former L{utils.utils.Utils.tex2html}.
+    """
+    table = Utils().tex_to_html
+    for tex in table:
+        s = s.replace(tex, table[tex])
+    return s
+
+def loadValues(path):
+    """
+    Get the values of all the fields of the entries of a BibTeX file.
+    """
+    manager = ReferenceManager()
+    BibTeXImporter(path, manager).importFile()
+    return [field.getValue() for entry in manager.iterEntries() for field in entry.iterAllFields()]
+
+def run(path, repeat):
+    values = loadValues(path)
+    accented = [value for value in values if '\\' in value]
+    print('%d field values, %d with TeX sequences, best of %d runs' % (len(values), len(accented), repeat))
+    for name, loop, translator in [('tex2simple', tex2simpleLoop, Utils().tex2simple),
+                                   ('tex2html', tex2htmlLoop, Utils().tex2html)]:
+        assert [loop(v) for v in values] == [translator(v) for v in values], '%s differs from the loop.' % name
+        for label, sample in [('all values', values), ('with TeX', accented)]:
+            before = min(timeit.repeat(lambda: [loop(v) for v in sample], number=1, repeat=repeat))
+            after = min(timeit.repeat(lambda: [translator(v) for v in sample], number=1, repeat=repeat))
+            print('%-10s %-10s loop %8.2f ms  translator %8.2f ms  x%.0f' % (name, label, before * 1000, after * 1000, before / max(after, 1e-9)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the translation of TeX sequences.')
+    parser.add_argument('path', nargs='?', default=os.path.join('..', '..', 'examples', 'endnote_invalid.bib'), help='the BibTeX file providing the values')
+    parser.add_argument('--repeat', type=int, default=5, help='the number of runs')
+    args = parser.parse_args()
+    run(args.path, args.repeat)
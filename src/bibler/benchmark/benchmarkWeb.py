@@ -0,0 +1,177 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module measures the throughput of the web service under concurrent clients, and checks that each response
+is the same as when the requests are sent one at a time.
+It also measures the latency of formatting an entry while a large file is being imported,
+the time to validate, preview and get the BibTeX of entries one request per entry or in batches,
+the time to the first byte and the peak memory of importing a file with or without streaming,
+and the latency of the endpoints whose responses are cached, when the entries are sent the first time and again.
+Set BIBLER_CACHE_SIZE=0 to measure the other scenarios without the cache of the responses.
+Requires the packages of requirements-web.txt.
+'''
+import argparse
+import asyncio
+import json
+import os.path
+import re
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+import web
+from web import app
+
+ENDPOINTS = ['/formatbibtex/', '/getbibtex/', '/previewentry/', '/validateentry/', '/addentry/', '/bibtextohtml/', '/importbibtexstringforrelis/']
+
+
+def loadEntries(path, total):
+    """
+    Get the BibTeX strings of the first entries of a file.
+    """
+    with open(path, encoding='utf8') as f:
+        entries = ['@' + entry for entry in re.split(r'''^@''', f.read(), flags=re.MULTILINE)[1:]]
+    return entries[:total]
+
+def post(client, endpoint, bibtex):
+    start = time.perf_counter()
+    response = client.post(endpoint, json={'bibtex': bibtex})
+    return endpoint, bibtex, response.status_code, response.text, time.perf_counter() - start
+
+def run(path, clients, total):
+    entries = loadEntries(path, total)
+    requests = [(endpoint, bibtex) for bibtex in entries for endpoint in ENDPOINTS]
+    with TestClient(app, raise_server_exceptions=False) as client:
+        expected = {(endpoint, bibtex): (status, text) for endpoint, bibtex, status, text, _ in
+                    (post(client, endpoint, bibtex) for endpoint, bibtex in requests)}
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            results = list(pool.map(lambda request: post(client, *request), requests))
+        elapsed = time.perf_counter() - start
+    differ = sum(1 for endpoint, bibtex, status, text, _ in results if expected[(endpoint, bibtex)] != (status, text))
+    failed = sum(1 for result in results if result[2] != 200)
+    latencies = sorted(result[4] for result in results)
+    print('%d requests from %d clients in %.2f s: %.0f requests/s' % (len(results), clients, elapsed, len(results) / elapsed))
+    print('latency  median %.1f ms  95th percentile %.1f ms' % (latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * .95)] * 1e3))
+    print('%d responses differ from the serial ones, %d failed' % (differ, failed))
+
+def runDuringImport(path, total):
+    entries = loadEntries(path, total)
+    with open(path, encoding='utf8') as f:
+        data = f.read()
+    with TestClient(app, raise_server_exceptions=False) as client:
+        with ThreadPoolExecutor(1) as pool:
+            start = time.perf_counter()
+            importing = pool.submit(post, client, '/importbibtexstringforrelis/', data)
+            latencies = []
+            while not importing.done():
+                latencies.append(post(client, '/formatbibtex/', entries[len(latencies) % len(entries)])[4])
+            imported = importing.result()
+    latencies.sort()
+    print('import of %.1f MB: status %d in %.2f s' % (len(data) / 1e6, imported[2], time.perf_counter() - start))
+    print('%d entries formatted meanwhile, latency  median %.1f ms  maximum %.1f ms'
+          % (len(latencies), latencies[len(latencies) // 2] * 1e3, latencies[-1] * 1e3))
+
+def runBatches(path, total, batchSize):
+    entries = loadEntries(path, total)
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for endpoint in ['/validateentry/', '/previewentry/', '/getbibtex/']:
+            start = time.perf_counter()
+            expected = [client.post(endpoint, json={'bibtex': bibtex}).json() for bibtex in entries]
+            single = time.perf_counter() - start
+            start = time.perf_counter()
+            results = []
+            for i in range(0, len(entries), batchSize):
+                results.extend(item['result'] for item in client.post(endpoint[:-1] + 'batch/', json=entries[i:i + batchSize]).json())
+            batched = time.perf_counter() - start
+            print('%-16s %d entries: one per request %.2f s, in batches of %d %.2f s, %d results differ'
+                  % (endpoint, len(entries), single, batchSize, batched, sum(1 for a, b in zip(expected, results) if a != b)))
+
+async def postASGI(endpoint, body):
+    """
+    Send a request directly to the application, which unlike the test client does not wait for the whole response.
+    """
+    start = time.perf_counter()
+    received = {'chunks': [], 'first': None}
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()    # the client stays connected
+    async def send(message):
+        if message['type'] == 'http.response.body' and message.get('body'):
+            if received['first'] is None:
+                received['first'] = time.perf_counter() - start
+            received['chunks'].append(len(message['body']))
+    path, _, query = endpoint.partition('?')
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'POST', 'scheme': 'http', 'path': path,
+             'raw_path': path.encode(), 'query_string': query.encode(), 'root_path': '', 'headers': [(b'content-type', b'application/json')],
+             'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80)}
+    await app(scope, receive, send)
+    return received['first'], time.perf_counter() - start, sum(received['chunks'])
+
+def runStream(path):
+    with open(path, encoding='utf8') as f:
+        body = json.dumps({'bibtex': f.read()}).encode()
+    for endpoint in ['/importbibtexstringforrelis/', '/importbibtexstringforrelis/?stream=true']:
+        tracemalloc.start()
+        first, elapsed, size = asyncio.run(postASGI(endpoint, body))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('%-42s %.1f MB sent: first byte %.2f s, all %.2f s, peak memory %.0f MB' % (endpoint, size / 1e6, first, elapsed, peak / 1e6))
+
+def runCache(path, total):
+    entries = loadEntries(path, total)
+    endpoints = ['/formatbibtex/', '/getbibtex/', '/previewentry/', '/validateentry/', '/bibtextohtml/', '/bibtextosql/']
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for endpoint in endpoints:
+            latencies = []
+            for _ in range(2):
+                results = [post(client, endpoint, bibtex) for bibtex in entries]
+                latencies.append(sorted(result[4] for result in results))
+            print('%-16s %d entries: median latency first %.2f ms, again %.2f ms'
+                  % (endpoint, len(entries), latencies[0][len(entries) // 2] * 1e3, latencies[1][len(entries) // 2] * 1e3))
+        print(web.cache.getStatistics())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the web service under concurrent clients.')
+    parser.add_argument('path', nargs='?', default=os.path.join('..', '..', 'examples', 'examples.bib'), help='the BibTeX file providing the entries')
+    parser.add_argument('--clients', type=int, default=64, help='the number of concurrent clients')
+    parser.add_argument('--entries', type=int, default=200, help='the number of entries to send to each endpoint')
+    parser.add_argument('--during-import', action='store_true', help='format entries while the whole file is imported instead')
+    parser.add_argument('--batch', type=int, default=0, help='compare with the batch endpoints, sending this many entries per request')
+    parser.add_argument('--stream', action='store_true', help='import the whole file with and without streaming the response instead')
+    parser.add_argument('--cache', action='store_true', help='send the entries twice to the endpoints whose responses are cached instead')
+    args = parser.parse_args()
+    if args.cache:
+        runCache(args.path, args.entries)
+    elif args.during_import:
+        runDuringImport(args.path, args.entries)
+    elif args.stream:
+        runStream(args.path)
+    elif args.batch:
+        runBatches(args.path, args.entries, args.batch)
+    else:
+        run(args.path, args.clients, args.entries)
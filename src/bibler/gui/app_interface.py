@@ -172,6 +172,21 @@ class IApplication(object):
         """
         raise NotImplementedError()
     
+    def iterImportString(self, data, importFormat, release=False):
+        """
+        Import a list of entries from a string in a given format, adding them chunk by chunk as it is imported.
+        @type data: L{str}
+        @param data: The string containing the data.
+        @type importFormat: L{utils.settings.ImportFormat}
+        @param importFormat: The format of the file.
+        @type release: L{bool}
+        @param release: When True, the entries of each chunk are removed once the next chunk is requested,
+            so that the memory used does not grow with the string, and the import cannot be undone.
+        @rtype: generator of L{list} of L{int}
+        @return: The ids of the entries imported from each chunk, once they are added.
+        """
+        raise NotImplementedError()
+    
     def exportFile(self, path, exportFormat):
         """
         Export the list of entries to a file in a given format.
@@ -194,6 +209,16 @@ class IApplication(object):
         """
         raise NotImplementedError()
     
+    def iterExportString(self, exportFormat):
+        """
+        Export the list of entries in a given format, producing the output chunk by chunk as it is exported.
+        @type exportFormat: L{utils.settings.ExportFormat}
+        @param exportFormat: The format of the output.
+        @rtype: generator of L{str}
+        @return: The chunks of the output, which joined are the result of L{exportString}.
+        """
+        raise NotImplementedError()
+    
     def openFile(self, path, openFormat):
         """
         Import a list of entries from a BibTeX file in a given format and overwrites all existing entries.
@@ -220,6 +245,18 @@ class IApplication(object):
         """
         raise NotImplementedError()
     
+    def addEntries(self, entriesBibTeX, ignoreIfEmpty=False):
+        """
+        Add several new entries at once, in order. They are undone together.
+        @type entriesBibTeX: iterable of L{str}
+        @param entriesBibTeX: The BibTeX reference of each entry.
+        @type ignoreIfEmpty: L{bool}
+        @param ignoreIfEmpty: When True, does not add the entries that are empty.
+        @rtype: L{list} of L{int}
+        @return: The I{id} of each new entry. The entries that are invalid are not added.
+        """
+        raise NotImplementedError()
+    
     def duplicateEntry(self, entryId):
         """
         Create a copy of an existing entry.
@@ -320,6 +357,22 @@ class IApplication(object):
         """
         raise NotImplementedError()
     
+    def getUndoMemoryUsage(self):
+        """
+        Get an estimate of the memory held to undo the actions performed.
+        @rtype: L{int}
+        @return: The number of bytes.
+        """
+        raise NotImplementedError()
+    
+    def getRenderCacheStatistics(self):
+        """
+        Get how often the previews and BibTeX strings of the entries were found already rendered.
+        @rtype: L{dict}
+        @return: The number of C{hits}, of C{misses}, and the C{size} of the cache.
+        """
+        raise NotImplementedError()
+    
     def getEntryPaperURL(self, entryId):
         """
         Get the URL of the paper of the selected entry.
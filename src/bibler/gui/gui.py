@@ -1723,7 +1723,7 @@ class BiBlerGUI(wx.Frame):
         Open a dialog to select an HTML or CSV file to export to.
         """
         dlg = wx.FileDialog(self, message="Export to a file",
-                            wildcard="Web page (*.html)|*.html|Comma-Separated Values (*.csv)|*.csv|MySQL (*.sql)|*.sql",
+                            wildcard="Web page (*.html)|*.html|Comma-Separated Values (*.csv)|*.csv|MySQL (*.sql)|*.sql|SQLite (*.sqlite)|*.sqlite",
                             style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT)
         if dlg.ShowModal() == wx.ID_OK:
             _format = None
@@ -1734,6 +1734,8 @@ class BiBlerGUI(wx.Frame):
                 _format = settings.ExportFormat.CSV
             elif flt == 2:
                 _format = settings.ExportFormat.SQL
+            elif flt == 3:
+                _format = settings.ExportFormat.SQLITE
             wx.BeginBusyCursor()
             busy = wx.BusyInfo("Please wait a few seconds while exporting all entries...")
             wx.Yield()  # not sure if we need this
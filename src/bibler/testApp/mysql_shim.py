@@ -0,0 +1,79 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module loads the MySQL database scripts exported by L{app.impex.MySQLExporter} into SQLite,
+translating the parts of the MySQL dialect they use.
+'''
+import csv
+import os.path
+import re
+
+re_load = re.compile(r"""LOAD DATA LOCAL INFILE '([^']*)' INTO TABLE (\w+) [^(]*\(([^)]*)\);""")
+re_literal = re.compile(r"""N?'((?:[^'\\]|''|\\.)*)'""", re.DOTALL)
+re_escape = re.compile(r"""\\(.)""", re.DOTALL)
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0'}
+
+
+def unescape(value):
+    """
+    Replace the MySQL backslash escape sequences of a value.
+    """
+    return re_escape.sub(lambda m: ESCAPES.get(m.group(1), m.group(1)), value)
+
+def toSQLite(script):
+    """
+    Translate a MySQL database script without LOAD DATA statements to SQLite.
+    """
+    script = re.sub(r"""(?m)^--.*$""", '', script)
+    script = re.sub(r"""ALTER TABLE [^;]*;""", '', script)
+    script = re.sub(r""",\s*KEY \w+ \(\w+\)""", '', script)
+    script = script.replace('INT(11) NOT NULL AUTO_INCREMENT PRIMARY KEY', 'INTEGER PRIMARY KEY')
+    script = script.replace('INT(11)', 'INTEGER').replace('UNIQUE KEY', 'UNIQUE')
+    script = script.replace(' ENGINE=InnoDB DEFAULT CHARSET=utf8', '')
+    return re_literal.sub(lambda m: "'%s'" % unescape(m.group(1)), script)
+
+def loadScript(connection, path):
+    """
+    Run a MySQL database script in an SQLite database, loading the data files of its LOAD DATA statements from the directory of the script.
+    @type connection: L{sqlite3.Connection}
+    @param connection: The SQLite database.
+    @type path: L{str}
+    @param path: The path to the script.
+    """
+    with open(path, encoding='utf8') as f:
+        script = f.read()
+    loads = re_load.findall(script)
+    connection.executescript(toSQLite(re_load.sub('', script)))
+    for dataPath, table, columns in loads:
+        with open(os.path.join(os.path.dirname(path), dataPath), encoding='utf8', newline='') as f:
+            rows = [[unescape(value) for value in row] for row in csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE)]
+        columns = columns.split(',')
+        connection.executemany('INSERT INTO %s (%s) VALUES (%s)' % (table, ','.join(columns), ','.join('?' * len(columns))), rows)
+    connection.commit()
+
+def dumpTables(connection):
+    """
+    Get the rows of the tables of the exported database.
+    """
+    return [connection.execute('SELECT * FROM %s ORDER BY 1, 2' % table).fetchall() for table in ('Paper', 'Author', 'PaperAuthor')]
@@ -30,7 +30,10 @@ from testApp import oracle
 from app.user_interface import BiBlerApp
 from gui.app_interface import EntryListColumn
 from app.entry_type import EntryType
+from app.manager import ReferenceManager
 from utils import settings
+from utils.utils import Context
+from concurrent.futures import ThreadPoolExecutor
 
 
 class TestAdd(unittest.TestCase):
@@ -117,6 +120,50 @@ class TestAdd(unittest.TestCase):
         bibtex_quote = self.ui.getBibTeX(_id)
         self.assertEqual(bibtex_bracket, bibtex_quote, 'adding an entry in quotes does not parse correctly')
 
+    def testAddEntries(self):
+        entries = [oracle.valid_entry_full] + oracle.all_entries + oracle.all_invalid_entries + [oracle.valid_entry_full]
+        ids = []
+        for e in entries:
+            _id = self.ui.addEntry(e.getBibTeX())
+            if _id is not None:
+                ids.append(_id)
+        expected = [self.ui.getBibTeX(_id) for _id in ids]
+        ui = BiBlerApp()
+        ui.addEntry(oracle.valid_entry_full.getBibTeX())
+        ids = ui.addEntries(e.getBibTeX() for e in entries[1:])
+        self.assertEqual([ui.getBibTeX(_id) for _id in [ui.getAllEntries()[0][EntryListColumn.Id]] + ids], expected, 'entries not added as one by one.')
+        ui.undo()
+        self.assertEqual(ui.getEntryCount(), 1, 'adding entries at once not undone.')
+
+    def testAddEntriesInChunks(self):
+        entries = [oracle.valid_entry_full] * 5 + oracle.all_entries
+        ui = BiBlerApp()
+        expected = [ui.getBibTeX(_id) for _id in ui.addEntries(e.getBibTeX() for e in entries)]
+        chunkSize = ReferenceManager.CHUNK_SIZE
+        ReferenceManager.CHUNK_SIZE = 2
+        try:
+            ui = BiBlerApp()
+            ids = ui.addEntries(e.getBibTeX() for e in entries)
+        finally:
+            ReferenceManager.CHUNK_SIZE = chunkSize
+        self.assertEqual([ui.getBibTeX(_id) for _id in ids], expected, 'entries added in chunks differ.')
+        self.assertEqual(len(set(e[EntryListColumn.Entrykey] for e in ui.getAllEntries())), len(ids), 'keys not unique across chunks.')
+
+    def testAddInContexts(self):
+        entries = oracle.all_entries + oracle.all_invalid_entries
+        def add(allowInvalidEntries):
+            with Context():
+                ui = BiBlerApp()
+                settings.Preferences().allowInvalidEntries = allowInvalidEntries
+                ids = [ui.addEntry(e.getBibTeX()) for e in entries]
+                return ids, [ui.getBibTeX(_id) for _id in ids if _id is not None]
+        expected = [add(allow) for allow in [True, False]]
+        self.assertNotEqual(expected[0], expected[1], 'preferences of a context ignored.')
+        self.assertEqual(expected[0][0], list(range(1, len(entries) + 1)), 'ids of a context do not start from 1.')
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(add, [True, False] * 8))
+        self.assertEqual(results, expected * 8, 'entries added in concurrent contexts differ.')
+        self.assertFalse(settings.Preferences().allowInvalidEntries, 'preferences of a context leaked.')
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -33,6 +33,11 @@ from testApp.testPreview import TestPreview
 from testApp.testSearch import TestSearch
 from testApp.testSort import TestSort
 from testApp.testOpenImportValidateAll import TestOpenImportValidateAll
+from testApp.testParse import TestParse
+from testApp.testStorage import TestStorage
+from testApp.testExportSQL import TestExportSQL
+from testApp.testResponseCache import TestResponseCache
+from testApp.testUtils import TestUtils
 
 def test():
     suite = unittest.TestSuite()
@@ -44,6 +49,11 @@ def test():
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestSearch))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestSort))
     suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestOpenImportValidateAll))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestParse))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestStorage))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestExportSQL))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestResponseCache))
+    suite.addTest(unittest.TestLoader().loadTestsFromTestCase(TestUtils))
     return suite  
 
 def run_tests():
@@ -68,6 +68,26 @@ class TestDelete(unittest.TestCase):
         self.assertEqual(self.ui.getEntryCount(), 1, 'deleting an entry then adding it back did not undo the deletion.')
         self.assertTrue(e[EntryListColumn.Entrykey].endswith(e[EntryListColumn.Year]), 'deleting an entry then adding it back generated an incorrect key.')
 
+    def testDeleteUndoSortSanity(self):
+        ids = [self.ui.addEntry(e.getBibTeX()) for e in oracle.all_entry_types]
+        self.ui.sort(EntryListColumn.Title)
+        sortedIds = [e[EntryListColumn.Id] for e in self.ui.iterAllEntries()]
+        for _id in ids[::2]:
+            self.ui.deleteEntry(_id)
+        for _id in ids[::2]:
+            self.assertRaises(Exception, self.ui.getEntry, _id)
+        for _id in ids[1::2]:
+            self.assertEqual(self.ui.getEntry(_id)[EntryListColumn.Id], _id, 'remaining entry not found after deletion.')
+            self.ui.deleteEntry(_id)
+        for _ in ids:
+            self.ui.undo()
+        self.assertEqual([e[EntryListColumn.Id] for e in self.ui.iterAllEntries()], sortedIds, 'undoing deletions did not restore the order of the entries.')
+        self.ui.undo()
+        self.assertEqual([e[EntryListColumn.Id] for e in self.ui.iterAllEntries()], ids, 'undoing the sort did not restore the order of the entries.')
+        for _id in ids:
+            self.assertTrue(self.ui.deleteEntry(_id), 'entry not found after undoing.')
+        self.assertEqual(self.ui.getEntryCount(), 0, 'entries not deleted.')
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -49,6 +49,17 @@ class TestDuplicate(unittest.TestCase):
                 e = self.ui.getEntry(_id)
                 self.assertEqual(e[EntryListColumn.Entrykey], first_entry[EntryListColumn.Entrykey] + chr(ord('a') + i), 'incorrect key in duplicate of %s.' % entry)
 
+    def testDuplicateReusesKeyOfDeletedEntry(self):
+        first_id = self.ui.addEntry(oracle.valid_entry_full.getBibTeX())
+        key = self.ui.getEntry(first_id)[EntryListColumn.Entrykey]
+        ids = [self.ui.duplicateEntry(first_id) for i in range(3)]
+        self.ui.deleteEntry(ids[1])
+        _id = self.ui.duplicateEntry(first_id)
+        self.assertEqual(self.ui.getEntry(_id)[EntryListColumn.Entrykey], key + 'b', 'key of deleted duplicate not reused.')
+        self.ui.generateAllKeys()
+        keys = [e[EntryListColumn.Entrykey] for e in self.ui.iterAllEntries()]
+        self.assertEqual(keys, [key, key + 'a', key + 'c', key + 'b'], 'generating all keys changed unique keys.')
+
     def testDuplicateNonExistingEntry(self):
         _id = 0
         for entry in oracle.all_entries_all_fields:
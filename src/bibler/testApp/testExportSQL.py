@@ -0,0 +1,101 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module tests that the MySQL database scripts exported in each L{utils.settings.SQLExportMode} load the same database.
+'''
+import unittest
+import os.path
+import shutil
+import sqlite3
+import tempfile
+from testApp import oracle, mysql_shim
+from app.user_interface import BiBlerApp
+from utils import settings
+
+
+class TestExportSQL(unittest.TestCase):
+    def setUp(self):
+        self.ui = BiBlerApp()
+        settings.Preferences().openSnapshots = False
+        settings.Preferences().sqlBatchSize = 3
+        self.ui.openFile(oracle.warn_bibtex_file.getPath(), settings.ImportFormat.BIBTEX)
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        settings.Preferences().openSnapshots = True
+        settings.Preferences().sqlExportMode = settings.SQLExportMode.STATEMENTS
+        settings.Preferences().sqlBatchSize = 1000
+        shutil.rmtree(self.folder)
+
+    def testExportFileInAllModes(self):
+        expected = self.__loadFile(settings.SQLExportMode.STATEMENTS, 'library.sql', 'library_authors.sql', 'library_assignments.sql')
+        self.assertTrue(all(expected), 'the exported database is missing rows.')
+        self.assertEqual(self.__loadFile(settings.SQLExportMode.BATCH, 'library.sql', 'library_authors.sql', 'library_assignments.sql'), expected,
+                         'the database exported in INSERT statements of several rows differs.')
+        self.assertEqual(self.__loadFile(settings.SQLExportMode.LOAD_DATA, 'library.sql'), expected,
+                         'the database exported as data files to load differs.')
+
+    def testExportStringInAllModes(self):
+        expected = self.__loadString(settings.SQLExportMode.STATEMENTS)
+        for mode in [settings.SQLExportMode.BATCH, settings.SQLExportMode.LOAD_DATA]:
+            self.assertEqual(self.__loadString(mode), expected, 'the database exported as string in %s mode differs.' % mode)
+
+    def testExportSQLite(self):
+        expected = self.__loadFile(settings.SQLExportMode.STATEMENTS, 'library.sql', 'library_authors.sql', 'library_assignments.sql')
+        path = os.path.join(self.folder, 'library.sqlite')
+        self.assertTrue(self.ui.exportFile(path, settings.ExportFormat.SQLITE), 'export to SQLite failed.')
+        connection = sqlite3.connect(path)
+        try:
+            papers, authors, assignments = mysql_shim.dumpTables(connection)
+            self.assertEqual([paper[:-1] for paper in papers], expected[0], 'the papers exported to SQLite differ.')
+            self.assertEqual([authors, assignments], expected[1:], 'the authors exported to SQLite differ.')
+            title = papers[0][2]
+            word = max(title.split(), key=len).strip('{}.,:')
+            found = connection.execute('SELECT rowid FROM PaperSearch WHERE PaperSearch MATCH ?', ['"%s"' % word]).fetchall()
+            self.assertIn((papers[0][0],), found, 'the papers exported to SQLite cannot be searched.')
+        finally:
+            connection.close()
+
+    def __loadFile(self, mode, *names):
+        settings.Preferences().sqlExportMode = mode
+        folder = os.path.join(self.folder, mode.replace(' ', '_'))
+        os.mkdir(folder)
+        self.ui.exportFile(os.path.join(folder, 'library.sql'), settings.ExportFormat.SQL)
+        connection = sqlite3.connect(':memory:')
+        for name in names:
+            mysql_shim.loadScript(connection, os.path.join(folder, name))
+        return mysql_shim.dumpTables(connection)
+
+    def __loadString(self, mode):
+        settings.Preferences().sqlExportMode = mode
+        path = os.path.join(self.folder, 'string.sql')
+        with open(path, 'w', encoding='utf8') as f:
+            f.write(self.ui.exportString(settings.ExportFormat.SQL))
+        connection = sqlite3.connect(':memory:')
+        mysql_shim.loadScript(connection, path)
+        return mysql_shim.dumpTables(connection)
+
+
+if __name__ == "__main__":
+    unittest.main()
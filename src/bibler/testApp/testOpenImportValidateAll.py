@@ -25,9 +25,15 @@ Created on May 05, 2020
 This module tests the L{app.BiBlerApp.impex} method.
 '''
 import unittest
+import gc
+import os.path
+import shutil
+import tempfile
 from testApp import oracle
 from app.user_interface import BiBlerApp
 from app.entry import ValidationResult
+from app.impex import Importer, Snapshot
+from app.manager import ReferenceManager
 from utils import settings
 
 
@@ -36,9 +42,12 @@ class TestOpenImportValidateAll(unittest.TestCase):
         self.ui = BiBlerApp()
         settings.Preferences().allowInvalidEntries = True
         settings.Preferences().overrideKeyGeneration = True
+        settings.Preferences().openSnapshots = False
 
     def tearDown(self):
-        pass
+        settings.Preferences().importProcesses = 1
+        settings.Preferences().exportProcesses = 1
+        settings.Preferences().openSnapshots = True
 
     def testOpenBibTeXFileAndValidate(self):
         for bib_file in oracle.bibtex_files:
@@ -68,6 +77,131 @@ class TestOpenImportValidateAll(unittest.TestCase):
         self.assertEqual(validation['success'], oracle.warn_bibtex_file.getValidNumber() * 2, 'incorrect number of valid entries.')
         self.assertEqual(validation['warning'], oracle.warn_bibtex_file.getWarningNumber() * 2, 'incorrect number of entries with warnings.')
         self.assertEqual(validation['error'], oracle.warn_bibtex_file.getErrorNumber() * 2, 'incorrect number of entries with errors.')
+
+    def testImportStringWithSpecialBlocks(self):
+        data = '@comment{ignored @article{x, title = {y}} }\n@string{acm = {ACM}}\n@preamble{"\\newcommand{\\x}{y}"}\n'
+        data += oracle.valid_entry_full.getBibTeX() + ' ' + oracle.valid_article_all_fields.getBibTeX()
+        total = self.ui.importString(data, settings.ImportFormat.BIBTEX)
+        self.assertEqual(total, 2, 'incorrect number of imported entries.')
+        self.assertEqual(self.ui.getEntryCount(), 2, 'incorrect number of imported entries.')
+
+
+    def testOpenFileInParallel(self):
+        for bib_file in oracle.bibtex_files + [oracle.warn_error_endnote_file]:
+            self.ui.openFile(bib_file.getPath(), settings.ImportFormat.BIBTEX)
+            serial = [self.__withoutId(entry) for entry in self.ui.iterAllEntries()]
+            settings.Preferences().importProcesses = 2
+            result = self.ui.openFile(bib_file.getPath(), settings.ImportFormat.BIBTEX)
+            settings.Preferences().importProcesses = 1
+            self.assertTrue(result, 'opening %s in parallel failed.' % bib_file.getPath())
+            parallel = [self.__withoutId(entry) for entry in self.ui.iterAllEntries()]
+            self.assertEqual(parallel, serial, 'parallel import of %s differs from serial import.' % bib_file.getPath())
+
+    def testOpenFileFromSnapshot(self):
+        settings.Preferences().openSnapshots = True
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, 'library.bib')
+            shutil.copyfile(oracle.warn_error_endnote_file.getPath(), path)
+            self.ui.openFile(path, settings.ImportFormat.BIBTEX)
+            parsed = list(self.ui.iterAllEntries())
+            self.assertEqual(Snapshot(path, settings.ImportFormat.BIBTEX).load(ReferenceManager()), len(parsed), 'snapshot not saved.')
+            result = self.ui.openFile(path, settings.ImportFormat.BIBTEX)
+            self.assertTrue(result, 'opening %s from its snapshot failed.' % path)
+            self.assertEqual(list(self.ui.iterAllEntries()), parsed, 'entries opened from the snapshot differ.')
+            with open(path, 'a', encoding='utf8') as bib:
+                bib.write('\n' + oracle.valid_entry_full.getBibTeX())
+            self.ui.openFile(path, settings.ImportFormat.BIBTEX)
+            self.assertEqual(self.ui.getEntryCount(), len(parsed) + 1, 'outdated snapshot used.')
+        finally:
+            shutil.rmtree(folder)
+
+    def testOpenFileFromSnapshotWithOtherPreferences(self):
+        settings.Preferences().openSnapshots = True
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, 'library.bib')
+            with open(path, 'w', encoding='utf8') as bib:
+                bib.write('@article{k, author = {Jane Doe}, title = {T}, journal = {J}, year = {2020}, mycustom = {x}}\n')
+            self.ui.openFile(path, settings.ImportFormat.BIBTEX)
+            self.assertNotIn('mycustom', self.ui.getBibTeX(self.ui.getAllEntries()[0]['id']), 'non-standard field kept.')
+            settings.Preferences().allowNonStandardFields = True
+            self.ui.openFile(path, settings.ImportFormat.BIBTEX)
+            self.assertIn('mycustom', self.ui.getBibTeX(self.ui.getAllEntries()[0]['id']), 'snapshot of other preferences used.')
+            gc.disable()
+            try:
+                self.ui.openFile(path, settings.ImportFormat.BIBTEX)
+                self.assertFalse(gc.isenabled(), 'loading a snapshot enabled the garbage collector.')
+            finally:
+                gc.enable()
+        finally:
+            settings.Preferences().allowNonStandardFields = False
+            shutil.rmtree(folder)
+
+    def testExportInChunks(self):
+        folder = tempfile.mkdtemp()
+        try:
+            self.ui.openFile(oracle.warn_bibtex_file.getPath(), settings.ImportFormat.BIBTEX)
+            for exportFormat in [settings.ExportFormat.BIBTEX, settings.ExportFormat.CSV, settings.ExportFormat.HTML]:
+                expected = self.ui.exportString(exportFormat)
+                self.assertEqual(''.join(self.ui.iterExportString(exportFormat)), expected, 'exporting %s in chunks differs.' % exportFormat)
+            path = os.path.join(folder, 'library.bib')
+            self.ui.exportFile(path, settings.ExportFormat.BIBTEX)
+            with open(path, encoding='utf8') as exported:
+                self.assertEqual(exported.read(), self.ui.exportString(settings.ExportFormat.BIBTEX), 'exporting to a file differs.')
+        finally:
+            shutil.rmtree(folder)
+
+    def testImportStringInChunks(self):
+        chunkSize = Importer.CHUNK_SIZE
+        Importer.CHUNK_SIZE = 5
+        try:
+            for bib_file, importFormat in [(f, settings.ImportFormat.BIBTEX) for f in oracle.bibtex_files] + \
+                                          [(oracle.warn_error_endnote_file, settings.ImportFormat.ENDNOTE)]:
+                with open(bib_file.getPath(), encoding='utf8') as f:
+                    data = f.read()
+                ui = BiBlerApp()
+                total = ui.importString(data, importFormat)
+                expected = [self.__withoutId(entry) for entry in ui.iterAllEntries()]
+                ui = BiBlerApp()
+                ids = [entryId for chunk in ui.iterImportString(data, importFormat) for entryId in chunk]
+                self.assertEqual(len(ids), total, 'incorrect number of entries imported in chunks from %s.' % bib_file.getPath())
+                self.assertEqual(ids, [entry['id'] for entry in ui.iterAllEntries()], 'incorrect ids of the entries imported in chunks.')
+                self.assertEqual([self.__withoutId(entry) for entry in ui.iterAllEntries()], expected,
+                                 'importing %s in chunks differs.' % bib_file.getPath())
+                self.assertLess(ui.getUndoMemoryUsage(), len(data), 'memory of the imported string still reported.')
+                ui.undo()
+                self.assertEqual(ui.getEntryCount(), 0, 'undoing the import in chunks failed.')
+        finally:
+            Importer.CHUNK_SIZE = chunkSize
+
+    def testImportStringInReleasedChunks(self):
+        chunkSize = Importer.CHUNK_SIZE
+        Importer.CHUNK_SIZE = 5
+        try:
+            data = oracle.valid_entry_full.getBibTeX() * 12
+            ui = BiBlerApp()
+            ui.importString(data, settings.ImportFormat.BIBTEX)
+            expected = [self.__withoutId(entry) for entry in ui.iterAllEntries()]
+            ui = BiBlerApp()
+            released = []
+            for chunk in ui.iterImportString(data, settings.ImportFormat.BIBTEX, release=True):
+                self.assertEqual(ui.getEntryCount(), len(chunk), 'entries of the previous chunks not released.')
+                released.extend(self.__withoutId(ui.getEntry(entryId)) for entryId in chunk)
+            self.assertEqual(released, expected, 'importing in released chunks differs.')
+            self.assertEqual(ui.getEntryCount(), 0, 'entries of the last chunk not released.')
+            self.assertFalse(ui.undo(), 'import in released chunks can be undone.')
+        finally:
+            Importer.CHUNK_SIZE = chunkSize
+
+    def testExportHTMLInParallel(self):
+        self.ui.openFile(oracle.warn_bibtex_file.getPath(), settings.ImportFormat.BIBTEX)
+        serial = self.ui.exportString(settings.ExportFormat.HTML)
+        settings.Preferences().exportProcesses = 2
+        self.assertEqual(self.ui.exportString(settings.ExportFormat.HTML), serial, 'parallel export to HTML differs from serial export.')
+
+    def __withoutId(self, entry):
+        return {field: value for field, value in entry.items() if field != 'id'}
         
 
     #TODO: test other import formats
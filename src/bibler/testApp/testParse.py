@@ -0,0 +1,121 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module tests the L{app.bibtex_parser.BibTeXParser} engines.
+'''
+import unittest
+import io
+from testApp import oracle
+from app.bibtex_parser import BibTeXLexer, BibTeXParser
+from app.manager import ReferenceManager
+from utils import settings
+
+
+class TestParse(unittest.TestCase):
+    def setUp(self):
+        settings.Preferences().allowNonStandardFields = False
+
+    def tearDown(self):
+        settings.Preferences().parserEngine = settings.ParserEngine.TOKENIZER
+
+    def parse(self, bibtex, engine):
+        settings.Preferences().parserEngine = engine
+        return BibTeXParser(bibtex).parse()
+
+    def assertSameEntry(self, bibtex):
+        expected = self.parse(bibtex, settings.ParserEngine.REGEX)
+        observed = self.parse(bibtex, settings.ParserEngine.TOKENIZER)
+        self.assertEqual(observed.getEntryType(), expected.getEntryType(), 'incorrect entry type for %s.' % bibtex)
+        self.assertEqual(observed.getKey(), expected.getKey(), 'incorrect key for %s.' % bibtex)
+        self.assertEqual(observed.toBibTeX(), expected.toBibTeX(), 'incorrect fields for %s.' % bibtex)
+        self.assertEqual(observed.validate().value, expected.validate().value, 'incorrect validation for %s.' % bibtex)
+
+    def testParseValidBibTeXVariants(self):
+        for e in oracle.valid_bibtex_variants + oracle.valid_authors:
+            self.assertSameEntry(e.getBibTeX())
+
+    def testParseAllEntries(self):
+        for e in oracle.all_entries + oracle.all_entries_all_fields:
+            self.assertSameEntry(e.getBibTeX())
+
+    def testParseInvalidBibTeX(self):
+        for e in oracle.all_invalid_entry_types:
+            self.assertSameEntry(e.getBibTeX())
+
+    def testParseErroneousBibTeX(self):
+        for e in oracle.all_erroneous_entries:
+            self.assertRaises(Exception, self.parse, e.getBibTeX(), settings.ParserEngine.TOKENIZER)
+
+    def testParseQuotedValues(self):
+        bibtex_bracket = self.parse(oracle.valid_entry_bracket.getBibTeX(), settings.ParserEngine.TOKENIZER).toBibTeX()
+        bibtex_quote = self.parse(oracle.valid_entry_quote.getBibTeX(), settings.ParserEngine.TOKENIZER).toBibTeX()
+        self.assertEqual(bibtex_bracket, bibtex_quote, 'an entry in quotes does not parse correctly')
+
+    def testParseFormatsOnFirstAccess(self):
+        for e in oracle.valid_authors + oracle.all_entries_all_fields:
+            entry = self.parse(e.getBibTeX(), settings.ParserEngine.TOKENIZER)
+            for field in ('author', 'year'):
+                self.assertTrue(entry.getField(field).unformatted or entry.getField(field).isEmpty(),
+                                '%s formatted before access for %s.' % (field, e.getBibTeX()))
+            contributorsFirst = [str(c) for c in entry.getContributors()]
+            bibtexFirst = self.parse(e.getBibTeX(), settings.ParserEngine.TOKENIZER).toBibTeX()
+            self.assertEqual(entry.toBibTeX(), bibtexFirst, 'formatting depends on the first access for %s.' % e.getBibTeX())
+            self.assertEqual([str(c) for c in entry.getContributors()], contributorsFirst, 'contributors parsed twice for %s.' % e.getBibTeX())
+
+    def testParseWithoutBuildingContributors(self):
+        for e in oracle.valid_authors + oracle.all_entries_all_fields:
+            entry, _ = ReferenceManager.parseEntry(e.getBibTeX())
+            entry.getKey()
+            entry.getField('title').getValue()
+            author = entry.getField('author')
+            self.assertFalse(author.contributors, 'contributors built while parsing %s.' % e.getBibTeX())
+
+    def testParseKeepsCachedValues(self):
+        entry = self.parse(oracle.valid_entry_full.getBibTeX(), settings.ParserEngine.TOKENIZER)
+        title = entry.getField('title')
+        simple = title.getSimpleValue()
+        self.assertIs(entry.getField('title'), title, 'field caching its values not kept by the entry.')
+        self.assertEqual(entry.getField('title').simpleValue, simple, 'cached value lost.')
+        entry.setField('title', 'Another title')
+        self.assertEqual(entry.getField('title').getSimpleValue(), 'Another title', 'cached value not reset.')
+
+    def testParseRejectsIncorrectContributor(self):
+        with self.assertRaises(Exception, msg='an incorrect author name is accepted.'):
+            self.parse('@misc{k, author={Doe john}, title={T}, year={2020}}', settings.ParserEngine.TOKENIZER)
+
+    def testLexEntryHeaderAcrossChunks(self):
+        data = '@article{a, title={Unbalanced %s}\n  @book\n {b, title={B}}\n@misc(c, title={C})\n' % ('x' * 2 * BibTeXLexer.LOOKAHEAD)
+        expected = list(BibTeXLexer(io.StringIO(data)))
+        self.assertEqual(len(expected), 3, 'entry after an unbalanced entry not found.')
+        for chunkSize in range(1, len(data) + 1):
+            self.assertEqual(list(BibTeXLexer(io.StringIO(data), chunkSize)), expected, 'entries differ when read in chunks of %d.' % chunkSize)
+
+    def testParseNonStandardFields(self):
+        settings.Preferences().allowNonStandardFields = True
+        entry = self.parse(oracle.valid_entry_full.getBibTeX(), settings.ParserEngine.TOKENIZER)
+        self.assertFalse(entry.getField('author').isEmpty(), 'first field not parsed.')
+
+
+if __name__ == "__main__":
+    unittest.main()
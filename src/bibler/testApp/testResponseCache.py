@@ -0,0 +1,103 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+'''
+Created on Oct 18, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module tests the eviction and the expiry of the responses of the web service in the L{web.ResponseCache}.
+'''
+import unittest
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+import web
+from web import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def testEvictLeastRecentlyUsed(self):
+        cache = ResponseCache(2, 0)
+        asyncio.run(cache.put('a', 1))
+        asyncio.run(cache.put('b', 2))
+        self.assertEqual(asyncio.run(cache.get('a')), 1, 'response not cached.')
+        asyncio.run(cache.put('c', 3))
+        self.assertIsNone(asyncio.run(cache.get('b')), 'least recently used response not evicted.')
+        self.assertEqual(asyncio.run(cache.get('a')), 1, 'recently used response evicted.')
+        self.assertEqual(asyncio.run(cache.get('c')), 3, 'last response evicted.')
+        self.assertEqual(cache.getStatistics()['evictions'], 1, 'incorrect number of evictions.')
+
+    def testExpire(self):
+        cache = ResponseCache(2, 60, self.folder, 10)
+        asyncio.run(cache.put('a', 1))
+        cache.responses['a'] = (time.time() - 61, 1)
+        self.assertEqual(asyncio.run(cache.get('a')), 1, 'response not read from its file.')
+        self.assertEqual(cache.getStatistics()['disk_hits'], 1, 'response not read from its file.')
+        cache.responses.clear()
+        past = time.time() - 61
+        os.utime(os.path.join(self.folder, 'a.json'), (past, past))
+        self.assertIsNone(asyncio.run(cache.get('a')), 'expired response used.')
+        self.assertFalse(os.path.exists(os.path.join(self.folder, 'a.json')), 'file of the expired response not removed.')
+        statistics = cache.getStatistics()
+        self.assertEqual(statistics['expirations'], 2, 'incorrect number of expirations.')
+        self.assertEqual(statistics['disk_size'], 0, 'incorrect number of files.')
+
+    def testEvictOldestFiles(self):
+        cache = ResponseCache(0, 0, self.folder, 10)
+        now = time.time()
+        for i in range(10):
+            asyncio.run(cache.put(str(i), i))
+            os.utime(os.path.join(self.folder, '%d.json' % i), (now - 100 + i, now - 100 + i))
+        asyncio.run(cache.put('10', 10))
+        self.assertEqual(sorted(os.listdir(self.folder)), sorted('%d.json' % i for i in range(2, 11)), 'oldest files not evicted.')
+        self.assertEqual(cache.getStatistics()['disk_size'], 9, 'incorrect number of files.')
+        self.assertEqual(cache.getStatistics()['evictions'], 2, 'incorrect number of evictions.')
+        self.assertEqual(asyncio.run(ResponseCache(0, 0, self.folder, 10).get('10')), 10, 'files not shared.')
+
+    def testEvictFilesRemovedByAnotherProcess(self):
+        cache = ResponseCache(0, 0, self.folder, 2)
+        asyncio.run(cache.put('a', 1))
+        asyncio.run(cache.put('b', 2))
+        with mock.patch('os.remove', side_effect=FileNotFoundError):
+            asyncio.run(cache.put('c', 3))
+        self.assertEqual(cache.getStatistics()['evictions'], 0, 'files removed by another process counted.')
+        with mock.patch('os.path.getmtime', side_effect=FileNotFoundError):
+            asyncio.run(cache.put('d', 4))
+            self.assertIsNone(asyncio.run(cache.get('a')), 'file removed by another process used.')
+
+    def testRespondInPoolBeyondInlineSize(self):
+        with mock.patch.object(web, 'cache', ResponseCache(0, 0)), \
+             mock.patch.object(web.pool, 'run', mock.AsyncMock(return_value='pooled')):
+            self.assertEqual(asyncio.run(web.respond(len, 'a' * web.pool.inlineSize)), web.pool.inlineSize,
+                             'short BibTeX not handled in the event loop.')
+            self.assertEqual(asyncio.run(web.respond(len, 'a' * (web.pool.inlineSize + 1))), 'pooled',
+                             'long BibTeX not handled in the pool.')
+
+
+if __name__ == "__main__":
+    unittest.main()
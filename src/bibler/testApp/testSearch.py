@@ -35,7 +35,7 @@ class TestSearch(unittest.TestCase):
         self.ui = BiBlerApp()
 
     def tearDown(self):
-        pass
+        Preferences().searchIndex = True
 
     def testSearchRegexInEmptyDB(self):
         Preferences().searchRegex = True
@@ -101,6 +101,47 @@ class TestSearch(unittest.TestCase):
         self.assertTrue(total >= 0, 'search failed.')
         self.assertEqual(len(self.ui.getSearchResult()), self.ui.getEntryCount(), 'incorrect number of entries found.')
 
+    def testSearchIndexMatchesScan(self):
+        for e in oracle.all_entries_all_fields:
+            self.ui.addEntry(e.getBibTeX())
+        queries = list(oracle.search_all_entries_all_fields) + ['', 'e', 'in th', 'ndi', 'oftwar', 'xqz', '{', 'de?sign', 'sy+stem', '^a', '(model|code)', '[0-9]{4}']
+        for regex in [False, True]:
+            Preferences().searchRegex = regex
+            for query in queries:
+                Preferences().searchIndex = False
+                self.ui.search(query)
+                expected = self.__getSearchResultIds()
+                Preferences().searchIndex = True
+                self.ui.search(query)
+                self.assertEqual(self.__getSearchResultIds(), expected, 'indexed search of %s differs from full search.' % query)
+
+    def testSearchIndexAfterUpdateAndDelete(self):
+        Preferences().searchRegex = False
+        ids = [self.ui.addEntry(e.getBibTeX()) for e in oracle.all_entries_all_fields]
+        self.ui.search('landin')
+        self.ui.deleteEntry(ids[0])
+        self.ui.updateEntry(ids[1], oracle.valid_entry_full.getBibTeX())
+        self.ui.addEntry(oracle.valid_entry_full.getBibTeX())
+        self.ui.search('landin')
+        expected = self.__getSearchResultIds()
+        Preferences().searchIndex = False
+        self.ui.search('landin')
+        self.assertEqual(expected, self.__getSearchResultIds(), 'index not updated.')
+        self.assertIn(ids[1], expected, 'updated entry not found.')
+
+    def testSearchAfterUpdateField(self):
+        Preferences().searchRegex = False
+        for index in [False, True]:
+            Preferences().searchIndex = index
+            _id = self.ui.addEntry(oracle.valid_entry_full.getBibTeX())
+            self.assertEqual(self.ui.search('landin'), 1, 'entry not found.')
+            self.ui.updateEntryField(_id, None, 'title', 'M{\\"o}bius strips')
+            self.assertEqual(self.ui.search('mobius'), 1, 'updated field not found.')
+            self.ui.deleteEntry(_id)
+
+    def __getSearchResultIds(self):
+        return [e['id'] for e in self.ui.getSearchResult()]
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
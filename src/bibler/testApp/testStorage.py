@@ -0,0 +1,159 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+
+'''
+Created on Oct 17, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module tests that the storage engines of the L{app.manager.ReferenceManager} behave the same.
+'''
+import gc
+import os
+import tempfile
+import unittest
+from testApp import oracle
+from app.user_interface import BiBlerApp
+from gui.app_interface import EntryListColumn
+from utils import settings
+
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        settings.Preferences().openSnapshots = False
+
+    def tearDown(self):
+        settings.Preferences().storageEngine = settings.StorageEngine.MEMORY
+        settings.Preferences().storagePath = ''
+        settings.Preferences().openSnapshots = True
+        settings.Preferences().searchRegex = False
+
+    def testOpenFile(self):
+        for bib_file in oracle.bibtex_files:
+            self.assertEqual(self.__run(settings.StorageEngine.SQLITE, self.__open, bib_file),
+                             self.__run(settings.StorageEngine.MEMORY, self.__open, bib_file),
+                             'opening %s differs.' % bib_file.getPath())
+
+    def testSearchAndSort(self):
+        self.assertEqual(self.__run(settings.StorageEngine.SQLITE, self.__searchAndSort),
+                         self.__run(settings.StorageEngine.MEMORY, self.__searchAndSort),
+                         'search or sort differs.')
+
+    def testEditAndUndo(self):
+        self.assertEqual(self.__run(settings.StorageEngine.SQLITE, self.__editAndUndo),
+                         self.__run(settings.StorageEngine.MEMORY, self.__editAndUndo),
+                         'edition differs.')
+
+    def testImportSortAndUndo(self):
+        self.assertEqual(self.__run(settings.StorageEngine.SQLITE, self.__importSortAndUndo),
+                         self.__run(settings.StorageEngine.MEMORY, self.__importSortAndUndo),
+                         'undoing an import or a sort differs.')
+
+    def testDeleteAndUndo(self):
+        self.assertEqual(self.__run(settings.StorageEngine.SQLITE, self.__deleteAndUndo),
+                         self.__run(settings.StorageEngine.MEMORY, self.__deleteAndUndo),
+                         'deleting entries one by one differs.')
+
+    def testSharedPath(self):
+        with tempfile.TemporaryDirectory() as path:
+            settings.Preferences().storageEngine = settings.StorageEngine.SQLITE
+            settings.Preferences().storagePath = path
+            ui1 = BiBlerApp()
+            ui1.openFile(oracle.warn_bibtex_file.getPath(), settings.ImportFormat.BIBTEX)
+            entries = ui1.getAllEntries()
+            ui2 = BiBlerApp()
+            ui2.addEntry(oracle.valid_entry_full.getBibTeX())
+            self.assertEqual(ui1.getAllEntries(), entries, 'the entries of the first manager changed.')
+            self.assertEqual(len(ui2.getAllEntries()), 1, 'the second manager holds the entries of the first.')
+            self.assertEqual(len(os.listdir(path)), 2, 'the managers do not have their own database.')
+            del ui1, ui2
+            gc.collect()
+            self.assertEqual(os.listdir(path), [], 'the databases are not deleted with their managers.')
+
+    def __run(self, engine, scenario, *args):
+        settings.Preferences().storageEngine = engine
+        ui = BiBlerApp()
+        ui.openFile(oracle.warn_bibtex_file.getPath(), settings.ImportFormat.BIBTEX)
+        observations = []
+        scenario(ui, observations, *args)
+        observations.append(ui.getAllEntries())
+        return observations
+
+    def __open(self, ui, observations, bib_file):
+        observations.append(ui.openFile(bib_file.getPath(), settings.ImportFormat.BIBTEX))
+        observations.append(ui.validateAllEntries())
+
+    def __searchAndSort(self, ui, observations):
+        for e in oracle.all_entries_all_fields:
+            ui.addEntry(e.getBibTeX())
+        queries = list(oracle.search_all_entries_all_fields) + ['', 'e', 'in th', '{', 'de?sign', '^$', '(model|code)']
+        for regex in [False, True]:
+            settings.Preferences().searchRegex = regex
+            for query in queries:
+                observations.append(ui.search(query))
+                observations.append(ui.getSearchResult())
+        for column in EntryListColumn.list() + ['xyz']:
+            for reverse in [False, True]:
+                observations.append(ui.sort(column, reverse))
+                observations.append(ui.getAllEntries())
+                observations.append(ui.getSearchResult())
+        ui.undo()
+
+    def __editAndUndo(self, ui, observations):
+        ids = [e['id'] for e in ui.getAllEntries()]
+        observations.append(ui.search('a'))
+        observations.append(ui.deleteEntry(ids[1]))
+        observations.append(ui.updateEntry(ids[2], oracle.valid_entry_full.getBibTeX()))
+        observations.append(ui.updateEntryField(ids[3], None, 'title', 'M{\\"o}bius strips'))
+        observations.append(ui.duplicateEntry(ids[3]))
+        observations.append(ui.getAllEntries())
+        ui.undo()
+        ui.undo()
+        observations.append(ui.getBibTeX(ids[3]))
+        ui.undo()
+        ui.undo()
+        observations.append(ui.generateAllKeys())
+        observations.append(ui.getSearchResult())
+
+    def __deleteAndUndo(self, ui, observations):
+        ids = [e['id'] for e in ui.getAllEntries()]
+        for entryId in ids[::2]:
+            observations.append(ui.deleteEntry(entryId))
+        observations.append(ui.getAllEntries())
+        ui.undo()
+        ui.undo()
+        observations.append(ui.getAllEntries())
+        observations.append(ui.deleteEntry(ids[1]))
+        ui.undo()
+        observations.append(ui.duplicateEntry(ids[-1]))
+
+    def __importSortAndUndo(self, ui, observations):
+        before = ui.getAllEntries()
+        ui.search('a')
+        observations.append(ui.importFile(oracle.warn_bibtex_file.getPath(), settings.ImportFormat.BIBTEX))
+        observations.append(ui.sort(EntryListColumn.Title))
+        observations.append(ui.getSearchResult())
+        ui.undo()
+        observations.append(ui.getAllEntries())
+        ui.undo()
+        observations.append(ui.getAllEntries() == before)
+
+
+if __name__ == "__main__":
+    unittest.main()
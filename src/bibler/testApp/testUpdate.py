@@ -120,6 +120,44 @@ class TestUpdate(unittest.TestCase):
             self.assertTrue(result1 and result2, 'modifying %s back to itself did not retain changes.' % old_entry)
             self.assertEqual(self.ui.getEntryCount(), self.total, 'number of entries wrongly changed.')
 
+    def testUpdateUndoHistoryMemory(self):
+        memory = self.ui.getUndoMemoryUsage()
+        i = self._ids[0]
+        self.ui.updateEntry(i, oracle.valid_entry_full.getBibTeX())
+        self.assertGreater(self.ui.getUndoMemoryUsage(), memory, 'memory held to undo an update not reported.')
+        try:
+            settings.Preferences().undoHistoryMemory = self.ui.getUndoMemoryUsage()
+            for _ in range(10):
+                self.ui.updateEntry(i, oracle.valid_entry_full.getBibTeX())
+            self.assertLessEqual(self.ui.getUndoMemoryUsage(), settings.Preferences().undoHistoryMemory, 'undo history not bounded.')
+            while self.ui.hasUndoableActionLeft():
+                self.ui.undo()
+            self.assertEqual(self.ui.getUndoMemoryUsage(), 0, 'memory of undone actions still reported.')
+            self.assertEqual(self.ui.getEntryCount(), self.total, 'undoing the remaining actions removed entries.')
+        finally:
+            settings.Preferences().undoHistoryMemory = 64 * 1024 * 1024
+
+    def testUpdateInvalidatesRenderCache(self):
+        i = self._ids[0]
+        preview, bibtex = self.ui.previewEntry(i), self.ui.getBibTeX(i)
+        self.assertEqual((self.ui.previewEntry(i), self.ui.getBibTeX(i)), (preview, bibtex), 'cached rendering differs.')
+        self.assertEqual(self.ui.getRenderCacheStatistics()['hits'], 2, 'rendering not cached.')
+        self.ui.updateEntryField(i, None, 'title', 'M{\\"o}bius strips')
+        self.assertIn('bius strips', self.ui.previewEntry(i), 'preview not rendered again after updating a field.')
+        self.assertIn('bius strips', self.ui.getBibTeX(i), 'BibTeX not rendered again after updating a field.')
+        self.ui.updateEntry(i, oracle.valid_entry_full.getBibTeX())
+        self.assertNotIn('bius strips', self.ui.getBibTeX(i), 'BibTeX not rendered again after an update.')
+        self.ui.undo()
+        self.assertIn('bius strips', self.ui.getBibTeX(i), 'BibTeX not rendered again after undoing an update.')
+        style = settings.Preferences().bibStyle
+        try:
+            settings.Preferences().bibStyle = settings.BibStyle.ACM if style != settings.BibStyle.ACM else settings.BibStyle.DEFAULT
+            misses = self.ui.getRenderCacheStatistics()['misses']
+            self.ui.previewEntry(i)
+            self.assertEqual(self.ui.getRenderCacheStatistics()['misses'], misses + 1, 'preview not rendered again in another style.')
+        finally:
+            settings.Preferences().bibStyle = style
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+'''
+BiBler - A software to manage references of scientific articles using BibTeX.
+Copyright (C) 2018  Eugene Syriani
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+'''
+'''
+Created on Oct 18, 2026
+.. moduleauthor:: Eugene Syriani
+
+.. versionadded:: 1.5
+
+This module tests the translation of TeX sequences of L{utils.utils.Utils}.
+'''
+import unittest
+import random
+from utils.utils import Utils
+
+
+class TestUtils(unittest.TestCase):
+    edge_cases = ['{\\&}', '\\&', '{\\\\&}', '\\\\ss', '\\{\\ss}', '{\\ss}', '\\ss', '\\o{\\&}', '{\\&}\\&',
+                  "\\'{\\o}", '{\\"\\o}', "\\`{\\'{a}}", "\\'{\\`{a}}", "{\\'{\\'{E}}}", '\\c{c}--\\r{a}', '---', '\\O\\o',
+                  "Schr{\\\"o}dinger \\& M\\\"{u}ller", 'no TeX', '']
+
+    def testTex2SimpleAsLoop(self):
+        for s in self.edge_cases + self.__randomStrings():
+            self.assertEqual(Utils().tex2simple(s), self.__loop(Utils().tex_to_simple, s), 'tex2simple of %s differs from the loop.' % s)
+
+    def testTex2HTMLAsLoop(self):
+        for s in self.edge_cases + self.__randomStrings():
+            self.assertEqual(Utils().tex2html(s), self.__loop(Utils().tex_to_html, s), 'tex2html of %s differs from the loop.' % s)
+
+    def __loop(self, table, s):
+        # The former translation, replacing each sequence in turn
+        for tex in table:
+            s = s.replace(tex, table[tex])
+        return s
+
+    def __randomStrings(self):
+        parts = ['\\', '{', '}', '}}', '&', "'", '`', '"', '^', '~', '-', 'c', 'r', 'a', 'o', 'O', 's', 'ss', ' ',
+                 '\\o', '\\&', '{\\ss}', "\\'{", '\\`{', '{\\"', '{\\c']
+        generator = random.Random(0)
+        return [''.join(generator.choice(parts) for _ in range(generator.randint(1, 12))) for _ in range(20000)]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,7 +22,7 @@ Created on Jan 13, 2014
 @version: 0.7
 
 This is module represents the settings for BiBler.
-@group Enumerations: BibStyle, ExportFormat, ImportFormat
+@group Enumerations: BibStyle, ExportFormat, ImportFormat, ParserEngine
 '''
 
 import os
@@ -65,6 +65,10 @@ class ExportFormat:
     """
     .sql extension representing a MySQL database.
     """
+    SQLITE = 'sqlite'
+    """
+    .sqlite extension representing an SQLite database.
+    """
 
 class BibStyle:
     """
@@ -77,11 +81,69 @@ class BibStyle:
     def getAllStyles():
         return sorted([BibStyle.ACM, BibStyle.DEFAULT])
 
+class ParserEngine:
+    """
+    Enumerates the available BibTeX parser engines.
+    """
+    REGEX = 'regex'
+    """
+    Searches the entry with a regular expression for every field.
+    """
+    TOKENIZER = 'tokenizer'
+    """
+    Reads the entry in a single left-to-right scan.
+    """
+    
+    @staticmethod
+    def getAllEngines():
+        return sorted([ParserEngine.REGEX, ParserEngine.TOKENIZER])
+
+class StorageEngine:
+    """
+    Enumerates the available storage engines of the entries.
+    """
+    MEMORY = 'memory'
+    """
+    Keeps the entries as objects in memory.
+    """
+    SQLITE = 'sqlite'
+    """
+    Keeps the entries in an SQLite database and only creates the objects of the entries in use.
+    """
+    
+    @staticmethod
+    def getAllEngines():
+        return sorted([StorageEngine.MEMORY, StorageEngine.SQLITE])
+
+class SQLExportMode:
+    """
+    Enumerates the ways the rows of the MySQL database script are written.
+    """
+    STATEMENTS = 'statements'
+    """
+    One INSERT statement per row.
+    """
+    BATCH = 'batch'
+    """
+    INSERT statements of several rows each (see L{Preferences.sqlBatchSize}).
+    """
+    LOAD_DATA = 'load data'
+    """
+    Tab-separated data files next to the script, loaded by LOAD DATA LOCAL INFILE statements.
+    """
+    
+    @staticmethod
+    def getAllModes():
+        return sorted([SQLExportMode.BATCH, SQLExportMode.LOAD_DATA, SQLExportMode.STATEMENTS])
+
 class Preferences(object, metaclass=utils.Singleton):
     """
     Holds the preferences of this BiBler instance, such as:
     the bibliography style and the default directory.
+    Each L{Context<utils.utils.Context>} has its own preferences.
     """
+    contextual = True
+    
     def __init__(self):
         self.bibStyle = BibStyle.DEFAULT
         """
@@ -106,4 +168,52 @@ class Preferences(object, metaclass=utils.Singleton):
         self.searchRegex = False
         """
         Allows regular expressions in search query.
-        """
\ No newline at end of file
+        """
+        self.searchIndex = True
+        """
+        Searches through a full-text index of the entries, built on the first search.
+        """
+        self.parserEngine = ParserEngine.TOKENIZER
+        """
+        The engine used to parse BibTeX entries.
+        """
+        self.openSnapshots = True
+        """
+        Opens files from the snapshot of their entries saved the last time they were opened, if they have not changed since.
+        """
+        self.importProcesses = 1
+        """
+        The number of processes that parse the entries of an imported file in parallel. Imports serially if 1.
+        """
+        self.exportProcesses = 1
+        """
+        The number of processes that render the entries exported to HTML in parallel. Exports serially if 1.
+        """
+        self.renderCacheSize = 1024
+        """
+        The number of previews and BibTeX strings of entries kept once rendered. Renders them every time if 0.
+        """
+        self.sqlExportMode = SQLExportMode.STATEMENTS
+        """
+        The way the rows of the MySQL database script are written.
+        """
+        self.sqlBatchSize = 1000
+        """
+        The number of rows of each INSERT statement in the L{SQLExportMode.BATCH} mode.
+        """
+        self.storageEngine = StorageEngine.MEMORY
+        """
+        The engine storing the entries.
+        """
+        self.storagePath = ''
+        """
+        The directory of the database files of the SQLite storage engine, one per reference manager and deleted with it. A temporary database is used if empty.
+        """
+        self.undoHistoryLength = 0
+        """
+        The number of actions that can be undone. Unlimited if 0.
+        """
+        self.undoHistoryMemory = 64 * 1024 * 1024
+        """
+        The number of bytes the actions that can be undone may hold. The oldest actions are forgotten beyond it, except the last one. Unlimited if 0.
+        """
@@ -23,10 +23,14 @@ Created on Jan 13, 2014
 
 This module contains utility classes and functions. 
 '''
+import contextvars
+import re
+import sys
 
 class Singleton(type):
     """
     Meta-class to turn a class into a singleton.
+    A class setting C{contextual} to True has instead one instance in each active L{Context}, and one outside of them.
     """
     def __init__(self, name, bases, _dict):
         super(Singleton, self).__init__(name, bases, _dict)
@@ -34,10 +38,66 @@ class Singleton(type):
     
     def __call__(self, *args, **kw):
         # called whenever a function (or class) is called
+        if getattr(self, 'contextual', False):
+            context = Context.getCurrent()
+            if context is not None:
+                return context.getInstance(self, *args, **kw)
         if self.instance is None:
             self.instance = super(Singleton, self).__call__(*args, **kw)
         return self.instance
 
+class Context(object):
+    """
+    The instances of the contextual L{Singleton} classes, such as the preferences and the generator of entry ids, used by one task.
+    While a context is active in a thread or an asyncio task, these classes give their instance in the context, created on first use,
+    so that concurrent tasks, like the requests of the web service, do not share them.
+    The other singleton classes keep their single instance.
+    """
+    __current = contextvars.ContextVar('context', default=None)
+    
+    def __init__(self):
+        self.instances = {}
+        """
+        The instance of each contextual class.
+        """
+        self.__tokens = []
+    
+    def __enter__(self):
+        self.__tokens.append(Context.__current.set(self))
+        return self
+    
+    def __exit__(self, *exc_info):
+        Context.__current.reset(self.__tokens.pop())
+    
+    def getInstance(self, cls, *args, **kw):
+        """
+        Get the instance of a class in this context, creating it if needed.
+        @type cls: L{Singleton}
+        @param cls: The class.
+        @return: The instance.
+        """
+        instance = self.instances.get(cls)
+        if instance is None:
+            instance = self.instances[cls] = super(Singleton, cls).__call__(*args, **kw)
+        return instance
+    
+    def run(self, function, *args, **kw):
+        """
+        Call a function in this context, for example in a worker thread.
+        @return: The result of the function.
+        """
+        with self:
+            return function(*args, **kw)
+    
+    @staticmethod
+    def getCurrent():
+        """
+        Get the context active in the current thread or asyncio task.
+        @rtype: L{Context}
+        @return: The context, L{None} if none is active.
+        """
+        return Context.__current.get()
+
 class Utils(object, metaclass=Singleton):
     """
     Utility class offering helpful functions.
@@ -132,6 +192,7 @@ class Utils(object, metaclass=Singleton):
             '\u03b2':  '$\\beta$',
             '\u221e':  '$\infty$'
         }
+        self.unicode_to_tex = str.maketrans(self.funnychars_to_latex)
     
         self.tex_chars = ["{\\c%s}","{\\r%s}","{\\'%s}","{\\`%s}","{\\\"%s}","{\\^%s}","{\\~%s}",
                           "\\c{%s}","\\r{%s}","\\'{%s}","\\`{%s}","\\\"{%s}","\\^{%s}","\\~{%s}"]
@@ -140,6 +201,7 @@ class Utils(object, metaclass=Singleton):
         self.tex_to_simple = {}
         self.tex_to_simple["{\\ss}"] = 'ss'
         self.tex_to_simple["\\o"] = 'o'
+        self.tex_to_simple_specials = list(self.tex_to_simple)
         for i in self.alphabet_ordinals():
             for c in self.tex_chars:
                 self.tex_to_simple[c % chr(i)] = '%s' % chr(i)
@@ -152,9 +214,38 @@ class Utils(object, metaclass=Singleton):
         self.tex_to_html["\\o"] = '&oslash;'
         self.tex_to_html["\\O"] = '&Oslash;'
         self.tex_to_html['--'] = '&#8211;'
+        self.tex_to_html_specials = list(self.tex_to_html)
         for i in self.alphabet_ordinals():
             for c in range(len(self.tex_chars)):
                 self.tex_to_html[self.tex_chars[c] % chr(i)] = self.html_chars[c] % chr(i)
+        
+        # Any accented letter, at every position so that none is hidden by another
+        self.re_tex_accent = re.compile(r"""(?=\{\\[cr'`"^~]([A-Za-z])\}|\\[cr'`"^~]\{([A-Za-z])\})""")
+    
+    def __translate(self, s, table, specials):
+        """
+        Replace the TeX sequences of a translation table exactly as replacing each of them in turn, in the order of the table.
+        The special sequences come first: they are replaced one after the other, as replacing one may form or hide another.
+        Then only the accents of the letters found are replaced: an accent can only be formed by replacing another accent of the same letter.
+        :param s: A string.
+        :type s: str
+        :param table: A dictionary from sequences to their translation, the special ones first and then the accents of each letter.
+        :type table: dict
+        :param specials: The special sequences, in the order of the table.
+        :type specials: list
+        :returns: str -- The converted string.
+        """
+        for tex in specials:
+            if tex in s:
+                s = s.replace(tex, table[tex])
+        letters = {m.group(1) or m.group(2) for m in self.re_tex_accent.finditer(s)}
+        # The uppercase letters come first, as in the table
+        for letter in sorted(letters):
+            for c in self.tex_chars:
+                tex = c % letter
+                if tex in s:
+                    s = s.replace(tex, table[tex])
+        return s
     
     def alphabet_ordinals(self):
         """
@@ -179,7 +270,7 @@ class Utils(object, metaclass=Singleton):
         :type s: str
         :returns: str -- The converted string.
         """
-        return s.translate(str.maketrans(self.funnychars_to_latex))
+        return s.translate(self.unicode_to_tex)
     
     def tex2simple(self, s):
         """
@@ -188,10 +279,9 @@ class Utils(object, metaclass=Singleton):
         :type s: str
         :returns: str -- The converted string.
         """
-        for tex in self.tex_to_simple:
-            s = s.replace(tex, self.tex_to_simple[tex])
-        s.replace('^','').replace('$','').replace('_','')
-        return s
+        if '\\' not in s:
+            return s
+        return self.__translate(s, self.tex_to_simple, self.tex_to_simple_specials)
     
     def tex2html(self, s):
         """
@@ -200,9 +290,22 @@ class Utils(object, metaclass=Singleton):
         :type s: str
         :returns: str -- The converted string.
         """
-        for tex in self.tex_to_html:
-            s = s.replace(tex, self.tex_to_html[tex])
-        return s
+        if '\\' not in s and '--' not in s:
+            return s
+        return self.__translate(s, self.tex_to_html, self.tex_to_html_specials)
+    
+    def sizeOf(self, value):
+        """
+        Estimates the memory held by a value made of strings, numbers and containers of them.
+        :param value: The value.
+        :returns: int -- The number of bytes.
+        """
+        size = sys.getsizeof(value)
+        if isinstance(value, (list, tuple, set, frozenset)):
+            size += sum(self.sizeOf(item) for item in value)
+        elif isinstance(value, dict):
+            size += sum(self.sizeOf(k) + self.sizeOf(v) for k, v in value.items())
+        return size
     
     def sort_dict_by_key(self, d, ascending=True):
         """
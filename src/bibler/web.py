@@ -23,28 +23,52 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 """
 
+import asyncio
+import hashlib
 import json
 import os
 import sys
 import tempfile
 import time
 import urllib.parse
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
 
-from fastapi import FastAPI
+from typing import List
+
+from fastapi import Body, FastAPI, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 
 from app.user_interface import BiBlerApp
 from gui.app_interface import EntryListColumn
-from utils.settings import ExportFormat, ImportFormat
+from utils.settings import ExportFormat, ImportFormat, Preferences, StorageEngine
+from utils.utils import Context
+
+
+def getPreferences():
+    """
+    Returns the preferences of the context of the request (see ContextMiddleware), as the web service uses them.
+    """
+    preferences = Preferences()
+    preferences.overrideKeyGeneration = True
+    preferences.storageEngine = StorageEngine.MEMORY
+    return preferences
 
 
 def getBiblerApp():
     """
-    Returns a BiBlerApp instance
+    Returns a new BiBlerApp instance, holding the entries and the history of one request or task only.
+    It has the preferences and the entry ids of the context of the request (see ContextMiddleware).
+    Its entries are kept in memory, where creating it costs a few microseconds, much less than parsing one entry.
     """
+    preferences = getPreferences()
     biblerapp = BiBlerApp()
-    biblerapp.preferences.overrideKeyGeneration = True
+    biblerapp.preferences = preferences
     return biblerapp
 
 
@@ -74,13 +98,505 @@ def entryToJSON(entry, biblerapp):
     return json
 
 
+class ContextMiddleware:
+    """
+    Run each request in its own Context, so that concurrent requests do not share
+    their preferences and entry ids, and the ids of each request start from 1.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        with Context():
+            await self.app(scope, receive, send)
+
+
+def runInContext(function, *args):
+    """
+    Run a function in a new Context, in a worker of the WorkerPool.
+    """
+    with Context():
+        return function(*args)
+
+
+class WorkerPool:
+    """
+    A bounded pool of threads, or of processes, running the CPU-bound work of the requests
+    so that it does not block the event loop, and the fast requests stay responsive.
+    At most `workers` tasks run at once and at most `queueDepth` more wait: further requests are rejected with 503.
+    The work on BibTeX strings of at most `inlineSize` characters is fast enough to run in the event loop.
+    Configured with the environment variables BIBLER_WORKERS (default 4), BIBLER_QUEUE_DEPTH (default 32),
+    BIBLER_POOL (thread by default, or process) and BIBLER_INLINE_SIZE (default 4096).
+    """
+    def __init__(self, workers, queueDepth, processes=False, inlineSize=4096):
+        self.workers = workers
+        self.queueDepth = queueDepth
+        self.processes = processes
+        self.inlineSize = inlineSize
+        self.pending = 0
+        self.executor = None
+        self.streamExecutor = None
+
+    @staticmethod
+    def fromEnvironment():
+        return WorkerPool(int(os.environ.get("BIBLER_WORKERS", 4)), int(os.environ.get("BIBLER_QUEUE_DEPTH", 32)),
+                          os.environ.get("BIBLER_POOL", "thread") == "process", int(os.environ.get("BIBLER_INLINE_SIZE", 4096)))
+
+    async def run(self, function, *args):
+        """
+        Run a function with its arguments in the pool.
+        :return: The result of the function.
+        :raises HTTPException: If the queue is full.
+        """
+        if self.pending >= self.workers + self.queueDepth:
+            raise HTTPException(status_code=503, detail="Too many requests in progress.", headers={"Retry-After": "1"})
+        if self.executor is None:
+            self.executor = (ProcessPoolExecutor if self.processes else ThreadPoolExecutor)(self.workers)
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, runInContext, function, *args)
+        finally:
+            self.pending -= 1
+
+    async def runBatch(self, function, items):
+        """
+        Run a function on the items split in chunks, one per worker of the pool.
+        :return: The results of the function on the chunks, concatenated in the order of the items.
+        :raises HTTPException: If the queue cannot take all the chunks.
+        """
+        size = max(1, -(-len(items) // self.workers))
+        chunks = [items[i:i + size] for i in range(0, len(items), size)]
+        if self.pending + len(chunks) > self.workers + self.queueDepth:
+            raise HTTPException(status_code=503, detail="Too many requests in progress.", headers={"Retry-After": "1"})
+        results = await asyncio.gather(*[self.run(function, chunk) for chunk in chunks])
+        return [result for chunk in results for result in chunk]
+
+    def stream(self, function, *args):
+        """
+        Run a generator function with its arguments in the pool, in a Context of its own.
+        The stream holds a worker until it ends. A generator cannot be sent to another process,
+        so with a pool of processes, streams run in a pool of as many threads.
+        :return: An asynchronous generator of the items generated, each generated in a worker when the previous one is consumed.
+        :raises HTTPException: If the queue is full.
+        """
+        if self.pending >= self.workers + self.queueDepth:
+            raise HTTPException(status_code=503, detail="Too many requests in progress.", headers={"Retry-After": "1"})
+        if not self.processes:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.workers)
+            executor = self.executor
+        else:
+            if self.streamExecutor is None:
+                self.streamExecutor = ThreadPoolExecutor(self.workers)
+            executor = self.streamExecutor
+        # Counted once admitted, and released when the stream ends or, if it never starts, once it is collected with its context
+        self.pending += 1
+        context = Context()
+        release = weakref.finalize(context, self.__release)
+        return self.__iterate(executor, context, release, function, *args)
+
+    def __release(self):
+        self.pending -= 1
+
+    async def __iterate(self, executor, context, release, function, *args):
+        try:
+            loop = asyncio.get_running_loop()
+            iterator = await loop.run_in_executor(executor, context.run, function, *args)
+            while True:
+                item = await loop.run_in_executor(executor, context.run, next, iterator, None)
+                if item is None:
+                    break
+                yield item
+        finally:
+            release()
+
+    def shutdown(self):
+        for executor in (self.executor, self.streamExecutor):
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        self.executor = None
+        self.streamExecutor = None
+
+
+pool = WorkerPool.fromEnvironment()
+
+
+class ResponseCache:
+    """
+    A least recently used cache of the responses of the endpoints that are pure functions of a BibTeX string and of the preferences.
+    A response is addressed by a hash of the function computing it, of the BibTeX string, unquoted and without its surrounding
+    whitespace, and of the preferences, so that the same entry sent again costs one dictionary lookup.
+    Responses expire after a time to live. With a directory, they are also saved to files, so that they outlive the process
+    and are shared by the processes of the service. The files are not versioned: clear the directory after upgrading BiBler.
+    Configured with the environment variables BIBLER_CACHE_SIZE (default 4096 responses in memory, 0 to disable),
+    BIBLER_CACHE_TTL (default 3600 seconds, 0 to never expire), BIBLER_CACHE_DIR (no files by default)
+    and BIBLER_CACHE_DISK_SIZE (default 65536 files).
+    """
+    def __init__(self, size, ttl, directory=None, diskSize=0):
+        self.size = size
+        self.ttl = ttl
+        self.directory = directory
+        self.diskSize = diskSize
+        self.responses = OrderedDict()
+        self.diskCount = 0
+        self.hits = 0
+        self.diskHits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.evicting = False
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self.diskCount = sum(1 for name in os.listdir(directory) if name.endswith(".json"))
+
+    @staticmethod
+    def fromEnvironment():
+        return ResponseCache(int(os.environ.get("BIBLER_CACHE_SIZE", 4096)), float(os.environ.get("BIBLER_CACHE_TTL", 3600)),
+                             os.environ.get("BIBLER_CACHE_DIR"), int(os.environ.get("BIBLER_CACHE_DISK_SIZE", 65536)))
+
+    def isEnabled(self):
+        return self.size > 0 or bool(self.directory)
+
+    def getKey(self, function, bibtex, *args):
+        """
+        Get the address of the response of a function to a BibTeX string, with the preferences of the context of the request.
+        """
+        digest = hashlib.sha256()
+        for part in (function.__name__, repr(args), urllib.parse.unquote_plus(bibtex).strip(), repr(sorted(vars(getPreferences()).items()))):
+            digest.update(part.encode("utf8", "surrogatepass"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key):
+        """
+        Get a response, from memory or else from its file, read in a thread so that the event loop is not blocked.
+        :return: The response, None if it is not in the cache or expired.
+        """
+        now = time.time()
+        item = self.responses.get(key)
+        if item is not None:
+            if not self.ttl or now < item[0] + self.ttl:
+                self.hits += 1
+                self.responses.move_to_end(key)
+                return item[1]
+            del self.responses[key]
+            self.expirations += 1
+        if self.directory:
+            created, response = await asyncio.to_thread(self.__load, key, now)
+            if response is not None:
+                self.diskHits += 1
+                self.__remember(key, response, created)
+                return response
+            if created is not None:
+                self.diskCount -= 1
+                self.expirations += 1
+        self.misses += 1
+        return None
+
+    async def put(self, key, response):
+        """
+        Add a response, evicting the least recently used ones beyond the size of the cache.
+        Its file is written in a thread so that the event loop is not blocked. A response that cannot be saved is only kept in memory.
+        """
+        self.__remember(key, response, time.time())
+        if self.directory:
+            if await asyncio.to_thread(self.__save, key, response):
+                self.diskCount += 1
+            if self.diskCount > self.diskSize and not self.evicting:
+                self.evicting = True
+                try:
+                    removed, self.diskCount = await asyncio.to_thread(self.__evictFiles)
+                    self.evictions += removed
+                finally:
+                    self.evicting = False
+
+    def __remember(self, key, response, created):
+        if self.size <= 0:
+            return
+        self.responses[key] = (created, response)
+        self.responses.move_to_end(key)
+        while len(self.responses) > self.size:
+            self.responses.popitem(last=False)
+            self.evictions += 1
+
+    def __load(self, key, now):
+        """
+        Read the file of a response, removing it if it expired. Another process may remove the file at any time.
+        :return: The time the file was written, None if it does not exist, and the response, None if it is not found or expired.
+        :rtype: tuple
+        """
+        path = os.path.join(self.directory, key + ".json")
+        try:
+            created = os.path.getmtime(path)
+        except OSError:
+            return None, None
+        try:
+            if not self.ttl or now < created + self.ttl:
+                with open(path, encoding="utf8") as f:
+                    return created, json.load(f)
+            os.remove(path)
+            return created, None
+        except (OSError, ValueError):
+            return None, None
+
+    def __save(self, key, response):
+        """
+        Write the file of a response, replacing it atomically.
+        :return: True if the file is new, False if it replaced another one or could not be written.
+        :rtype: bool
+        """
+        path = os.path.join(self.directory, key + ".json")
+        existed = os.path.exists(path)
+        try:
+            f = tempfile.NamedTemporaryFile("w", encoding="utf8", dir=self.directory, suffix=".tmp", delete=False)
+        except OSError:
+            return False
+        try:
+            with f:
+                json.dump(response, f, ensure_ascii=False)
+            os.replace(f.name, path)
+        except OSError:
+            try:
+                os.remove(f.name)
+            except OSError:
+                pass
+            return False
+        return not existed
+
+    def __evictFiles(self):
+        """
+        Remove the oldest files, down to nine tenths of the size on disk, so that they are not listed at every response.
+        Another process may remove the files at the same time: the ones already removed are skipped.
+        :return: The number of files removed and of files left.
+        :rtype: tuple
+        """
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except OSError:
+            return 0, self.diskCount
+        paths = []
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                paths.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        paths.sort()
+        excess = max(len(paths) - self.diskSize * 9 // 10, 0)
+        removed = 0
+        for _, path in paths[:excess]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed, len(paths) - excess
+
+    def getStatistics(self):
+        """
+        Get the usage of the cache.
+        :return: The number of hits in memory and on disk, of misses, of evictions and of expirations, the hit rate,
+            and the number of responses in memory and on disk.
+        :rtype: dict
+        """
+        lookups = self.hits + self.diskHits + self.misses
+        return {"hits": self.hits, "disk_hits": self.diskHits, "misses": self.misses,
+                "hit_rate": (self.hits + self.diskHits) / lookups if lookups else 0.0,
+                "evictions": self.evictions, "expirations": self.expirations,
+                "size": len(self.responses), "disk_size": self.diskCount}
+
+
+cache = ResponseCache.fromEnvironment()
+
+
+async def respond(function, bibtex, *args, pooled=False):
+    """
+    Respond with the result of a function of a BibTeX string, from the cache if it was computed before.
+    The function runs in the worker pool if pooled or if the BibTeX string is longer than the inline size of the pool,
+    else in the event loop.
+    """
+    pooled = pooled or len(bibtex) > pool.inlineSize
+    if not cache.isEnabled():
+        return await pool.run(function, bibtex, *args) if pooled else function(bibtex, *args)
+    key = cache.getKey(function, bibtex, *args)
+    response = await cache.get(key)
+    if response is None:
+        response = await pool.run(function, bibtex, *args) if pooled else function(bibtex, *args)
+        await cache.put(key, response)
+    return response
+
+
+def convert(bibtex, exportFormat):
+    """
+    Convert a BibTeX entry to another format.
+    """
+    biblerapp = getBiblerApp()
+    biblerapp.addEntry(urllib.parse.unquote_plus(bibtex))
+    return biblerapp.exportString(exportFormat)
+
+
+def importForReLiS(bibtex, importFormat):
+    """
+    Import a BibTeX or EndNote string and convert each of its entries into JSON.
+    The JSON document is serialized here rather than in the event loop, as FastAPI would.
+    """
+    bibtex = urllib.parse.unquote_plus(bibtex)
+    biblerapp = getBiblerApp()
+    json_res = {"error": "", "total": 0}
+    try:
+        total = biblerapp.importString(bibtex, importFormat)
+        json_res["total"] = total
+        i = 1
+        papers = []
+        for entry in biblerapp.iterAllEntries():
+            paper = entryToJSON(entry, biblerapp)
+            papers.append(paper)
+            i += 1
+        json_res["papers"] = papers
+    except Exception as e:
+        json_res["error"] = str(e)
+    # using jsonable_encoder to convert dict object to standard json
+    return json.dumps(jsonable_encoder(obj=json_res), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+
+
+def iterImportForReLiS(bibtex, importFormat):
+    """
+    Import a BibTeX or EndNote string and convert each of its entries into JSON as soon as its chunk is imported.
+    The entries are generated as newline-delimited JSON: one line per entry, as in the papers of importForReLiS,
+    and a last line with the error, if the import failed, and the total number of entries imported.
+    The entries of a chunk are released once sent, so that the memory used does not grow with the string.
+    :return: The lines of the entries of each chunk.
+    :rtype: generator of str
+    """
+    bibtex = urllib.parse.unquote_plus(bibtex)
+    biblerapp = getBiblerApp()
+    json_res = {"error": "", "total": 0}
+    try:
+        for entryIds in biblerapp.iterImportString(bibtex, importFormat, release=True):
+            json_res["total"] += len(entryIds)
+            lines = [json.dumps(jsonable_encoder(obj=entryToJSON(biblerapp.getEntry(entryId), biblerapp)), ensure_ascii=False,
+                                allow_nan=False, indent=None, separators=(",", ":")) + "\n" for entryId in entryIds]
+            if lines:
+                yield "".join(lines)
+    except Exception as e:
+        json_res["error"] = str(e)
+    yield json.dumps(json_res, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def generateReportJSON(bibtex):
+    """
+    Generate the report of the entries of a BibTeX string.
+    """
+    bibtex = urllib.parse.unquote_plus(bibtex)
+    biblerapp = getBiblerApp()
+    biblerapp.importString(bibtex, ImportFormat.BIBTEX)
+    report = biblerapp.generateReport("", False)
+    json_res = json.dumps(report)
+    return jsonable_encoder(obj=json_res)
+
+
+def formatEntry(bibtex):
+    """
+    Format a BibTeX entry.
+    """
+    return getBiblerApp().formatBibTeX(urllib.parse.unquote_plus(bibtex))
+
+
+def getEntryBibTeX(bibtex):
+    """
+    Get the BibTeX of an entry as BiBler stores it.
+    """
+    biblerapp = getBiblerApp()
+    return biblerapp.getBibTeX(biblerapp.addEntry(urllib.parse.unquote_plus(bibtex)))
+
+
+def previewEntry(bibtex):
+    """
+    Preview a BibTeX entry.
+    """
+    biblerapp = getBiblerApp()
+    return biblerapp.previewEntry(biblerapp.addEntry(urllib.parse.unquote_plus(bibtex)))
+
+
+def addEntry(bibtex):
+    """
+    Add a BibTeX entry.
+    :return: The entries, that is the one added.
+    :rtype: list
+    """
+    biblerapp = getBiblerApp()
+    biblerapp.addEntry(urllib.parse.unquote_plus(bibtex))
+    return list(biblerapp.iterAllEntries())
+
+
+def createEntryForReLiS(bibtex):
+    """
+    Add a BibTeX entry and convert it into JSON.
+    """
+    biblerapp = getBiblerApp()
+    entryId = biblerapp.addEntry(urllib.parse.unquote_plus(bibtex))
+    return json.dumps(biblerapp.getEntry(entryId))
+
+
+def validateEntry(bibtex):
+    """
+    Validate a BibTeX entry.
+    :return: 1 if it is valid, 0 otherwise.
+    """
+    biblerapp = getBiblerApp()
+    return int(biblerapp.validateEntry(biblerapp.addEntry(urllib.parse.unquote_plus(bibtex))).isValid())
+
+
+def processBatch(function, bibtexs):
+    """
+    Apply a function to each BibTeX entry of a batch.
+    Each entry is processed in its own Context, as in a request of its own, so that its result does not depend on the other entries.
+    :return: For each entry, a dictionary with the result, or with the error if the function failed.
+    :rtype: list
+    """
+    results = []
+    for bibtex in bibtexs:
+        try:
+            results.append({"error": "", "result": runInContext(function, bibtex)})
+        except Exception as e:
+            results.append({"error": str(e), "result": None})
+    return results
+
+
+async def runBatch(function, bibtexs):
+    """
+    Apply a function to each BibTeX entry of a batch, spread across the worker pool.
+    The results of the entries in the cache are not computed again, and the others are added to it unless they failed.
+    """
+    if not cache.isEnabled():
+        return await pool.runBatch(partial(processBatch, function), bibtexs)
+    keys = [cache.getKey(function, bibtex) for bibtex in bibtexs]
+    results = await asyncio.gather(*[cache.get(key) for key in keys])
+    missing = [i for i, result in enumerate(results) if result is None]
+    results = [{"error": "", "result": result} for result in results]
+    if missing:
+        computed = await pool.runBatch(partial(processBatch, function), [bibtexs[i] for i in missing])
+        for i, result in zip(missing, computed):
+            if not result["error"]:
+                await cache.put(keys[i], result["result"])
+            results[i] = result
+    return results
+
+
 # Pydantic models
 class Data(BaseModel):
     bibtex: str
 
 
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    pool.shutdown()
+
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(ContextMiddleware)
 
 
 @app.get("/")
@@ -91,135 +607,97 @@ def read_root():
 
 @app.post("/formatbibtex/")
 async def formatbibtex(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    return biblerapp.formatBibTeX(self, bibtex)
+    return await respond(formatEntry, data.bibtex)
+
+
+@app.post("/formatbibtexbatch/")
+async def formatbibtexbatch(bibtexs: List[str] = Body()):
+    return await runBatch(formatEntry, bibtexs)
 
 
 @app.post("/addentry/")
 async def addentry(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    biblerapp.addEntry(bibtex)
-    return biblerapp.iterAllEntries()
+    return await pool.run(addEntry, data.bibtex)
 
 
 @app.post("/getbibtex/")
 async def getbibtex(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    b = biblerapp.addEntry(bibtex)
-    return biblerapp.getBibTeX(b)
+    return await respond(getEntryBibTeX, data.bibtex)
+
+
+@app.post("/getbibtexbatch/")
+async def getbibtexbatch(bibtexs: List[str] = Body()):
+    return await runBatch(getEntryBibTeX, bibtexs)
 
 
 @app.post("/bibtextosql/")
 async def bibtextosql(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    biblerapp.addEntry(bibtex)
-    return biblerapp.exportString(ExportFormat.SQL)
+    return await respond(convert, data.bibtex, ExportFormat.SQL, pooled=True)
 
 
 @app.post("/bibtextocsv/")
 async def bibtextocsv(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    biblerapp.addEntry(bibtex)
-    return biblerapp.exportString(ExportFormat.CSV)
+    return await respond(convert, data.bibtex, ExportFormat.CSV, pooled=True)
 
 
 @app.post("/bibtextohtml/")
 async def bibtextohtml(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    biblerapp.addEntry(bibtex)
-    return biblerapp.exportString(ExportFormat.HTML)
+    return await respond(convert, data.bibtex, ExportFormat.HTML, pooled=True)
 
 
 @app.post("/bibtextobibtex/")
 async def bibtextobibtex(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    biblerapp.addEntry(bibtex)
-    return biblerapp.exportString(ExportFormat.BIBTEX)
+    return await respond(convert, data.bibtex, ExportFormat.BIBTEX, pooled=True)
 
 
 @app.post("/previewentry/")
 async def previewentry(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    entryid = biblerapp.addEntry(bibtex)
-    return biblerapp.previewEntry(entryid)
+    return await respond(previewEntry, data.bibtex)
+
+
+@app.post("/previewentrybatch/")
+async def previewentrybatch(bibtexs: List[str] = Body()):
+    return await runBatch(previewEntry, bibtexs)
 
 
 @app.post("/validateentry/")
 async def validateentry(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    entryId = biblerapp.addEntry(bibtex)
-    return int(biblerapp.validateEntry(entryId).isValid())
+    return await respond(validateEntry, data.bibtex)
+
+
+@app.post("/validateentrybatch/")
+async def validateentrybatch(bibtexs: List[str] = Body()):
+    return await runBatch(validateEntry, bibtexs)
 
 
 @app.post("/createentryforrelis/")
 async def createentryforrelis(data: Data):
-    json_res = {}
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    entryId = biblerapp.addEntry(bibtex)
-    entry = biblerapp.getEntry(entryId)
-    json_res = json.dumps(entry)
-    return jsonable_encoder(obj=json_res)
+    return jsonable_encoder(obj=await pool.run(createEntryForReLiS, data.bibtex))
 
 
 @app.post("/importbibtexstringforrelis/")
-async def importbibtexstringforrelis(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    json_res = {"error": "", "total": 0}
-    try:
-        total = biblerapp.importString(bibtex, ImportFormat.BIBTEX)
-        json_res["total"] = total
-        i = 1
-        papers = []
-        for entry in biblerapp.iterAllEntries():
-            paper = entryToJSON(entry, biblerapp)
-            papers.append(paper)
-            i += 1
-        json_res["papers"] = papers
-    except Exception as e:
-        json_res["error"] = str(e)
-    return jsonable_encoder(obj=json_res)
+async def importbibtexstringforrelis(data: Data, stream: bool = False):
+    if stream:
+        return StreamingResponse(pool.stream(iterImportForReLiS, data.bibtex, ImportFormat.BIBTEX), media_type="application/x-ndjson")
+    return Response(await pool.run(importForReLiS, data.bibtex, ImportFormat.BIBTEX), media_type="application/json")
 
 
 @app.post("/importendnotestringforrelis/")
-async def importendnotestringforrelis(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    json_res = {"error": "", "total": 0}
-    try:
-        total = biblerapp.importString(bibtex, ImportFormat.ENDNOTE)
-        json_res["total"] = total
-        i = 1
-        papers = []
-        for entry in biblerapp.iterAllEntries():
-            paper = entryToJSON(entry, biblerapp)
-            papers.append(paper)
-            i += 1
-        json_res["papers"] = papers
-    except Exception as e:
-        json_res["error"] = str(e)
-    # using jsonable_encoder to convert dict object to standard json
-    return jsonable_encoder(obj=json_res)
+async def importendnotestringforrelis(data: Data, stream: bool = False):
+    if stream:
+        return StreamingResponse(pool.stream(iterImportForReLiS, data.bibtex, ImportFormat.ENDNOTE), media_type="application/x-ndjson")
+    return Response(await pool.run(importForReLiS, data.bibtex, ImportFormat.ENDNOTE), media_type="application/json")
+
+
+@app.get("/cachestatistics/")
+def cachestatistics():
+    """Usage of the cache of the responses"""
+    return cache.getStatistics()
 
 
 @app.post("/generateReport/")
 async def generateReport(data: Data):
-    bibtex = urllib.parse.unquote_plus(data.bibtex)
-    biblerapp = getBiblerApp()
-    biblerapp.importString(bibtex, ImportFormat.BIBTEX)
-    report = biblerapp.generateReport("", False)
-    json_res = json.dumps(report)
-    return jsonable_encoder(obj=json_res)
+    return await pool.run(generateReportJSON, data.bibtex)
 
 
 if __name__ == "__main__":